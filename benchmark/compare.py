@@ -0,0 +1,62 @@
+import sys
+sys.path.append('.')
+
+import json
+import argparse
+
+
+"""
+    Compares two benchmark result files (see `benchmark/run.py`),
+    e.g. of two commits, case by case and phase by phase.
+    A phase is a regression when its median time grew by more than
+    `threshold` (a ratio, 0.1 = 10%).
+    Returns the rows of the comparison and the regressions among them.
+"""
+def compare(base: dict, head: dict, threshold: float = 0.1, stat: str = 'median'):
+    base_results = { result['key']: result for result in base['results'] }
+    rows = []
+    regressions = []
+    for result in head['results']:
+        previous = base_results.get(result['key'])
+        if (previous is None):
+            continue
+        for phase, timing in result['timings'].items():
+            if (phase not in previous['timings']):
+                continue
+            before, after = previous['timings'][phase][stat], timing[stat]
+            ratio = after / before if before > 0 else float('inf')
+            row = (result['key'], phase, before, after, ratio)
+            rows.append(row)
+            if (ratio > 1 + threshold):
+                regressions.append(row)
+    return rows, regressions
+
+
+def _format(rows: list):
+    lines = [f'{"case":<36} {"phase":<34} {"base":>10} {"head":>10} {"ratio":>7}']
+    for key, phase, before, after, ratio in rows:
+        lines.append(f'{key:<36} {phase:<34} {before:>10.5f} {after:>10.5f} {ratio:>7.2f}')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Compares two benchmark result files')
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.1, help='slowdown ratio flagged as a regression')
+    parser.add_argument('--stat', default='median', choices=['median', 'min', 'mean'])
+    args = parser.parse_args()
+
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.head) as file:
+        head = json.load(file)
+
+    rows, regressions = compare(base, head, args.threshold, args.stat)
+    print(f'base: {base["environment"].get("commit")}  head: {head["environment"].get("commit")}')
+    print(_format(rows))
+    if (regressions):
+        print(f'\n{len(regressions)} regression(s) over {args.threshold:.0%}:')
+        print(_format(regressions))
+        sys.exit(1)
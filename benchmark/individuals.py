@@ -0,0 +1,108 @@
+import sys
+sys.path.append('.')
+
+import json
+import time
+import argparse
+import tracemalloc
+
+from src.nsga2 import Individual
+from benchmark.run import environment, _stats
+
+
+"""
+    Benchmark of the cost of individuals themselves: seconds to create,
+    clone and cross over `n` individuals, and bytes allocated per
+    individual, with values shared by all of them (see `Individual.bind`).
+    Results have the same layout as `benchmark/run.py`, so they can be
+    compared across commits with `benchmark/compare.py`.
+"""
+
+
+class Slotted(Individual):
+
+    __slots__ = ('a', 'b', 'c')
+
+    def create(self):
+        self.a = 0.5
+        self.b = 1
+        self.c = self.dataset[0]
+
+    def crossover(self, x, y):
+        self.a = (x.a + y.a) / 2
+        self.b = x.b
+        self.c = y.c
+
+    def mutate(self):
+        self.a += 0.1
+
+    def fitness(self):
+        return [self.a, self.b]
+
+
+def _shared():
+    return { 'dataset': list(range(1000)), 'scale': 2.0, 'name': 'benchmark' }
+
+
+"""
+    Seconds to create, clone and cross over `n` individuals.
+"""
+def timings(n: int):
+    individual_class = Slotted.bind(**_shared())
+    timings = {}
+
+    start = time.perf_counter()
+    individuals = [individual_class() for _ in range(n)]
+    timings['create'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for individual in individuals:
+        individual_class([individual])
+    timings['clone'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for a, b in zip(individuals, individuals[1:] + individuals[:1]):
+        individual_class([a, b])
+    timings['crossover'] = time.perf_counter() - start
+    return timings
+
+
+"""
+    Bytes allocated per individual, tracing the creation of `n` of them.
+"""
+def memory(n: int):
+    individual_class = Slotted.bind(**_shared())
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    individuals = [individual_class() for _ in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(individuals)
+
+
+def run(n: int = 100000, repeats: int = 3):
+    runs = [timings(n) for _ in range(repeats)]
+    result = {
+        'key': f'individuals/n={n}',
+        'n': n,
+        'repeats': repeats,
+        'timings': { phase: _stats([run[phase] for run in runs]) for phase in runs[0] },
+        'bytes_per_individual': memory(n)
+    }
+    return { 'environment': environment(), 'results': [result] }
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmarks creating, cloning and crossing over individuals')
+    parser.add_argument('-n', type=int, default=100000, help='individuals per run')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--out', default=None, help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    report = run(args.n, args.repeats)
+    if (args.out):
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,530 @@
+import numpy as np
+from src.genome import ArrayIndividual
+
+
+"""
+    Standard multi-objective test problems, evaluated a whole
+    population at a time.
+    They are defined for minimization, as in the literature: `objectives()`
+    returns the textbook values and `batch_fitness()` their negation,
+    since NSGA2 maximizes.
+    Sizes are class attributes; `variant()` derives a class with others.
+"""
+class Problem(ArrayIndividual):
+
+    n_genes = 30
+    n_objectives = 2
+    # whether n_objectives can be changed
+    scalable = False
+
+    @classmethod
+    def variant(cls, n_genes: int = None, n_objectives: int = None):
+        attributes = {
+            'n_genes': n_genes if n_genes is not None else cls.n_genes,
+            'n_objectives': n_objectives if n_objectives is not None else cls.n_objectives
+        }
+        return type(cls.__name__, (cls,), attributes)
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        return -cls.objectives(np.stack([ind.genome for ind in individuals]))
+
+    """
+        (N, M) objectives to minimize of a (N, G) genome matrix.
+    """
+    @classmethod
+    def objectives(cls, genomes: np.ndarray):
+        raise NotImplementedError()
+
+    """
+        `n` points of the true Pareto front (objectives to minimize),
+        to measure IGD against, or None if it isn't sampled.
+    """
+    @classmethod
+    def pareto_front(cls, n: int):
+        return None
+
+
+def _simplex(n: int, m: int, seed: int = 0):
+    return np.random.default_rng(seed).dirichlet(np.ones(m), n)
+
+
+def _sphere(n: int, m: int, seed: int = 0):
+    points = np.abs(np.random.default_rng(seed).normal(size=(n, m)))
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+"""
+    ZDT: 2 objectives, `n_genes` variables in [0, 1].
+"""
+class ZDT1(Problem):
+
+    @classmethod
+    def objectives(cls, x):
+        f1 = x[:,0]
+        g = 1 + 9 * np.mean(x[:,1:], axis=1)
+        return np.stack([f1, g * (1 - np.sqrt(f1 / g))], axis=1)
+
+    @classmethod
+    def pareto_front(cls, n):
+        f1 = np.linspace(0, 1, n)
+        return np.stack([f1, 1 - np.sqrt(f1)], axis=1)
+
+
+class ZDT2(Problem):
+
+    @classmethod
+    def objectives(cls, x):
+        f1 = x[:,0]
+        g = 1 + 9 * np.mean(x[:,1:], axis=1)
+        return np.stack([f1, g * (1 - (f1 / g)**2)], axis=1)
+
+    @classmethod
+    def pareto_front(cls, n):
+        f1 = np.linspace(0, 1, n)
+        return np.stack([f1, 1 - f1**2], axis=1)
+
+
+class ZDT3(Problem):
+
+    @classmethod
+    def objectives(cls, x):
+        f1 = x[:,0]
+        g = 1 + 9 * np.mean(x[:,1:], axis=1)
+        h = 1 - np.sqrt(f1 / g) - (f1 / g) * np.sin(10 * np.pi * f1)
+        return np.stack([f1, g * h], axis=1)
+
+
+"""
+    x1 in [0, 1], the others in [-5, 5]: many local fronts.
+"""
+class ZDT4(Problem):
+
+    n_genes = 10
+
+    @classmethod
+    def bounds(cls):
+        lower = np.full(cls.n_genes, -5.0)
+        upper = np.full(cls.n_genes, 5.0)
+        lower[0], upper[0] = 0, 1
+        return lower, upper, np.zeros(cls.n_genes, dtype=bool)
+
+    @classmethod
+    def objectives(cls, x):
+        f1 = x[:,0]
+        rest = x[:,1:]
+        g = 1 + 10 * rest.shape[1] + np.sum(rest**2 - 10 * np.cos(4 * np.pi * rest), axis=1)
+        return np.stack([f1, g * (1 - np.sqrt(f1 / g))], axis=1)
+
+    @classmethod
+    def pareto_front(cls, n):
+        return ZDT1.pareto_front(n)
+
+
+"""
+    Binary: a 30 bit substring and 5 bit ones, one gene per bit.
+"""
+class ZDT5(Problem):
+
+    n_genes = 80
+    integer = True
+    mutation_method = 'reset'
+    crossover_method = 'uniform'
+
+    @classmethod
+    def objectives(cls, x):
+        ones = [np.sum(x[:,:30], axis=1)]
+        ones += [np.sum(x[:,i:i+5], axis=1) for i in range(30, cls.n_genes, 5)]
+        f1 = 1 + ones[0]
+        v = [np.where(u < 5, 2 + u, 1) for u in ones[1:]]
+        g = np.sum(v, axis=0)
+        return np.stack([f1, g / f1], axis=1)
+
+
+class ZDT6(Problem):
+
+    n_genes = 10
+
+    @classmethod
+    def objectives(cls, x):
+        f1 = 1 - np.exp(-4 * x[:,0]) * np.sin(6 * np.pi * x[:,0])**6
+        g = 1 + 9 * np.mean(x[:,1:], axis=1)**0.25
+        return np.stack([f1, g * (1 - (f1 / g)**2)], axis=1)
+
+    @classmethod
+    def pareto_front(cls, n):
+        f1 = np.linspace(0.2807753191, 1, n)
+        return np.stack([f1, 1 - f1**2], axis=1)
+
+
+"""
+    DTLZ: `n_objectives` objectives, `n_genes` = n_objectives + k - 1
+    variables in [0, 1].
+"""
+class DTLZ(Problem):
+
+    n_genes = 12
+    n_objectives = 3
+    scalable = True
+
+    """
+        Keeps the k = n_genes - n_objectives + 1 distance variables
+        when only the number of objectives changes.
+    """
+    @classmethod
+    def variant(cls, n_genes: int = None, n_objectives: int = None):
+        if (n_genes is None and n_objectives is not None):
+            n_genes = n_objectives + cls.n_genes - cls.n_objectives
+        return super().variant(n_genes, n_objectives)
+
+    @classmethod
+    def _split(cls, x):
+        m = cls.n_objectives
+        return x[:,:m-1], x[:,m-1:]
+
+    @classmethod
+    def _rastrigin(cls, xm):
+        return 100 * (xm.shape[1] + np.sum((xm - 0.5)**2 - np.cos(20 * np.pi * (xm - 0.5)), axis=1))
+
+
+class DTLZ1(DTLZ):
+
+    n_genes = 7
+
+    @classmethod
+    def objectives(cls, x):
+        position, xm = cls._split(x)
+        return 0.5 * (1 + cls._rastrigin(xm))[:,None] * _linear(position)
+
+    @classmethod
+    def pareto_front(cls, n):
+        return 0.5 * _simplex(n, cls.n_objectives)
+
+
+class DTLZ2(DTLZ):
+
+    alpha = 1
+
+    @classmethod
+    def objectives(cls, x):
+        position, xm = cls._split(x)
+        g = cls._g(xm)
+        return _spherical_front(position**cls.alpha * np.pi / 2, 1 + g)
+
+    @classmethod
+    def _g(cls, xm):
+        return np.sum((xm - 0.5)**2, axis=1)
+
+    @classmethod
+    def pareto_front(cls, n):
+        return _sphere(n, cls.n_objectives)
+
+
+class DTLZ3(DTLZ2):
+
+    @classmethod
+    def _g(cls, xm):
+        return cls._rastrigin(xm)
+
+
+class DTLZ4(DTLZ2):
+
+    alpha = 100
+
+
+"""
+    Degenerate front: a curve, whatever the number of objectives.
+"""
+class DTLZ5(DTLZ):
+
+    @classmethod
+    def objectives(cls, x):
+        position, xm = cls._split(x)
+        g = cls._g(xm)
+        theta = np.pi / (4 * (1 + g[:,None])) * (1 + 2 * g[:,None] * position)
+        theta[:,0] = position[:,0] * np.pi / 2
+        return _spherical_front(theta, 1 + g)
+
+    @classmethod
+    def _g(cls, xm):
+        return np.sum((xm - 0.5)**2, axis=1)
+
+
+class DTLZ6(DTLZ5):
+
+    @classmethod
+    def _g(cls, xm):
+        return np.sum(xm**0.1, axis=1)
+
+
+"""
+    Disconnected front of 2^(M-1) regions.
+"""
+class DTLZ7(DTLZ):
+
+    n_genes = 22
+
+    @classmethod
+    def objectives(cls, x):
+        position, xm = cls._split(x)
+        g = 1 + 9 * np.mean(xm, axis=1)
+        h = cls.n_objectives - np.sum(position / (1 + g[:,None]) * (1 + np.sin(3 * np.pi * position)), axis=1)
+        return np.concatenate([position, ((1 + g) * h)[:,None]], axis=1)
+
+
+"""
+    f_1 = r cos(t_1)..cos(t_M-1), f_m = r cos(t_1)..cos(t_M-m) sin(t_M-m+1),
+    f_M = r sin(t_1).
+"""
+def _spherical_front(theta: np.ndarray, radius: np.ndarray):
+    n = len(theta)
+    cos = np.concatenate([np.ones((n, 1)), np.cumprod(np.cos(theta), axis=1)], axis=1)
+    sin = np.concatenate([np.ones((n, 1)), np.sin(theta[:,::-1])], axis=1)
+    return radius[:,None] * cos[:,::-1] * sin
+
+
+"""
+    WFG toolkit problems: `k` position and `n_genes - k` distance
+    variables, the i-th in [0, 2i].
+"""
+class WFG(Problem):
+
+    n_genes = 24
+    n_objectives = 3
+    scalable = True
+    # position variables, 2 * (n_objectives - 1) by default
+    k = None
+    # WFG3: all but the first position parameter collapse onto the distance
+    degenerate = False
+
+    @classmethod
+    def position_count(cls):
+        return cls.k if cls.k is not None else 2 * (cls.n_objectives - 1)
+
+    @classmethod
+    def bounds(cls):
+        upper = 2.0 * np.arange(1, cls.n_genes + 1)
+        return np.zeros(cls.n_genes), upper, np.zeros(cls.n_genes, dtype=bool)
+
+    @classmethod
+    def objectives(cls, x):
+        y = x / (2.0 * np.arange(1, x.shape[1] + 1))
+        t = cls._transform(y)
+        m = cls.n_objectives
+        a = np.ones(m - 1) if not cls.degenerate else np.r_[1, np.zeros(m - 2)]
+        distance = t[:,-1:]
+        position = np.maximum(distance, a) * (t[:,:-1] - 0.5) + 0.5
+        h = cls._shape(position)
+        return distance + 2.0 * np.arange(1, m + 1) * h
+
+    @classmethod
+    def _groups(cls, y, weights=None):
+        # mean of each position group and of the distance variables
+        k, m = cls.position_count(), cls.n_objectives
+        size = k // (m - 1)
+        weights = weights if weights is not None else np.ones(y.shape[1])
+        bounds = [(i * size, (i + 1) * size) for i in range(m - 1)] + [(k, y.shape[1])]
+        return np.stack([_r_sum(y[:,a:b], weights[a:b]) for a, b in bounds], axis=1)
+
+    @classmethod
+    def _nonsep_groups(cls, y):
+        k, m = cls.position_count(), cls.n_objectives
+        size = k // (m - 1)
+        groups = [_r_nonsep(y[:,i*size:(i+1)*size], size) for i in range(m - 1)]
+        return np.stack(groups + [_r_nonsep(y[:,k:], y.shape[1] - k)], axis=1)
+
+
+def _r_sum(y, weights):
+    return y @ weights / np.sum(weights)
+
+
+def _r_nonsep(y, a):
+    n = y.shape[1]
+    total = np.sum(y, axis=1)
+    for k in range(a - 1):
+        total += np.sum(np.abs(y - np.roll(y, -(k + 1), axis=1)), axis=1)
+    return total / (n / a * np.ceil(a / 2) * (1 + 2 * a - 2 * np.ceil(a / 2)))
+
+
+def _s_linear(y, a):
+    return np.abs(y - a) / np.abs(np.floor(a - y) + a)
+
+
+def _b_flat(y, a, b, c):
+    value = a + np.minimum(0, np.floor(y - b)) * a * (b - y) / b - np.minimum(0, np.floor(c - y)) * (1 - a) * (y - c) / (1 - c)
+    return np.clip(value, 0, 1)
+
+
+def _b_poly(y, alpha):
+    return y**alpha
+
+
+def _b_param(y, u, a, b, c):
+    exponent = b + (c - b) * (a - (1 - 2 * u) * np.abs(np.floor(0.5 - u) + a))
+    return y**exponent
+
+
+def _s_multi(y, a, b, c):
+    ratio = np.abs(y - c) / (2 * (np.floor(c - y) + c))
+    return (1 + np.cos((4 * a + 2) * np.pi * (0.5 - ratio)) + 4 * b * ratio**2) / (b + 2)
+
+
+def _s_decept(y, a, b, c):
+    return 1 + (np.abs(y - a) - b) * (
+        np.floor(y - a + b) * (1 - c + (a - b) / b) / (a - b)
+        + np.floor(a + b - y) * (1 - c + (1 - a - b) / b) / (1 - a - b)
+        + 1 / b
+    )
+
+
+def _convex(x):
+    n = len(x)
+    ones = np.ones((n, 1))
+    products = np.concatenate([ones, np.cumprod(1 - np.cos(x * np.pi / 2), axis=1)], axis=1)
+    last = np.concatenate([ones, 1 - np.sin(x[:,::-1] * np.pi / 2)], axis=1)
+    return products[:,::-1] * last
+
+
+def _linear(x):
+    n = len(x)
+    ones = np.ones((n, 1))
+    products = np.concatenate([ones, np.cumprod(x, axis=1)], axis=1)
+    last = np.concatenate([ones, 1 - x[:,::-1]], axis=1)
+    return products[:,::-1] * last
+
+
+def _concave(x):
+    return _spherical_front(x * np.pi / 2, np.ones(len(x)))
+
+
+def _distance_shift(cls, y):
+    k = cls.position_count()
+    y = y.copy()
+    y[:,k:] = _s_linear(y[:,k:], 0.35)
+    return y
+
+
+class WFG1(WFG):
+
+    @classmethod
+    def _transform(cls, y):
+        k = cls.position_count()
+        y = _distance_shift(cls, y)
+        y[:,k:] = _b_flat(y[:,k:], 0.8, 0.75, 0.85)
+        y = _b_poly(y, 0.02)
+        return cls._groups(y, 2.0 * np.arange(1, y.shape[1] + 1))
+
+    @classmethod
+    def _shape(cls, x):
+        h = _convex(x)
+        a, alpha = 5, 1
+        h[:,-1] = (1 - x[:,0] - np.cos(2 * a * np.pi * x[:,0] + np.pi / 2) / (2 * a * np.pi))**alpha
+        return h
+
+
+class WFG2(WFG):
+
+    @classmethod
+    def _pairs(cls, y):
+        k = cls.position_count()
+        y = _distance_shift(cls, y)
+        pairs = [_r_nonsep(y[:,i:i+2], 2) for i in range(k, y.shape[1], 2)]
+        return np.concatenate([y[:,:k], np.stack(pairs, axis=1)], axis=1)
+
+    @classmethod
+    def _transform(cls, y):
+        return cls._groups(cls._pairs(y))
+
+    @classmethod
+    def _shape(cls, x):
+        h = _convex(x)
+        a, alpha, beta = 5, 1, 1
+        h[:,-1] = 1 - x[:,0]**alpha * np.cos(a * x[:,0]**beta * np.pi)**2
+        return h
+
+
+class WFG3(WFG2):
+
+    degenerate = True
+
+    @classmethod
+    def _shape(cls, x):
+        return _linear(x)
+
+
+class WFG4(WFG):
+
+    @classmethod
+    def _transform(cls, y):
+        return cls._groups(_s_multi(y, 30, 10, 0.35))
+
+    @classmethod
+    def _shape(cls, x):
+        return _concave(x)
+
+    @classmethod
+    def pareto_front(cls, n):
+        return 2.0 * np.arange(1, cls.n_objectives + 1) * _sphere(n, cls.n_objectives)
+
+
+class WFG5(WFG4):
+
+    @classmethod
+    def _transform(cls, y):
+        return cls._groups(_s_decept(y, 0.35, 0.001, 0.05))
+
+
+class WFG6(WFG4):
+
+    @classmethod
+    def _transform(cls, y):
+        return cls._nonsep_groups(_distance_shift(cls, y))
+
+
+class WFG7(WFG4):
+
+    @classmethod
+    def _transform(cls, y):
+        k = cls.position_count()
+        # mean of the variables after each one
+        after = (np.cumsum(y[:,::-1], axis=1)[:,::-1] - y) / np.maximum(y.shape[1] - 1 - np.arange(y.shape[1]), 1)
+        y = y.copy()
+        y[:,:k] = _b_param(y[:,:k], after[:,:k], 0.98 / 49.98, 0.02, 50)
+        return cls._groups(_distance_shift(cls, y))
+
+
+class WFG8(WFG4):
+
+    @classmethod
+    def _transform(cls, y):
+        k = cls.position_count()
+        # mean of the variables before each one
+        before = (np.cumsum(y, axis=1) - y) / np.maximum(np.arange(y.shape[1]), 1)
+        y = y.copy()
+        y[:,k:] = _b_param(y[:,k:], before[:,k:], 0.98 / 49.98, 0.02, 50)
+        return cls._groups(_distance_shift(cls, y))
+
+
+class WFG9(WFG4):
+
+    @classmethod
+    def _transform(cls, y):
+        k = cls.position_count()
+        after = (np.cumsum(y[:,::-1], axis=1)[:,::-1] - y) / np.maximum(y.shape[1] - 1 - np.arange(y.shape[1]), 1)
+        y = y.copy()
+        y[:,:-1] = _b_param(y[:,:-1], after[:,:-1], 0.98 / 49.98, 0.02, 50)
+        y[:,:k] = _s_decept(y[:,:k], 0.35, 0.001, 0.05)
+        y[:,k:] = _s_multi(y[:,k:], 30, 95, 0.35)
+        return cls._nonsep_groups(y)
+
+
+"""
+    Problems by name.
+"""
+PROBLEMS = {
+    cls.__name__: cls for cls in [
+        ZDT1, ZDT2, ZDT3, ZDT4, ZDT5, ZDT6,
+        DTLZ1, DTLZ2, DTLZ3, DTLZ4, DTLZ5, DTLZ6, DTLZ7,
+        WFG1, WFG2, WFG3, WFG4, WFG5, WFG6, WFG7, WFG8, WFG9
+    ]
+}
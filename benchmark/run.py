@@ -0,0 +1,190 @@
+import sys
+sys.path.append('.')
+
+import json
+import time
+import random
+import argparse
+import platform
+import datetime
+import subprocess
+import numpy as np
+
+from src.nsga2 import NSGA2, NSGA2Config
+from src.sort import iter_fronts, non_dominated_sort
+from src.select import select_n_best, select_n_best_array
+from src.util.log import Log
+from benchmark.problems import PROBLEMS
+
+
+"""
+    Benchmark suite: trains NSGA2 on standard problems over a sweep of
+    population sizes, objective counts and genome lengths, and times
+    each phase of an epoch.
+
+    Training phases are timed by wrapping the methods of the NSGA2
+    instance (`_get_fitness`, `_select_best_ids`, `_evolve`, and
+    `_save_gen`, which computes the indicators). Sorting and
+    selection are also timed on their own, on a (2 * pop_size, M)
+    fitness matrix, through both the dict and the array functions.
+    Each case runs `repeats` times; timings keep their median, min and mean.
+
+    Results are written as JSON, to be compared across commits with
+    `benchmark/compare.py`.
+"""
+
+PHASES = ('_get_fitness', '_select_best_ids', '_evolve', '_save_gen')
+
+
+"""
+    One benchmark case, e.g. ZDT1 with 100 individuals.
+"""
+class Case:
+
+    def __init__(self, problem: str, pop_size: int, n_objectives: int = None, n_genes: int = None, epochs: int = 20):
+        base = PROBLEMS[problem]
+        self.problem = problem
+        self.problem_class = base.variant(n_genes, n_objectives if base.scalable else None)
+        self.pop_size = pop_size
+        self.n_objectives = self.problem_class.n_objectives
+        self.n_genes = self.problem_class.n_genes
+        self.epochs = epochs
+
+    def key(self):
+        return f'{self.problem}/pop={self.pop_size}/m={self.n_objectives}/g={self.n_genes}'
+
+    """
+        Seconds spent in each phase of a training run, and its final hypervolume.
+    """
+    def train(self, seed: int):
+        np.random.seed(seed)
+        random.seed(seed)
+        nsga2 = NSGA2(self.problem_class, NSGA2Config(pop_size=self.pop_size, run_monitor_server=False))
+        timings = { phase: 0.0 for phase in PHASES }
+        for phase in PHASES:
+            setattr(nsga2, phase, _timed(getattr(nsga2, phase), timings, phase))
+
+        start = time.perf_counter()
+        nsga2.train(self.epochs)
+        timings['train'] = time.perf_counter() - start
+        return timings, (nsga2.generations[-1].indicators or {}).get('hypervolume')
+
+    """
+        Seconds spent sorting and selecting `pop_size` of `2 * pop_size` random individuals.
+    """
+    def sort(self, seed: int):
+        np.random.seed(seed)
+        genomes = self.problem_class.random_genomes(2 * self.pop_size)
+        fitnesses = -self.problem_class.objectives(genomes)
+        fitness_dict = dict(enumerate(fitnesses.tolist()))
+        timings = {}
+
+        start = time.perf_counter()
+        fronts = non_dominated_sort(fitness_dict, 'auto')
+        timings['non_dominated_sort'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        select_n_best(fronts, self.pop_size)
+        timings['select_n_best'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        select_n_best_array(fitnesses, iter_fronts(fitnesses), self.pop_size)
+        timings['iter_fronts+select_n_best_array'] = time.perf_counter() - start
+        return timings
+
+    def run(self, repeats: int, seed: int = 0):
+        runs = []
+        hypervolumes = []
+        for i in range(repeats):
+            timings, hypervolume = self.train(seed + i)
+            timings.update(self.sort(seed + i))
+            runs.append(timings)
+            hypervolumes.append(hypervolume if hypervolume is not None else np.nan)
+        return {
+            'key': self.key(),
+            'problem': self.problem,
+            'pop_size': self.pop_size,
+            'n_objectives': self.n_objectives,
+            'n_genes': self.n_genes,
+            'epochs': self.epochs,
+            'repeats': repeats,
+            'timings': { phase: _stats([run[phase] for run in runs]) for phase in runs[0] },
+            'hypervolume': float(np.nanmedian(hypervolumes)) if not np.all(np.isnan(hypervolumes)) else None
+        }
+
+
+def _timed(method, timings: dict, phase: str):
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timings[phase] += time.perf_counter() - start
+    return timed
+
+
+def _stats(values: list):
+    return { 'median': float(np.median(values)), 'min': float(np.min(values)), 'mean': float(np.mean(values)) }
+
+
+"""
+    Cases of every combination of the given sweeps. Problems with
+    a fixed number of objectives (ZDT) are only run once per genome length.
+"""
+def sweep(problems: list, pop_sizes: list, objectives: list = (None,), genes: list = (None,), epochs: int = 20):
+    cases = {}
+    for problem in problems:
+        scalable = PROBLEMS[problem].scalable
+        for pop_size in pop_sizes:
+            for n_objectives in (objectives if scalable else (None,)):
+                for n_genes in genes:
+                    case = Case(problem, pop_size, n_objectives, n_genes, epochs)
+                    cases.setdefault(case.key(), case)
+    return list(cases.values())
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor()
+    }
+
+
+def run(cases: list, repeats: int = 3, seed: int = 0):
+    results = []
+    for i, case in enumerate(cases):
+        result = case.run(repeats, seed)
+        timings = result['timings']
+        Log.logger.warning(f'[{i+1}/{len(cases)}] {case.key()}: train {timings["train"]["median"]:.3f}s, sort {timings["non_dominated_sort"]["median"]:.4f}s')
+        results.append(result)
+    return { 'environment': environment(), 'results': results }
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmarks NSGA2 on standard test problems')
+    parser.add_argument('--problems', nargs='+', default=['ZDT1', 'DTLZ2', 'WFG4'], choices=list(PROBLEMS.keys()))
+    parser.add_argument('--pop-sizes', nargs='+', type=int, default=[100, 400])
+    parser.add_argument('--objectives', nargs='+', type=int, default=[None], help='objective counts of DTLZ/WFG problems')
+    parser.add_argument('--genes', nargs='+', type=int, default=[None], help='genome lengths (default: each problem\'s own)')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=None, help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    Log.setup(level='WARNING')
+    report = run(sweep(args.problems, args.pop_sizes, args.objectives, args.genes, args.epochs), args.repeats, args.seed)
+    if (args.out):
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -29,6 +29,8 @@ from src.util.log import Log
 """
 class Circle(Individual):
 
+    __slots__ = ('x', 'y', 'r')
+
     def create(self):
         self.x = Genetics.random_int(0, 200)
         self.y = Genetics.random_int(0, 200)
@@ -56,6 +58,22 @@ class Circle(Individual):
             return (-float('inf'),-float('inf'))
         return (-mass, value)
 
+    @classmethod
+    def batch_fitness(cls, circles):
+        points = circles[0].field.points
+        centers = np.array([(c.x, c.y) for c in circles])
+        radii = np.array([c.r for c in circles])
+        dist = np.sqrt(((points[None,:,:2] - centers[:,None,:]) ** 2).sum(axis=2))
+        inside = dist < radii[:,None]
+        mass = inside @ points[:,2]
+        value = inside @ points[:,3]
+        fitnesses = np.stack([-mass, value], axis=1).astype(float)
+        fitnesses[mass == 0] = -float('inf')
+        return fitnesses
+
+    def genome_key(self):
+        return (self.x, self.y, self.r)
+
     def plot(self, ax):
         patch = plt.Circle((self.x, self.y), self.r, color='r', lw=0.5, fill=False)
         ax.add_patch(patch)
@@ -81,7 +99,7 @@ class Field:
         )
         cbar = fig.colorbar(scatter)
 
-        for circle in nsga2.generations[-1].population.values():
+        for circle in nsga2.generations[-1].population:
             circle.plot(ax)
 
         plt.show()
@@ -0,0 +1,138 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+from src.select import crowding_distance_array
+from src.indicators import hypervolume_contributions, reference_point
+
+
+"""
+    Bounded archive of the non-dominated solutions found during a run.
+
+    Solutions are admitted if no member dominates them, and evict the
+    members they dominate. With 2 objectives the members are kept in a
+    sorted list, so each insertion is a couple of binary searches;
+    with more, each insertion is a vectorized scan of the archive.
+    When it grows over `maxsize`, the member with the lowest crowding
+    distance (prune='crowding') or the lowest exclusive hypervolume
+    contribution (prune='hypervolume') is dropped, one at a time.
+    Members with the same fitness as an existing one are not admitted.
+"""
+class ParetoArchive:
+
+    PRUNE = ('crowding', 'hypervolume')
+
+    def __init__(self, maxsize: int = None, prune: str = 'crowding'):
+        if (prune not in ParetoArchive.PRUNE):
+            raise ValueError(f'Unknown prune method: {prune}')
+        self.maxsize = maxsize
+        self.prune = prune
+        self.dims = None
+        self.items = []
+        # 2 objectives: sorted (f0, -f1) keys, so f1 is non-increasing
+        self._keys = []
+        self._neg_f1 = []
+        # otherwise: (N, M) fitness matrix
+        self._fitnesses = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    """
+        (N, M) fitnesses of the members, in the same order as `items`.
+        With 2 objectives they are sorted by the first one.
+    """
+    @property
+    def fitnesses(self):
+        if (self.dims is None):
+            return np.empty((0, 0))
+        if (self.dims == 2):
+            return np.array([(f0, -nf1) for f0, nf1 in self._keys], dtype=float).reshape(-1, 2)
+        return self._fitnesses
+
+    """
+        Inserts a solution if no member dominates it.
+        Returns whether it was admitted (it may still be pruned later on).
+    """
+    def add(self, item, fitness):
+        fitness = np.asarray(fitness, dtype=float)
+        if (self.dims is None):
+            self.dims = len(fitness)
+            self._fitnesses = np.empty((0, self.dims))
+        if (self.dims == 2):
+            added = self._add_2d(item, float(fitness[0]), float(fitness[1]))
+        else:
+            added = self._add_nd(item, fitness)
+        if (added):
+            self._prune()
+        return added
+
+    """
+        Inserts many solutions, e.g. a freshly evaluated population.
+        Returns how many were admitted.
+    """
+    def update(self, items, fitnesses):
+        return sum(self.add(item, fitness) for item, fitness in zip(items, fitnesses))
+
+    def _add_2d(self, item, f0: float, f1: float):
+        keys = self._keys
+        key = (f0, -f1)
+
+        # Members with a greater f0 are a suffix, its first one has the greatest f1
+        above = bisect_right(keys, (f0, float('inf')))
+        if (above < len(keys) and -keys[above][1] > f1):
+            return False
+        # Members with a lower f0 and f1 are a contiguous run just below f0
+        below = bisect_left(keys, (f0, -float('inf')))
+        first = bisect_right(self._neg_f1, -f1, 0, below)
+
+        i = bisect_left(keys, key)
+        if (i < len(keys) and keys[i] == key):
+            return False
+        del keys[first:below], self._neg_f1[first:below], self.items[first:below]
+        i -= below - first
+        keys.insert(i, key)
+        self._neg_f1.insert(i, -f1)
+        self.items.insert(i, item)
+        return True
+
+    def _add_nd(self, item, fitness: np.ndarray):
+        members = self._fitnesses
+        if (np.any(np.all(members > fitness, axis=1)) or np.any(np.all(members == fitness, axis=1))):
+            return False
+        keep = ~np.all(members < fitness, axis=1)
+        self._fitnesses = np.concatenate([members[keep], fitness[None]])
+        self.items = [item for item, k in zip(self.items, keep) if k] + [item]
+        return True
+
+    def _prune(self):
+        while (self.maxsize is not None and len(self.items) > self.maxsize):
+            if (self.prune == 'crowding'):
+                score = crowding_distance_array(self.fitnesses)
+            else:
+                score = self._hypervolume_contributions()
+            self._remove(int(np.argmin(score)))
+
+    """
+        Exclusive hypervolume contribution of each member.
+        The extreme members count as infinite, so they are always kept.
+        With 2 objectives it's the box between each member's neighbours,
+        with more it's measured with WFG, once per member.
+    """
+    def _hypervolume_contributions(self):
+        fitnesses = self.fitnesses
+        if (self.dims == 2):
+            contributions = np.full(len(fitnesses), float('inf'))
+            contributions[1:-1] = (fitnesses[1:-1,0] - fitnesses[:-2,0]) * (fitnesses[1:-1,1] - fitnesses[2:,1])
+            return contributions
+        contributions = hypervolume_contributions(fitnesses, reference_point(fitnesses))
+        contributions[np.argmax(fitnesses, axis=0)] = float('inf')
+        return contributions
+
+    def _remove(self, i: int):
+        del self.items[i]
+        if (self.dims == 2):
+            del self._keys[i], self._neg_f1[i]
+        else:
+            self._fitnesses = np.delete(self._fitnesses, i, axis=0)
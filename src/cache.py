@@ -0,0 +1,35 @@
+from collections import OrderedDict
+
+
+"""
+    LRU cache of fitnesses, keyed by the individuals' `genome_key()`.
+    Holds up to `maxsize` entries and counts hits and misses.
+"""
+class FitnessCache:
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        fitness = self.entries.get(key)
+        if (fitness is None):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key, fitness):
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        while (len(self.entries) > self.maxsize):
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return { 'hits': self.hits, 'misses': self.misses, 'size': len(self.entries) }
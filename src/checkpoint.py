@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import queue
+import shutil
+import pickle
+import threading
+import numpy as np
+from src.population import Population
+
+
+"""
+    On-disk checkpoints of a training run.
+
+    The run directory holds the context shared by every generation,
+    written once, and one directory per generation with raw arrays:
+
+        context.pkl                 individual class and shared kwargs
+        gen_000042/
+            meta.json               generation id, epoch, stats, indicators
+            ids.npy                 (N,) int64
+            fitnesses.npy           (N, M) float64
+            ranks.npy               (N,) int64
+            genomes.npy             (N, G), numeric individuals only
+            individuals.pkl         other individuals only
+
+    Arrays are memory-mapped when loaded, so resuming is fast.
+"""
+class Checkpoint:
+
+    CONTEXT = 'context.pkl'
+    GENERATION = re.compile(r'^gen_(\d+)$')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.has_context = os.path.exists(os.path.join(path, Checkpoint.CONTEXT))
+
+    def write_context(self, individual_class, kwargs: dict):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, Checkpoint.CONTEXT), 'wb') as file:
+            pickle.dump({ 'individual_class': individual_class, 'kwargs': kwargs }, file)
+        self.has_context = True
+
+    def generation_path(self, epoch: int):
+        return os.path.join(self.path, f'gen_{epoch:06d}')
+
+    """
+        Writes a generation atomically: into a temporary directory,
+        renamed once complete.
+    """
+    def write(self, generation):
+        path = self.generation_path(generation.epoch)
+        tmp_path = path + '.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        Checkpoint.write_generation(generation, tmp_path)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def write_generation(generation, path: str):
+        population = generation.population
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'ids.npy'), population.ids)
+        np.save(os.path.join(path, 'fitnesses.npy'), np.asarray(population.fitnesses, dtype=float))
+        if (generation.ranks is not None):
+            np.save(os.path.join(path, 'ranks.npy'), np.asarray(generation.ranks, dtype=np.int64))
+        if (population.genomes is not None):
+            np.save(os.path.join(path, 'genomes.npy'), population.genomes)
+        else:
+            with open(os.path.join(path, 'individuals.pkl'), 'wb') as file:
+                pickle.dump(list(population.individuals), file)
+        meta = {
+            'id': generation.id,
+            'epoch': generation.epoch,
+            'cache_stats': generation.cache_stats
+        }
+        if (getattr(generation, 'indicators', None) is not None):
+            meta['indicators'] = generation.indicators
+        with open(os.path.join(path, 'meta.json'), 'w') as file:
+            json.dump(meta, file)
+
+    """
+        Shared context of the run: {'individual_class', 'kwargs'}.
+    """
+    def read_context(self):
+        with open(os.path.join(self.path, Checkpoint.CONTEXT), 'rb') as file:
+            return pickle.load(file)
+
+    """
+        Paths of the saved generations, oldest first.
+    """
+    def generation_paths(self):
+        if (not os.path.isdir(self.path)):
+            return []
+        names = sorted(name for name in os.listdir(self.path) if Checkpoint.GENERATION.match(name))
+        return [os.path.join(self.path, name) for name in names]
+
+    """
+        Loads a generation directory, memory-mapping its arrays.
+        Returns its population, ranks and metadata.
+    """
+    @staticmethod
+    def read_generation(path: str, individual_class, mmap_mode: str = 'r'):
+        with open(os.path.join(path, 'meta.json')) as file:
+            meta = json.load(file)
+        ids = np.load(os.path.join(path, 'ids.npy'))
+        fitnesses = np.load(os.path.join(path, 'fitnesses.npy'), mmap_mode=mmap_mode)
+        ranks_path = os.path.join(path, 'ranks.npy')
+        ranks = np.load(ranks_path) if os.path.exists(ranks_path) else None
+
+        genomes_path = os.path.join(path, 'genomes.npy')
+        if (os.path.exists(genomes_path)):
+            genomes = np.load(genomes_path, mmap_mode=mmap_mode)
+            individuals = individual_class.from_genomes(genomes)
+            for individual, id in zip(individuals, ids.tolist()):
+                individual.id = id
+        else:
+            genomes = None
+            with open(os.path.join(path, 'individuals.pkl'), 'rb') as file:
+                individuals = individual_class.adopt(pickle.load(file))
+
+        return Population(individuals, fitnesses, genomes), ranks, meta
+
+
+"""
+    Writes checkpoints on a background thread, so training only blocks
+    when `queue_size` generations are already waiting to be written.
+    Generations are written every `every` epochs or, if `interval` is set,
+    every `interval` seconds. `close()` flushes the queue.
+"""
+class CheckpointWriter:
+
+    def __init__(self, checkpoint: Checkpoint, every: int = 1, interval: float = None, queue_size: int = 2, background: bool = True):
+        self.checkpoint = checkpoint
+        self.every = every
+        self.interval = interval
+        self.background = background
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.error = None
+        self.last_time = None
+        # epochs already written (or queued), never written twice
+        self.written = set()
+
+    def due(self, generation):
+        if (self.interval is not None):
+            return self.last_time is None or time.monotonic() - self.last_time >= self.interval
+        return generation.epoch % self.every == 0
+
+    """
+        Queues a generation if a checkpoint is due, or if `force` is set,
+        unless its epoch was already written.
+    """
+    def put(self, generation, force: bool = False):
+        if (generation.epoch in self.written):
+            return
+        if (not force and not self.due(generation)):
+            return
+        self._raise()
+        self.last_time = time.monotonic()
+        self.written.add(generation.epoch)
+        if (not self.background):
+            self.checkpoint.write(generation)
+            return
+        if (self.thread is None):
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        self.queue.put(generation)
+
+    def _run(self):
+        while True:
+            generation = self.queue.get()
+            if (generation is None):
+                break
+            try:
+                self.checkpoint.write(generation)
+            except Exception as e:
+                self.error = e
+
+    """
+        Waits for every queued checkpoint to be written.
+    """
+    def close(self):
+        if (self.thread is not None):
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self._raise()
+
+    def _raise(self):
+        if (self.error is not None):
+            error, self.error = self.error, None
+            raise error
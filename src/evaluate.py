@@ -0,0 +1,218 @@
+import os
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from tqdm import tqdm
+
+
+"""
+    Evaluates the individuals' fitnesses one by one, in the training process.
+"""
+class SerialEvaluator:
+
+    def __init__(self, progress: bool = True):
+        self.progress = progress
+        self.workers = 1
+
+    """
+        Called by NSGA2 with the kwargs shared by all individuals.
+    """
+    def setup(self, shared: dict):
+        pass
+
+    """
+        Returns the fitnesses of the given individuals, in the same order.
+    """
+    def evaluate(self, individuals):
+        if (self.progress):
+            individuals = tqdm(individuals)
+        return [ind.fitness() for ind in individuals]
+
+    """
+        Returns the (N, M) fitnesses of the given individuals,
+        using `cls.batch_fitness`.
+    """
+    def evaluate_batch(self, cls, individuals):
+        return np.asarray(cls.batch_fitness(list(individuals)), dtype=float)
+
+    """
+        Starts evaluating a single individual, returning a Future of its fitness.
+        Here it's evaluated right away.
+    """
+    def submit(self, individual):
+        future = Future()
+        try:
+            future.set_result(_single_fitness(individual))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        pass
+
+    def _split(self, individuals, n_chunks):
+        size = max(1, -(-len(individuals) // n_chunks))
+        return [list(individuals[i:i+size]) for i in range(0, len(individuals), size)]
+
+
+"""
+    Evaluates fitnesses on a thread pool.
+    Useful when `fitness()` releases the GIL (numpy, I/O, subprocesses).
+"""
+class ThreadEvaluator(SerialEvaluator):
+
+    def __init__(self, workers: int = None, progress: bool = True):
+        super().__init__(progress)
+        self.workers = workers or os.cpu_count()
+        self.executor = None
+
+    def evaluate(self, individuals):
+        if (self.executor is None):
+            self.executor = ThreadPoolExecutor(self.workers)
+        results = self.executor.map(_fitness, individuals)
+        if (self.progress):
+            results = tqdm(results, total=len(individuals))
+        return list(results)
+
+    def evaluate_batch(self, cls, individuals):
+        if (self.executor is None):
+            self.executor = ThreadPoolExecutor(self.workers)
+        chunks = self._split(individuals, self.workers)
+        results = self.executor.map(cls.batch_fitness, chunks)
+        return _concat(results)
+
+    def submit(self, individual):
+        if (self.executor is None):
+            self.executor = ThreadPoolExecutor(self.workers)
+        return self.executor.submit(_single_fitness, individual)
+
+    def close(self):
+        if (self.executor is not None):
+            self.executor.shutdown()
+            self.executor = None
+
+
+"""
+    Evaluates fitnesses on a process pool, `chunksize` individuals per task.
+    The kwargs shared by all individuals (e.g. a dataset) live on their
+    bound class (see `Individual.bind`), so they aren't shipped with the
+    individuals: they are sent once to each worker when the pool starts.
+    `initializer(*initargs)` also runs once per worker, for any extra setup.
+    Individual classes must be importable by the workers.
+"""
+class ProcessEvaluator(SerialEvaluator):
+
+    def __init__(self,
+        workers: int = None,
+        chunksize: int = None,
+        initializer = None,
+        initargs: tuple = (),
+        progress: bool = True
+    ):
+        super().__init__(progress)
+        self.workers = workers or os.cpu_count()
+        self.chunksize = chunksize
+        self.initializer = initializer
+        self.initargs = initargs
+        self.shared = {}
+        self.executor = None
+
+    def setup(self, shared: dict):
+        self.close()
+        self.shared = dict(shared)
+
+    def _start(self):
+        if (self.executor is None):
+            self.executor = ProcessPoolExecutor(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(self.shared, self.initializer, self.initargs)
+            )
+
+    def _chunks(self, individuals, n_chunks):
+        if (self.chunksize):
+            n_chunks = -(-len(individuals) // self.chunksize)
+        return self._split(individuals, n_chunks)
+
+    def evaluate(self, individuals):
+        self._start()
+        chunks = self._chunks(individuals, self.workers*4)
+        results = self.executor.map(_evaluate_chunk, chunks)
+        if (self.progress):
+            results = tqdm(results, total=len(chunks))
+        return [fitness for chunk in results for fitness in chunk]
+
+    def evaluate_batch(self, cls, individuals):
+        self._start()
+        chunks = self._chunks(individuals, self.workers)
+        results = self.executor.map(_evaluate_batch_chunk, chunks)
+        return _concat(results)
+
+    def submit(self, individual):
+        self._start()
+        return self.executor.submit(_evaluate_one, individual)
+
+    def close(self):
+        if (self.executor is not None):
+            self.executor.shutdown()
+            self.executor = None
+
+
+def _fitness(individual):
+    return individual.fitness()
+
+
+"""
+    Fitness of a single submitted individual. As in NSGA2, `batch_fitness` is
+    used instead of `fitness()` when the class defines it.
+"""
+def _single_fitness(individual):
+    cls = type(individual)
+    if (cls._has_batch_fitness()):
+        return np.asarray(cls.batch_fitness([individual]), dtype=float)[0]
+    return individual.fitness()
+
+
+"""
+    Worker-side state of a ProcessEvaluator.
+"""
+_shared = {}
+_bound = {}
+
+def _init_worker(shared, initializer, initargs):
+    _shared.update(shared)
+    if (initializer is not None):
+        initializer(*initargs)
+
+def _bind(individuals):
+    for cls in { type(ind) for ind in individuals }:
+        if (cls not in _bound):
+            _bound[cls] = cls.bind(**_shared)
+    for ind in individuals:
+        ind.__class__ = _bound[type(ind)]
+    return individuals
+
+def _evaluate_one(individual):
+    return _single_fitness(_bind([individual])[0])
+
+def _evaluate_chunk(chunk):
+    return [ind.fitness() for ind in _bind(chunk)]
+
+def _evaluate_batch_chunk(chunk):
+    chunk = _bind(chunk)
+    return np.asarray(type(chunk[0]).batch_fitness(chunk), dtype=float)
+
+def _concat(results):
+    results = [np.asarray(r, dtype=float) for r in results]
+    if (len(results) == 0):
+        return np.empty((0, 0))
+    return np.concatenate(results)
+
+
+"""
+    Evaluators selectable by name in NSGA2Config.
+"""
+EVALUATORS = {
+    'serial': SerialEvaluator,
+    'thread': ThreadEvaluator,
+    'process': ProcessEvaluator
+}
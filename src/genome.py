@@ -0,0 +1,99 @@
+import numpy as np
+from src.nsga2 import Individual, NSGA2
+from src.util.genetics import BatchGenetics
+
+
+"""
+    An individual whose parameters are a numeric genome (a numpy array).
+    Subclasses set the bounds and operators as class attributes and only
+    need to implement `fitness()` (or `batch_fitness()`), reading `self.genome`.
+    NSGA2 breeds whole populations of these at once, as (N, G) matrices.
+"""
+class ArrayIndividual(Individual):
+
+    __slots__ = ('genome',)
+
+    # (G,) bounds, or scalars together with n_genes
+    lower = 0.0
+    upper = 1.0
+    n_genes = None
+    # (G,) mask of integer genes, or a single bool for all of them
+    integer = False
+
+    # 'sbx' or 'uniform'
+    crossover_method = 'sbx'
+    crossover_prob = 0.5
+    eta_crossover = 15.0
+
+    # 'polynomial' or 'reset'
+    mutation_method = 'polynomial'
+    mutation_prob = None
+    eta_mutation = 20.0
+    reset_prob = 0.0
+
+    def create(self):
+        self.genome = self.random_genomes(1)[0]
+
+    def crossover(self, a, b):
+        self.genome = self.batch_crossover(a.genome[None], b.genome[None])[0]
+
+    def mutate(self):
+        self.genome = self.batch_mutate(self.genome[None])[0]
+
+    @classmethod
+    def bounds(cls):
+        n = cls.n_genes if cls.n_genes is not None else np.size(cls.lower)
+        lower = np.broadcast_to(np.asarray(cls.lower, dtype=float), (n,))
+        upper = np.broadcast_to(np.asarray(cls.upper, dtype=float), (n,))
+        integer = np.broadcast_to(np.asarray(cls.integer, dtype=bool), (n,))
+        return lower, upper, integer
+
+    @classmethod
+    def random_genomes(cls, n: int):
+        lower, upper, integer = cls.bounds()
+        return BatchGenetics.random(n, lower, upper, integer)
+
+    """
+        Children genomes of each pair of rows of `a` and `b`.
+    """
+    @classmethod
+    def batch_crossover(cls, a: np.ndarray, b: np.ndarray):
+        lower, upper, integer = cls.bounds()
+        if (cls.crossover_method == 'uniform'):
+            return BatchGenetics.uniform_crossover(a, b)
+        if (cls.crossover_method == 'sbx'):
+            return BatchGenetics.sbx_crossover(a, b, lower, upper, cls.eta_crossover, cls.crossover_prob, integer)
+        raise ValueError(f'Unknown crossover method: {cls.crossover_method}')
+
+    """
+        Mutated copy of a (N, G) genome matrix.
+    """
+    @classmethod
+    def batch_mutate(cls, genomes: np.ndarray):
+        lower, upper, integer = cls.bounds()
+        if (cls.mutation_method == 'polynomial'):
+            genomes = BatchGenetics.polynomial_mutation(genomes, lower, upper, cls.eta_mutation, cls.mutation_prob, integer)
+        elif (cls.mutation_method == 'reset'):
+            prob = cls.mutation_prob if cls.mutation_prob is not None else 1 / genomes.shape[1]
+            genomes = BatchGenetics.reset_mutation(genomes, lower, upper, prob, integer)
+        else:
+            raise ValueError(f'Unknown mutation method: {cls.mutation_method}')
+        if (cls.reset_prob > 0):
+            genomes = BatchGenetics.reset_mutation(genomes, lower, upper, cls.reset_prob, integer)
+        return genomes
+
+    """
+        Builds individuals around the rows of a (N, G) genome matrix,
+        without calling `create()`. `parents` is an optional list of
+        parent id tuples, one per row.
+    """
+    @classmethod
+    def from_genomes(cls, genomes: np.ndarray, parents: list = None):
+        individuals = []
+        for i, genome in enumerate(genomes):
+            individual = cls.__new__(cls)
+            individual.id = NSGA2._new_id()
+            individual.parents = parents[i] if parents is not None else None
+            individual.genome = genome
+            individuals.append(individual)
+        return individuals
@@ -0,0 +1,177 @@
+import numpy as np
+
+
+"""
+    Rows of a fitness matrix that can be measured: indicators ignore
+    non-finite fitnesses (e.g. failed evaluations).
+"""
+def _finite(fitnesses: np.ndarray):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    if (fitnesses.ndim != 2):
+        fitnesses = fitnesses.reshape(len(fitnesses), -1)
+    return fitnesses[np.all(np.isfinite(fitnesses), axis=1)]
+
+
+"""
+    Volume dominated by the fitnesses and bounded by `reference`,
+    a point lower than them in every objective. Points that don't
+    dominate the reference add nothing.
+    2 objectives take an O(N log N) sweep, 3 take slices of it,
+    more take WFG.
+"""
+def hypervolume(fitnesses: np.ndarray, reference):
+    points = _finite(fitnesses)
+    reference = np.asarray(reference, dtype=float)
+    points = points[np.all(points > reference, axis=1)]
+    if (len(points) == 0):
+        return 0.0
+    if (points.shape[1] == 1):
+        return float(points.max() - reference[0])
+    return float(_wfg(points, reference))
+
+
+def _hypervolume_2d(points: np.ndarray, reference: np.ndarray):
+    # Sweep by decreasing first objective, adding a slice whenever
+    # the second one improves
+    order = np.lexsort((-points[:,1], -points[:,0]))
+    f0 = points[order,0]
+    best = np.maximum.accumulate(points[order,1])
+    steps = np.diff(np.concatenate([[reference[1]], best]))
+    return np.sum((f0 - reference[0]) * steps)
+
+
+def _hypervolume_3d(points: np.ndarray, reference: np.ndarray):
+    # Slabs between consecutive values of the last objective, each one
+    # as deep as the area of the points above it
+    points = points[np.argsort(-points[:,2], kind='stable')]
+    heights = points[:,2] - np.concatenate([points[1:,2], reference[2:]])
+    volume = 0.0
+    for k in np.flatnonzero(heights > 0):
+        volume += _hypervolume_2d(points[:k+1,:2], reference) * heights[k]
+    return volume
+
+
+"""
+    WFG: the volume is the sum of each point's exclusive contribution
+    over the ones after it, which is its own box minus the volume of
+    the others limited to that box.
+"""
+def _wfg(points: np.ndarray, reference: np.ndarray):
+    if (points.shape[1] == 2):
+        return _hypervolume_2d(points, reference)
+    if (points.shape[1] == 3):
+        return _hypervolume_3d(points, reference)
+    points = _non_dominated(points)
+    if (len(points) == 1):
+        return np.prod(points[0] - reference)
+    points = points[np.argsort(-points[:,-1], kind='stable')]
+    volume = 0.0
+    for k in range(len(points)):
+        box = np.prod(points[k] - reference)
+        limited = np.minimum(points[k+1:], points[k])
+        if (len(limited)):
+            box -= _wfg(limited, reference)
+        volume += box
+    return volume
+
+
+"""
+    Rows not weakly dominated by another one, keeping one of each duplicate.
+"""
+def _non_dominated(points: np.ndarray):
+    if (len(points) < 2):
+        return points
+    below = np.all(points[:,None] <= points[None,:], axis=2)
+    strictly = np.any(points[:,None] < points[None,:], axis=2)
+    earlier = np.tri(len(points), k=-1, dtype=bool)
+    dominated = np.any(below & (strictly | earlier), axis=1)
+    return points[~dominated]
+
+
+"""
+    Exclusive hypervolume contribution of each row: how much the
+    hypervolume would shrink without it. Dominated rows contribute 0.
+"""
+def hypervolume_contributions(fitnesses: np.ndarray, reference):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    total = hypervolume(fitnesses, reference)
+    contributions = np.empty(len(fitnesses))
+    for i in range(len(fitnesses)):
+        contributions[i] = total - hypervolume(np.delete(fitnesses, i, axis=0), reference)
+    return contributions
+
+
+"""
+    Inverted generational distance: average distance from each point
+    of a reference front (e.g. samples of the true Pareto front) to
+    its nearest fitness. Lower is better.
+"""
+def igd(fitnesses: np.ndarray, reference_front: np.ndarray):
+    points = _finite(fitnesses)
+    reference_front = np.asarray(reference_front, dtype=float)
+    if (len(points) == 0):
+        return float('inf')
+    distances = []
+    for i in range(0, len(reference_front), 1024):
+        chunk = reference_front[i:i+1024]
+        distances.append(np.sqrt(np.min(np.sum((chunk[:,None] - points[None,:])**2, axis=2), axis=1)))
+    return float(np.mean(np.concatenate(distances)))
+
+
+"""
+    Distance from each point to its nearest other one, computed by
+    chunks of rows so at most about `pairs` distances are held at once.
+"""
+def _nearest_distances(points: np.ndarray, ord: int, pairs: int = 2**20):
+    n = len(points)
+    step = max(1, pairs // n)
+    nearest = np.empty(n)
+    for i in range(0, n, step):
+        # one objective at a time, never a (rows, N, M) tensor
+        distances = np.zeros((len(points[i:i+step]), n))
+        for j in range(points.shape[1]):
+            diff = np.abs(points[i:i+step,j,None] - points[None,:,j])
+            distances += diff if ord == 1 else diff**2
+        if (ord != 1):
+            distances = np.sqrt(distances)
+        rows = np.arange(len(distances))
+        distances[rows, i + rows] = float('inf')
+        nearest[i:i+step] = np.min(distances, axis=1)
+    return nearest
+
+
+"""
+    Schott's spacing: standard deviation of the (manhattan) distance
+    from each point to its nearest neighbour. 0 means evenly spaced.
+"""
+def spacing(fitnesses: np.ndarray):
+    points = _finite(fitnesses)
+    if (len(points) < 2):
+        return 0.0
+    return float(np.std(_nearest_distances(points, 1), ddof=1))
+
+
+"""
+    Spread: mean absolute deviation of the nearest neighbour distances,
+    relative to their mean. 0 means evenly spread.
+"""
+def spread(fitnesses: np.ndarray):
+    points = _finite(fitnesses)
+    if (len(points) < 2):
+        return 0.0
+    distances = _nearest_distances(points, 2)
+    mean = np.mean(distances)
+    if (mean == 0):
+        return 0.0
+    return float(np.mean(np.abs(distances - mean)) / mean)
+
+
+"""
+    Reference point for the hypervolume of a run, below every given fitness:
+    their minimum, pushed `margin` of their range further.
+"""
+def reference_point(fitnesses: np.ndarray, margin: float = 0.1):
+    points = _finite(fitnesses)
+    low = np.min(points, axis=0)
+    extent = np.max(points, axis=0) - low
+    return low - margin * np.where(extent > 0, extent, 1.0)
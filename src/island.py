@@ -0,0 +1,185 @@
+import copy
+import random
+import itertools
+import traceback
+import numpy as np
+from queue import Empty
+from typing import Type
+from multiprocessing import Process, Queue
+from src.nsga2 import NSGA2, NSGA2Config, Individual
+from src.population import Population
+from src.util.log import Log
+
+
+"""
+    Island model: `n_islands` NSGA2 populations evolve in separate
+    processes and, every `migration_interval` epochs, each one sends
+    `n_migrants` individuals of its first front to its neighbours.
+
+    `topology` is 'ring' (each island sends to the next one), 'all'
+    (to every other island), 'random' (to one random island each time)
+    or a dict of {island: [neighbours]}.
+    Migration is asynchronous: islands take in whatever migrants have
+    arrived and never wait for each other.
+
+    Migrants travel as (fitnesses, genomes) arrays, so individuals must
+    be numeric (see `ArrayIndividual`). Each island writes its checkpoints
+    to `gen_out_path/island_<i>` and runs no monitor server.
+"""
+class Islands:
+
+    TOPOLOGIES = ('ring', 'all', 'random')
+
+    def __init__(self,
+        individual_class: Type[Individual],
+        config: NSGA2Config = NSGA2Config(),
+        n_islands: int = 4,
+        topology = 'ring',
+        migration_interval: int = 10,
+        n_migrants: int = 5,
+        seed: int = None,
+        **kwargs
+    ):
+        if (not hasattr(individual_class, 'from_genomes')):
+            raise ValueError('Islands need individuals with numeric genomes (see ArrayIndividual)')
+        if (isinstance(topology, str) and topology not in Islands.TOPOLOGIES):
+            raise ValueError(f'Unknown topology: {topology}')
+        self.individual_class = individual_class
+        self.config = config
+        self.n_islands = n_islands
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.seed = seed if seed is not None else np.random.randint(2**31)
+        self.individual_kwargs = kwargs
+        self.populations = []
+        self.ranks = []
+        self.indicators = []
+
+    """
+        Islands each one sends its migrants to.
+    """
+    def neighbours(self, island: int):
+        if (self.topology == 'ring'):
+            return [(island + 1) % self.n_islands] if self.n_islands > 1 else []
+        if (self.topology == 'all'):
+            return [i for i in range(self.n_islands) if i != island]
+        if (self.topology == 'random'):
+            others = [i for i in range(self.n_islands) if i != island]
+            return [random.choice(others)] if others else []
+        return list(self.topology.get(island, []))
+
+    """
+        Trains every island for `epochs` epochs and collects their last
+        populations (in `populations`, with their `ranks` and `indicators`).
+        If an island fails (or its process dies), the others are terminated
+        and a RuntimeError is raised with the island's traceback.
+    """
+    def train(self, epochs: int):
+        inboxes = [Queue() for _ in range(self.n_islands)]
+        results = Queue()
+        processes = [
+            Process(target=Islands._run_island, args=(self, island, epochs, inboxes, results))
+            for island in range(self.n_islands)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            collected = Islands._collect(processes, results)
+        except BaseException:
+            for process in processes:
+                if (process.is_alive()):
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        self.populations, self.ranks, self.indicators = [], [], []
+        for island in range(self.n_islands):
+            fitnesses, genomes, ranks, indicators = collected[island]
+            individuals = self.individual_class.bind(**self.individual_kwargs).from_genomes(genomes)
+            self.populations.append(Population(individuals, fitnesses, genomes))
+            self.ranks.append(ranks)
+            self.indicators.append(indicators)
+        return self.populations
+
+    """
+        Results of every island, by island, waiting for them with
+        `timeout` seconds polls so a dead process is noticed.
+    """
+    @staticmethod
+    def _collect(processes: list, results: Queue, timeout: float = 1.0):
+        collected = {}
+        while (len(collected) < len(processes)):
+            try:
+                island, error, result = results.get(timeout=timeout)
+            except Empty:
+                for island, process in enumerate(processes):
+                    if (island not in collected and process.exitcode not in (None, 0)):
+                        raise RuntimeError(f'Island {island} died (exit code {process.exitcode})')
+                continue
+            if (error is not None):
+                raise RuntimeError(f'Island {island} failed:\n{error}')
+            collected[island] = result
+        return collected
+
+    """
+        Island process: trains its own NSGA2 between migrations.
+        Errors are sent back to the parent (see `train`) as tracebacks.
+    """
+    def _run_island(self, island: int, epochs: int, inboxes: list, results: Queue):
+        try:
+            result = self._train_island(island, epochs, inboxes)
+        except Exception:
+            results.put((island, traceback.format_exc(), None))
+            return
+        results.put((island, None, result))
+
+    def _train_island(self, island: int, epochs: int, inboxes: list):
+        np.random.seed((self.seed + island) % 2**32)
+        random.seed(self.seed + island)
+        # Interleaved ids, so they're unique across islands
+        NSGA2._ids = itertools.count(island, self.n_islands)
+        # Migrants left unread when an island finishes can be dropped
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+
+        config = copy.copy(self.config)
+        config.run_monitor_server = False
+        if (config.gen_out_path):
+            config.gen_out_path = f'{config.gen_out_path}/island_{island}'
+        nsga2 = NSGA2(self.individual_class, config, **self.individual_kwargs)
+
+        done = 0
+        while (done < epochs):
+            interval = min(self.migration_interval, epochs - done)
+            nsga2.train(interval)
+            done += interval
+            if (done == epochs):
+                break
+            fitnesses, genomes = nsga2.emigrants(self.n_migrants)
+            for neighbour in self.neighbours(island):
+                inboxes[neighbour].put((fitnesses, genomes))
+            n_arrived = Islands._immigrate(nsga2, inboxes[island])
+            Log.logger.info(f'[Island {island}] Epoch {done}/{epochs}: {n_arrived} migrants arrived')
+
+        generation = nsga2.generations[-1]
+        population = generation.population
+        return np.array(population.fitnesses), np.array(population.genomes), generation.ranks, generation.indicators
+
+    @staticmethod
+    def _immigrate(nsga2: NSGA2, inbox: Queue):
+        fitnesses, genomes = [], []
+        while True:
+            try:
+                f, g = inbox.get_nowait()
+            except Empty:
+                break
+            fitnesses.append(f)
+            genomes.append(g)
+        if (len(genomes) == 0):
+            return 0
+        nsga2.immigrate(np.concatenate(fitnesses), np.concatenate(genomes))
+        return sum(len(g) for g in genomes)
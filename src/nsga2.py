@@ -1,15 +1,26 @@
 import numpy as np
-import uuid
+import itertools
 import pickle
 import os
 import copy
-from tqdm import tqdm
+import warnings
+from functools import lru_cache
 from typing import Type
-from src.select import select_n_best
-from src.sort import non_dominated_sort
+from src.select import select_n_best_array, select_n_best_of_front_array, front_crowding, binary_tournament, mating_pairs
+from src.sort import IncrementalSort, iter_fronts
+from src.population import Population
+from src.evaluate import EVALUATORS
+from src.cache import FitnessCache
+from src.archive import ParetoArchive
+from src.stopping import StoppingCriteria
+from src.indicators import hypervolume, igd, spacing, spread, reference_point
+from src.checkpoint import Checkpoint, CheckpointWriter
 from src.util.log import Log
+from src.util.metrics import NullMetrics
 from src.util.monitor.server import MonitorServer
+from src.util.monitor.frame import Frame
 from multiprocessing import Process, Queue
+from concurrent.futures import Future, wait, FIRST_COMPLETED
 
 
 """
@@ -18,14 +29,20 @@ from multiprocessing import Process, Queue
     be initialized from two parents.
     It should also calculate a fitness for such parameters
     to be maximized, which consists of a list of numbers.
+    Subclasses can declare `__slots__` for their parameters to keep
+    instances small; data shared by all of them belongs on the class (see `bind`).
 """
 class Individual:
 
+    __slots__ = ('id', 'parents')
+
     def __init__(self, parents = None, **kwargs):
         self.id = NSGA2._new_id()
         self.parents = None
-        for name, val in kwargs.items():
-            setattr(self, name, val)
+        if (kwargs):
+            warnings.warn('Individual kwargs are deprecated, share values through Individual.bind instead', DeprecationWarning, stacklevel=2)
+            for name, val in kwargs.items():
+                setattr(self, name, val)
         if (parents):
             if (len(parents) == 2):
                 self.parents = (parents[0].id, parents[1].id)
@@ -36,16 +53,63 @@ class Individual:
         else:
             self.create()
 
-    def _clone(self, original, kwargs):
-        for key, val in vars(original).items():
+    def _clone(self, original, kwargs = ()):
+        for key, val in original._attributes():
             if (key in kwargs): continue
-            if (key == 'id'): continue
-            if (key == 'parents'): continue
             if isinstance(val, list):
                 setattr(self, key, list(val))
+            elif isinstance(val, np.ndarray):
+                setattr(self, key, val.copy())
             else:
                 setattr(self, key, val)
-        self.id = NSGA2._new_id()
+
+    """
+        Parameters of this individual (slots and instance attributes),
+        excluding its id and parents.
+    """
+    def _attributes(self):
+        for name in _slot_names(type(self)):
+            if hasattr(self, name):
+                yield name, getattr(self, name)
+        yield from getattr(self, '__dict__', {}).items()
+
+    # class this one was bound from (see `bind`)
+    _unbound = None
+
+    """
+        Subclass sharing values (e.g. a dataset) with all its individuals,
+        as class attributes, instead of storing them on every instance.
+        The class itself is left untouched, so runs with other values
+        don't interfere. Individuals are pickled as instances of the unbound
+        class, without the values (see `adopt` to bind them again), but
+        copies keep the bound class.
+    """
+    @classmethod
+    def bind(cls, **kwargs):
+        if (not kwargs):
+            return cls
+        unbound = cls._unbound or cls
+        attributes = dict(kwargs,
+            __slots__=(),
+            __module__=cls.__module__,
+            __qualname__=f'{unbound.__qualname__}[bound]',
+            _unbound=unbound,
+            __reduce_ex__=_reduce_unbound,
+            __copy__=_copy_bound,
+            __deepcopy__=_copy_bound
+        )
+        return type(f'{unbound.__name__}[bound]', (cls,), attributes)
+
+    """
+        Makes the given individuals (e.g. unpickled ones) instances of
+        this class, if it's a subclass of theirs.
+    """
+    @classmethod
+    def adopt(cls, individuals):
+        for individual in individuals:
+            if (type(individual) is not cls and issubclass(cls, type(individual))):
+                individual.__class__ = cls
+        return individuals
 
     def create(self):
         raise NotImplementedError()
@@ -59,35 +123,180 @@ class Individual:
     def fitness(self):
         raise NotImplementedError()
 
+    """
+        Optional hook to calculate the fitnesses of many individuals at once,
+        returning a (N, M) array. Override it as a classmethod when the
+        objectives can be vectorized, and it will be used instead of `fitness()`.
+    """
+    @classmethod
+    def batch_fitness(cls, individuals):
+        raise NotImplementedError()
+
+    """
+        Optional hook returning a hashable key of the individual's parameters,
+        used to cache fitnesses (see `NSGA2Config.fitness_cache_size`).
+        Individuals with equal keys must have equal fitnesses.
+    """
+    def genome_key(self):
+        raise NotImplementedError()
+
+    @classmethod
+    def _has_batch_fitness(cls):
+        return cls.batch_fitness.__func__ is not Individual.batch_fitness.__func__
+
+
+def _reduce_unbound(self, protocol):
+    _, _, *state = object.__reduce_ex__(self, max(protocol, 2))
+    return (_new_individual, (type(self)._unbound,), *state)
+
+
+def _new_individual(cls):
+    return cls.__new__(cls)
+
+
+"""
+    Copy of a bound individual, deep with a `memo`, as `copy` would make
+    it without `_reduce_unbound`.
+"""
+def _copy_bound(self, memo = None):
+    copied = _new_individual(type(self))
+    _, _, state, *_ = object.__reduce_ex__(self, 4)
+    if (memo is not None):
+        memo[id(self)] = copied
+        state = copy.deepcopy(state, memo)
+    if (hasattr(copied, '__setstate__')):
+        copied.__setstate__(state)
+        return copied
+    slots = None
+    if (isinstance(state, tuple) and len(state) == 2):
+        state, slots = state
+    if (state):
+        copied.__dict__.update(state)
+    for name, val in (slots or {}).items():
+        setattr(copied, name, val)
+    return copied
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls):
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names += [name for name in slots if name not in ('__dict__', '__weakref__', 'id', 'parents')]
+    return tuple(names)
+
 
 """
     A set of individuals and fitnesses of an epoch.
+    The population is kept best-first, `ranks` holds the front of each row.
 """
 class Generation:
     
-    def __init__(self, population, fitnesses, sorted_ids):
+    def __init__(self, population: Population, ranks: np.ndarray = None, cache_stats: dict = None, epoch: int = None, indicators: dict = None):
         self.id = NSGA2._new_id()
         self.population = population
-        self.fitnesses = fitnesses
-        self.sorted_ids = sorted_ids
+        self.ranks = ranks
+        self.cache_stats = cache_stats
+        self.epoch = epoch
+        self.indicators = indicators
+
+    @property
+    def sorted_ids(self):
+        return self.population.ids.tolist()
+
+    @property
+    def fitnesses(self):
+        return self.population.fitness_dict()
 
     def get_fitness_dims(self):
-        return len(list(self.fitnesses.values())[0])
+        return self.population.fitnesses.shape[1]
+
+    def get_fitnesses(self):
+        return self.population.fitnesses
+
+    def get_front(self):
+        if (self.ranks is None):
+            return self.population.fitnesses
+        return self.population.fitnesses[self.ranks == 0]
+
+    """
+        Compact record of this generation, keeping per-objective stats
+        and at most `front_points` of the first front's fitnesses. `path`
+        is where the full generation can be loaded from, if it was checkpointed.
+    """
+    def summarize(self, path: str = None, front_points: int = None):
+        return GenerationSummary(self, path, front_points)
 
     def report(self):
-        dims = self.get_fitness_dims()
-        n = len(self.fitnesses)
-        
-        fits = [[f[d] for f in self.fitnesses.values()] for d in range(dims)]
-        max_fits = [np.max(fit_d) for fit_d in fits]
-        avg_fits = [np.average(fit_d) for fit_d in fits]
+        fitnesses = self.population.fitnesses
+        max_fits = np.max(fitnesses, axis=0).tolist()
+        avg_fits = np.average(fitnesses, axis=0).tolist()
 
         Log.logger.info(f'Generation {self.id}:')
         Log.logger.info(f'\tmax fitness: {max_fits}')
         Log.logger.info(f'\tavg fitness: {avg_fits}')
         Log.logger.info(f'\ttop 5:')
-        for id in self.sorted_ids[:5]:
-            Log.logger.info(f'\t\t{id}: {self.fitnesses[id]}')
+        for id, fitness in zip(self.population.ids[:5], fitnesses[:5].tolist()):
+            Log.logger.info(f'\t\t{id}: {fitness}')
+        if (self.cache_stats):
+            Log.logger.info(f'\tfitness cache: {self.cache_stats["hits"]} hits, {self.cache_stats["misses"]} misses')
+        if (self.indicators):
+            values = ', '.join(f'{name}: {value:.6g}' for name, value in self.indicators.items() if name != 'reference')
+            Log.logger.info(f'\tindicators: {values}')
+
+
+"""
+    Compact record of an older generation, kept in the history
+    instead of its whole population (see `NSGA2Config.history_size`).
+    It keeps the size of the first front but, with `front_points`, only
+    that many of its fitnesses: the extremes of the first objective and
+    evenly spaced ones between them.
+"""
+class GenerationSummary:
+
+    def __init__(self, generation: Generation, path: str = None, front_points: int = None):
+        fitnesses = np.asarray(generation.population.fitnesses, dtype=float)
+        self.id = generation.id
+        self.epoch = generation.epoch
+        self.size = len(fitnesses)
+        self.cache_stats = generation.cache_stats
+        self.indicators = generation.indicators
+        self.max = np.max(fitnesses, axis=0)
+        self.min = np.min(fitnesses, axis=0)
+        self.mean = np.average(fitnesses, axis=0)
+        first = generation.ranks == 0 if generation.ranks is not None else slice(None)
+        front = fitnesses[first]
+        self.front_size = len(front)
+        if (front_points is not None and len(front) > front_points):
+            order = np.argsort(front[:,0], kind='stable')
+            front = front[order[np.linspace(0, len(front) - 1, front_points).astype(int)]]
+        self.front = np.array(front)
+        self.path = path
+
+    def get_fitness_dims(self):
+        return len(self.max)
+
+    """
+        First front's fitnesses (those kept, see `front_size` for its size).
+    """
+    def get_fitnesses(self):
+        return self.front
+
+    def get_front(self):
+        return self.front
+
+    """
+        Loads the full generation back from its checkpoint.
+    """
+    def load(self, individual_class: Type[Individual]):
+        if (self.path is None or not os.path.isdir(self.path)):
+            raise FileNotFoundError(f'Generation {self.id} was not checkpointed')
+        population, ranks, meta = Checkpoint.read_generation(self.path, individual_class)
+        generation = Generation(population, ranks, meta['cache_stats'], meta['epoch'], meta.get('indicators'))
+        generation.id = meta['id']
+        return generation
 
 
 """
@@ -98,12 +307,52 @@ class NSGA2Config:
         pop_size: int = 100,
         crossover_ratio = 0.7,
         gen_out_path: str = None,
-        run_monitor_server = True
+        run_monitor_server = True,
+        sort_engine: str = 'auto',
+        incremental_sort: bool = False,
+        evaluator = 'serial',
+        fitness_cache_size: int = 0,
+        steady_state: bool = False,
+        max_in_flight: int = None,
+        checkpoint_every: int = 1,
+        checkpoint_interval: float = None,
+        checkpoint_async: bool = True,
+        checkpoint_queue_size: int = 2,
+        history_size: int = None,
+        history_spill: bool = False,
+        history_front_points: int = 100,
+        archive_size: int = 0,
+        archive_prune: str = 'crowding',
+        indicators: bool = True,
+        hv_reference: list = None,
+        hv_max_objectives: int = 3,
+        igd_reference: np.ndarray = None,
+        metrics = None
     ):
         self.pop_size = pop_size
         self.crossover_ratio = crossover_ratio
         self.gen_out_path = gen_out_path
         self.run_monitor_server = run_monitor_server
+        self.sort_engine = sort_engine
+        self.incremental_sort = incremental_sort
+        self.evaluator = evaluator
+        self.fitness_cache_size = fitness_cache_size
+        self.steady_state = steady_state
+        self.max_in_flight = max_in_flight
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_async = checkpoint_async
+        self.checkpoint_queue_size = checkpoint_queue_size
+        self.history_size = history_size
+        self.history_spill = history_spill
+        self.history_front_points = history_front_points
+        self.archive_size = archive_size
+        self.archive_prune = archive_prune
+        self.indicators = indicators
+        self.hv_reference = hv_reference
+        self.hv_max_objectives = hv_max_objectives
+        self.igd_reference = igd_reference
+        self.metrics = metrics
 
 
 """
@@ -112,126 +361,590 @@ class NSGA2Config:
 """
 class NSGA2:
 
+    _ids = itertools.count()
+
     @staticmethod
     def _new_id():
-        return str(uuid.uuid4())[:8]
+        return next(NSGA2._ids)
+
+    """
+        Makes sure new ids are greater than `id`, e.g. after loading a checkpoint.
+    """
+    @staticmethod
+    def _reserve_ids(id: int):
+        current = next(NSGA2._ids)
+        NSGA2._ids = itertools.count(max(current, id+1))
 
     def __init__(self, individual_class: Type[Individual], config = NSGA2Config(), **kwargs):
-        self.individual_class = individual_class
+        self.individual_class = individual_class.bind(**kwargs)
         self.config = config
         self.individual_kwargs = kwargs
-        self.population = {}
+        self.population = Population([])
         self.generations = []
+        self.epoch = 0
+        self.evaluations = 0
+        self.stopping = None
+        self.checkpoint = None
+        if (self.config.history_spill and not self.config.gen_out_path):
+            raise ValueError('history_spill needs a gen_out_path to spill generations to')
+        if (self.config.gen_out_path):
+            self.checkpoint = Checkpoint(self.config.gen_out_path)
+            self.checkpoint_writer = CheckpointWriter(
+                self.checkpoint,
+                every=self.config.checkpoint_every,
+                interval=self.config.checkpoint_interval,
+                queue_size=self.config.checkpoint_queue_size,
+                background=self.config.checkpoint_async
+            )
+        self.evaluator = self.config.evaluator
+        if (isinstance(self.evaluator, str)):
+            self.evaluator = EVALUATORS[self.evaluator]()
+        self.evaluator.setup(self.individual_kwargs)
+        self.cache = None
+        if (self.config.fitness_cache_size > 0):
+            self.cache = FitnessCache(self.config.fitness_cache_size)
+        self.archive = None
+        if (self.config.archive_size > 0):
+            self.archive = ParetoArchive(self.config.archive_size, self.config.archive_prune)
+        self.metrics = self.config.metrics if self.config.metrics is not None else NullMetrics()
+        self.hv_reference = None
+        if (self.config.hv_reference is not None):
+            self.hv_reference = np.asarray(self.config.hv_reference, dtype=float)
         if (self.config.run_monitor_server):
             self._run_monitor_server()
 
+    """
+        Resumes from a checkpoint: either a run directory (its last generation),
+        a generation directory or a legacy pickled `.gen` file.
+        Arrays are memory-mapped. If this instance was created without
+        kwargs, the ones saved with the run are bound to the individual class.
+    """
     def load(self, path):
-        with open(path, 'rb') as file:
-            last_generation = pickle.load(file)
-        self.population = last_generation.population
+        if (os.path.isfile(path)):
+            with open(path, 'rb') as file:
+                last_generation = self._from_legacy(pickle.load(file))
+        else:
+            run_path = path
+            if (Checkpoint.GENERATION.match(os.path.basename(os.path.normpath(path)))):
+                run_path = os.path.dirname(os.path.normpath(path))
+            checkpoint = Checkpoint(run_path)
+            if (run_path == path):
+                paths = checkpoint.generation_paths()
+                if (not paths):
+                    raise FileNotFoundError(f'No generation checkpointed in {run_path}')
+                path = paths[-1]
+            if (checkpoint.has_context and not self.individual_kwargs):
+                self.individual_kwargs = checkpoint.read_context()['kwargs']
+                self.individual_class = self.individual_class.bind(**self.individual_kwargs)
+                self.evaluator.setup(self.individual_kwargs)
+            population, ranks, meta = Checkpoint.read_generation(path, self.individual_class)
+            last_generation = Generation(population, ranks, meta['cache_stats'], meta['epoch'], meta.get('indicators'))
+            last_generation.id = meta['id']
+        self.population = Population([])
         self.generations = [last_generation]
+        epoch = getattr(last_generation, 'epoch', None)
+        self.epoch = epoch + 1 if epoch is not None else len(self.generations)
+        NSGA2._reserve_ids(max([last_generation.id, *last_generation.population.ids.tolist()]))
+        indicators = getattr(last_generation, 'indicators', None)
+        if (self.hv_reference is None and indicators and 'reference' in indicators):
+            self.hv_reference = np.asarray(indicators['reference'], dtype=float)
+        self._update_archive(last_generation.population)
+
+    """
+        Converts a generation pickled by older versions, which kept dicts
+        of individuals and fitnesses by string id, into a ranked population.
+        Individuals get new ids, and no parents (they aren't in the file).
+    """
+    def _from_legacy(self, legacy):
+        state = getattr(legacy, '__dict__', {})
+        if (not isinstance(state.get('population'), dict) or 'sorted_ids' not in state):
+            raise ValueError('Not a pickled generation')
+        old_ids = list(state['sorted_ids'])
+        individuals = self.individual_class.adopt([state['population'][id] for id in old_ids])
+        fitnesses = np.array([state['fitnesses'][id] for id in old_ids], dtype=float)
+        for individual in individuals:
+            # old ids and parents, and shared kwargs now bound to the class
+            attributes = getattr(individual, '__dict__', {})
+            for name in ('id', 'parents', *self.individual_kwargs):
+                attributes.pop(name, None)
+            individual.id = NSGA2._new_id()
+            individual.parents = None
+
+        ranks = np.empty(len(individuals), dtype=int)
+        for rank, front in enumerate(iter_fronts(fitnesses, self.config.sort_engine)):
+            ranks[front] = rank
+        return Generation(Population(individuals, fitnesses), ranks)
 
     def _run_monitor_server(self):
         self.monitor_queue = Queue()
         Process(target=MonitorServer.process, args=(self.monitor_queue,)).start()
 
     def _random_population(self, n: int):
-        population = {}
-        for _ in range(n):
-            ind = self.individual_class(**self.individual_kwargs)
-            population[ind.id] = ind
-        return population
-    
-    def _get_fitness(self, population):
-        items = tqdm(list(population.items()))
-        fitnesses = {
-            id: ind.fitness() for id, ind in items
-        }
-        return fitnesses
-
-    def _select_best_ids(self, population, fitnesses):
-        fronts = non_dominated_sort(fitnesses)
-        sorted_ids = select_n_best(fronts, self.config.pop_size)
-        return sorted_ids
+        if (self._has_genomes()):
+            genomes = self.individual_class.random_genomes(n)
+            return self._from_genomes(genomes)
+        return Population([self.individual_class() for _ in range(n)])
+
+    """
+        Whether individuals are bred as genome matrices (see `ArrayIndividual`).
+    """
+    def _has_genomes(self):
+        return hasattr(self.individual_class, 'from_genomes')
+
+    def _from_genomes(self, genomes: np.ndarray, parents: list = None):
+        individuals = self.individual_class.from_genomes(genomes, parents)
+        return Population(individuals, genomes=genomes)
     
-    def _binary_tournament(self, parents, sorted_ids):
-        sorted_ids = list(enumerate(sorted_ids))
-        np.random.shuffle(sorted_ids)
-        middle = len(sorted_ids)//2
-        parents_a = sorted_ids[:middle]
-        parents_b = sorted_ids[middle:2*middle]
-        best_parents = []
-        for a, b in zip(parents_a, parents_b):
-            if (a[0] < b[0]):
-                best_parents.append(parents[a[1]])
+    """
+        Offers evaluated individuals to the elite archive, if enabled.
+    """
+    def _update_archive(self, population: Population):
+        if (self.archive is not None):
+            self.archive.update(population.individuals, population.fitnesses)
+
+    def _get_fitness(self, population: Population):
+        with self.metrics.phase('evaluation'):
+            if (self.cache is not None):
+                return self._get_cached_fitness(population.individuals)
+            return self._evaluate(population.individuals)
+
+    def _evaluate(self, individuals):
+        self.evaluations += len(individuals)
+        if (self.individual_class._has_batch_fitness()):
+            fitnesses = self.evaluator.evaluate_batch(self.individual_class, individuals)
+        else:
+            fitnesses = self.evaluator.evaluate(individuals)
+        return np.array(fitnesses, dtype=float)
+
+    def _get_cached_fitness(self, individuals):
+        keys = [ind.genome_key() for ind in individuals]
+        fitnesses = [None] * len(keys)
+
+        # Evaluate each missing genome once, even if repeated
+        missing = {}
+        for i, key in enumerate(keys):
+            if (key in missing):
+                self.cache.hits += 1
+                continue
+            fitnesses[i] = self.cache.get(key)
+            if (fitnesses[i] is None):
+                missing[key] = i
+        evaluated = self._evaluate(individuals[list(missing.values())]) if len(missing) else []
+        evaluated = dict(zip(missing, evaluated))
+        for key, fitness in evaluated.items():
+            self.cache.put(key, fitness)
+
+        for i, key in enumerate(keys):
+            if (fitnesses[i] is None):
+                fitnesses[i] = evaluated[key]
+        return np.array(fitnesses, dtype=float)
+
+    """
+        Rows of the `pop_size` best individuals, best first, and their ranks.
+        If `parents` is given, the population must end with the parents' rows.
+    """
+    def _select_best_ids(self, population: Population, parents: Generation = None):
+        with self.metrics.phase('sorting'):
+            if (self.config.incremental_sort and getattr(parents, 'ranks', None) is not None):
+                index_fronts = iter(self._merge_fronts(population, parents))
             else:
-                best_parents.append(parents[b[1]])
-        return best_parents
+                index_fronts = iter_fronts(population.fitnesses, self.config.sort_engine)
+
+        # Fronts are produced lazily, select_n_best_array stops consuming
+        # them once it has pop_size rows
+        ranks = np.empty(len(population), dtype=int)
+        def consume():
+            for rank in itertools.count():
+                with self.metrics.phase('sorting'):
+                    front = next(index_fronts, None)
+                if (front is None):
+                    return
+                ranks[front] = rank
+                yield front
+        with self.metrics.phase('crowding'):
+            best = select_n_best_array(population.fitnesses, consume(), self.config.pop_size)
+        return best, ranks[best]
+
+    def _merge_fronts(self, population: Population, parents: Generation):
+        n_children = len(population) - len(parents.population)
+
+        # Surviving parents keep their ranks, children are inserted
+        parent_ranks = parents.ranks
+        parent_fronts = [np.flatnonzero(parent_ranks == r) for r in range(parent_ranks.max()+1)]
+        merged = IncrementalSort(population.fitnesses[n_children:], parent_fronts)
+        merged.insert(population.fitnesses[:n_children])
+
+        rows = np.concatenate([np.arange(n_children, len(population)), np.arange(n_children)])
+        return [np.sort(rows[front]) for front in merged.fronts()]
     
-    def _crossover(self, best_parents):
-        n_best = int(len(best_parents) * (1-self.config.crossover_ratio))
-        children = {}
-        for parent in best_parents[:n_best]:
-            child = self.individual_class(parents=(parent,), **self.individual_kwargs)
-            children[child.id] = child
-        while (len(children) < self.config.pop_size):
-            a, b = np.random.choice(best_parents, 2)
-            child = self.individual_class(parents=(a,b), **self.individual_kwargs)
-            children[child.id] = child
-        return children
-
-    def _mutate(self, population):
-        for individual in population.values():
+    """
+        Rows of half of the parents, picked by binary tournament.
+    """
+    def _binary_tournament(self, parents: Generation):
+        ranks = parents.ranks
+        if (ranks is None):
+            ranks = np.arange(len(parents.population))
+        with self.metrics.phase('crowding'):
+            crowding = front_crowding(parents.population.fitnesses, ranks)
+        return binary_tournament(ranks, crowding, len(parents.population)//2)
+    
+    """
+        Clones the first tournament winners and crosses random pairs
+        of winners for the remaining children.
+    """
+    def _crossover(self, parents: Population, winners: np.ndarray):
+        n_best = int(len(winners) * (1-self.config.crossover_ratio))
+        clones = winners[:n_best]
+        pairs = mating_pairs(winners, max(0, self.config.pop_size - n_best))
+        if (self._has_genomes()):
+            return self._batch_crossover(parents, clones, pairs)
+        children = []
+        for parent in parents.individuals[clones]:
+            children.append(self.individual_class(parents=(parent,)))
+        for a, b in parents.individuals[pairs]:
+            children.append(self.individual_class(parents=(a,b)))
+        return Population(children)
+
+    def _batch_crossover(self, parents: Population, clones: np.ndarray, pairs: np.ndarray):
+        genomes = parents.genomes
+        children = np.concatenate([
+            genomes[clones],
+            self.individual_class.batch_crossover(genomes[pairs[:,0]], genomes[pairs[:,1]])
+        ])
+        lineage = [(id,) for id in parents.ids[clones]] + [tuple(pair) for pair in parents.ids[pairs].tolist()]
+        return self._from_genomes(children, lineage)
+
+    def _mutate(self, population: Population):
+        if (population.genomes is not None):
+            population.genomes = self.individual_class.batch_mutate(population.genomes)
+            for individual, genome in zip(population, population.genomes):
+                individual.genome = genome
+            return
+        for individual in population:
             individual.mutate()
 
-    def _evolve(self, parents, sorted_ids):
-        best_parents = self._binary_tournament(parents, sorted_ids)
-        children = self._crossover(best_parents)
-        self._mutate(children)
+    def _evolve(self, parents: Generation):
+        with self.metrics.phase('breeding'):
+            winners = self._binary_tournament(parents)
+            children = self._crossover(parents.population, winners)
+            self._mutate(children)
         return children
 
-    def _save_gen(self, population, fitnesses, sorted_ids):
-        generation = Generation(population, fitnesses, sorted_ids)
+    def _save_gen(self, population: Population, ranks: np.ndarray):
+        cache_stats = self.cache.stats() if self.cache is not None else None
+        with self.metrics.phase('indicators'):
+            indicators = self._indicators(population, ranks) if self.config.indicators else None
+        generation = Generation(population, ranks, cache_stats, self.epoch, indicators)
         generation.report()
         self.generations.append(generation)
+        self.epoch += 1
 
-        if (self.config.gen_out_path):
-            filename = f'{generation.id}.gen'
-            path = os.path.join(self.config.gen_out_path,filename)
-            with open(path, 'wb') as file:
-                pickle.dump(generation, file)
+        with self.metrics.phase('checkpointing'):
+            if (self.checkpoint is not None):
+                if (not self.checkpoint.has_context):
+                    self.checkpoint.write_context(self.individual_class._unbound or self.individual_class, self.individual_kwargs)
+                self.checkpoint_writer.put(generation)
+            self._compact_history()
+        self.metrics.end_epoch(self, generation)
 
         if (self.config.run_monitor_server):
-            dump = pickle.dumps(fitnesses)
-            self.monitor_queue.put(dump)
+            meta = {}
+            if (indicators):
+                meta['indicators'] = indicators
+            record = self.metrics.stream()
+            if (record is not None):
+                meta['metrics'] = record
+            frame = Frame(Frame.FULL, generation.epoch, population.fitnesses, population.ids, ranks, meta)
+            self.monitor_queue.put(frame.encode())
+
+    """
+        Indicators of the first front of a generation. The hypervolume
+        reference point is `hv_reference` or, if not set, fixed from the
+        first generation so values are comparable across the run.
+        The exact hypervolume is exponential in the number of objectives,
+        so it is skipped above `hv_max_objectives` (None: never skipped).
+    """
+    def _indicators(self, population: Population, ranks: np.ndarray):
+        fitnesses = np.asarray(population.fitnesses, dtype=float)
+        if (not np.any(np.all(np.isfinite(fitnesses), axis=1))):
+            return None
+        if (self.hv_reference is None):
+            self.hv_reference = reference_point(fitnesses)
+        front = fitnesses[ranks == 0] if ranks is not None else fitnesses
+        indicators = {}
+        max_objectives = self.config.hv_max_objectives
+        if (max_objectives is None or fitnesses.shape[1] <= max_objectives):
+            indicators['hypervolume'] = hypervolume(front, self.hv_reference)
+        indicators['spacing'] = spacing(front)
+        indicators['spread'] = spread(front)
+        if (self.config.igd_reference is not None):
+            indicators['igd'] = igd(front, self.config.igd_reference)
+        indicators['reference'] = self.hv_reference.tolist()
+        return indicators
+
+    """
+        Replaces the generation that just fell out of the last `history_size`
+        by its summary, spilling it to the checkpoint first if `history_spill`.
+    """
+    def _compact_history(self):
+        if (self.config.history_size is None):
+            return
+        i = len(self.generations) - max(1, self.config.history_size) - 1
+        if (i < 0 or not isinstance(self.generations[i], Generation)):
+            return
+        generation = self.generations[i]
+        path = None
+        if (self.checkpoint is not None):
+            if (self.config.history_spill):
+                self.checkpoint_writer.put(generation, force=True)
+            path = self.checkpoint.generation_path(generation.epoch)
+        self.generations[i] = generation.summarize(path, self.config.history_front_points)
+
+    """
+        Trains for `epochs` epochs, or until one of the stopping criteria
+        is met (see `StoppingCriteria`). `epochs` can be None if a
+        criterion is given. The reason training stopped is logged and
+        kept in `self.stopping.reason`.
+    """
+    def train(self, epochs: int = None, max_evaluations: int = None, max_time: float = None, patience: int = None, min_delta: float = 0.0, callbacks: list = ()):
+        self.stopping = StoppingCriteria(max_evaluations, max_time, patience, min_delta, callbacks)
+        if (epochs is None and not self.stopping.is_bounded()):
+            raise ValueError('train needs epochs or a stopping criterion')
+        self.stopping.start(self.evaluations)
+        self.metrics.start(self, self.epoch)
+        try:
+            self._train(epochs)
+        except BaseException as error:
+            self._close(error)
+            raise
+        self._close()
+
+    """
+        Stops what `train` started, checkpointing the last generation.
+        If training failed with `error`, errors of the checkpoint writer
+        are logged instead of raised, so they don't hide it.
+    """
+    def _close(self, error: BaseException = None):
+        self.metrics.stop()
+        self.evaluator.close()
+        if (self.checkpoint is None):
+            return
+        try:
+            try:
+                if (len(self.generations)):
+                    self.checkpoint_writer.put(self.generations[-1], force=True)
+            finally:
+                self.checkpoint_writer.close()
+        except Exception as close_error:
+            if (error is None):
+                raise
+            Log.logger.error(f'Checkpoint writer failed after training failed: {close_error!r}', exc_info=close_error)
+
+    def _train(self, epochs: int):
+        if (self.config.steady_state):
+            return self._train_steady_state(epochs)
 
-    def train(self, epochs: int):
         # initial generation
-        if (len(self.population) == 0):
+        if (len(self.generations) == 0):
             Log.logger.info(f'Epoch 0/{epochs}')
 
-            population = self._random_population(self.config.pop_size)
-            fitnesses = self._get_fitness(population)
+            population = self._random_population(self._budget(self.config.pop_size))
+            population.fitnesses = self._get_fitness(population)
+            self._update_archive(population)
 
-            sorted_ids = self._select_best_ids(population, fitnesses)
-            self._save_gen(population, fitnesses, sorted_ids)
+            best, ranks = self._select_best_ids(population)
+            self._save_gen(population.take(best), ranks)
+            if (self._should_stop()):
+                return
             
-            self.population = self._evolve(population, sorted_ids)
+            self.population = self._evolve(self.generations[-1])
 
         # t-th generation
-        for epoch in range(1,epochs+1):
+        for epoch in (range(1,epochs+1) if epochs is not None else itertools.count(1)):
             Log.logger.info(f'Epoch {epoch}/{epochs}')
 
-            fitnesses = self._get_fitness(self.population)
-            fitnesses = { **fitnesses, **self.generations[-1].fitnesses }
-            population = { **self.population, **self.generations[-1].population }
+            parents = self.generations[-1]
+            if (len(self.population) == 0):
+                self.population = self._evolve(parents)
+            n_children = self._budget(len(self.population))
+            if (n_children < len(self.population)):
+                self.population = self.population.take(np.arange(n_children))
+            self.population.fitnesses = self._get_fitness(self.population)
+            self._update_archive(self.population)
+            population = Population.concat(self.population, parents.population)
     
-            sorted_ids = self._select_best_ids(population, fitnesses)
-            population = { id: ind for id, ind in population.items() if id in sorted_ids }
-            fitnesses = { id: ind for id, ind in fitnesses.items() if id in sorted_ids }
-            self._save_gen(population, fitnesses, sorted_ids)
+            best, ranks = self._select_best_ids(population, parents)
+            self._save_gen(population.take(best), ranks)
+            if (self._should_stop()):
+                return
             
-            self.population = self._evolve(population, sorted_ids)
+            self.population = self._evolve(self.generations[-1])
+
+    """
+        How many of `n` individuals the evaluation budget can still afford.
+    """
+    def _budget(self, n: int):
+        remaining = self.stopping.remaining_evaluations(self.evaluations)
+        return n if remaining is None else min(n, remaining)
+
+    def _should_stop(self):
+        if (not self.stopping.update(self, self.generations[-1])):
+            return False
+        Log.logger.info(f'Stopping: {self.stopping.reason}')
+        return True
+
+    """
+        Steady-state training: each finished evaluation is inserted in the
+        ranked archive right away and a new child is bred from it, so up to
+        `max_in_flight` evaluations (default: the evaluator's workers) are
+        always running. Every `pop_size` evaluations count as an epoch.
+        Individuals are evaluated one at a time (`batch_fitness` of a single
+        individual if the class defines it).
+    """
+    def _train_steady_state(self, epochs: int):
+        pop_size = self.config.pop_size
+        max_in_flight = self.config.max_in_flight or self.evaluator.workers
+        if (len(self.generations)):
+            archive = self.generations[-1].population
+            ranks = self.generations[-1].ranks
+            n_random = 0
+        else:
+            archive = Population([])
+            ranks = np.empty(0, dtype=int)
+            n_random = pop_size
+            epochs = epochs + 1 if epochs is not None else None
+        total = epochs * pop_size if epochs is not None else float('inf')
+
+        pending = {}
+        submitted = 0
+        finished = 0
+        try:
+            while (finished < total):
+                while (len(pending) < max_in_flight and submitted < total and self._budget(1)):
+                    with self.metrics.phase('breeding'):
+                        if (submitted < n_random):
+                            individual = self.individual_class()
+                        else:
+                            individual = self._breed_one(archive, ranks)
+                    pending[self._submit(individual)] = individual
+                    submitted += 1
+                if (len(pending) == 0):
+                    break
+
+                with self.metrics.phase('evaluation'):
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    individual = pending.pop(future)
+                    fitness = future.result()
+                    if (self.cache is not None):
+                        self.cache.put(individual.genome_key(), fitness)
+                    if (self.archive is not None):
+                        self.archive.add(individual, fitness)
+                    with self.metrics.phase('sorting'):
+                        archive, ranks = self._insert_one(archive, ranks, individual, fitness)
+                    finished += 1
+                    if (finished % pop_size == 0):
+                        Log.logger.info(f'Epoch {finished // pop_size}/{epochs}')
+                        best = select_n_best_array(archive.fitnesses, self._rank_fronts(ranks), len(archive))
+                        self._save_gen(archive.take(best), ranks[best])
+                        if (self._should_stop()):
+                            return
+
+            # The evaluation budget ran out mid-epoch
+            if (finished % pop_size and len(archive)):
+                best = select_n_best_array(archive.fitnesses, self._rank_fronts(ranks), len(archive))
+                self._save_gen(archive.take(best), ranks[best])
+                self._should_stop()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _submit(self, individual: Individual):
+        if (self.cache is not None):
+            fitness = self.cache.get(individual.genome_key())
+            if (fitness is not None):
+                future = Future()
+                future.set_result(fitness)
+                return future
+        self.evaluations += 1
+        return self.evaluator.submit(individual)
+
+    def _rank_fronts(self, ranks: np.ndarray):
+        if (len(ranks) == 0):
+            return []
+        return [np.flatnonzero(ranks == r) for r in range(ranks.max()+1)]
+
+    """
+        Inserts an evaluated individual in the archive, dropping the most
+        crowded member of the last front if it grows over `pop_size`.
+        Last front members dominate nobody, so the other ranks stay valid.
+    """
+    def _insert_one(self, archive: Population, ranks: np.ndarray, individual: Individual, fitness):
+        genomes = np.array([individual.genome]) if self._has_genomes() else None
+        new = Population([individual], np.array([fitness], dtype=float), genomes)
+        if (len(archive) == 0):
+            return new, np.zeros(1, dtype=int)
+        merged = IncrementalSort(archive.fitnesses, self._rank_fronts(ranks))
+        merged.insert(new.fitnesses)
+        archive = Population.concat(archive, new)
+        fronts = merged.fronts()
+        ranks = np.empty(len(archive), dtype=int)
+        for rank, front in enumerate(fronts):
+            ranks[front] = rank
+
+        if (len(archive) > self.config.pop_size):
+            last = fronts[-1]
+            keep = np.zeros(len(archive), dtype=bool)
+            keep[last[select_n_best_of_front_array(archive.fitnesses[last], len(last)-1)]] = True
+            keep[ranks < len(fronts)-1] = True
+            archive = archive.filter(keep)
+            ranks = ranks[keep]
+        return archive, ranks
+
+    """
+        Breeds a single mutated child from the ranked archive.
+    """
+    def _breed_one(self, archive: Population, ranks: np.ndarray):
+        with self.metrics.phase('crowding'):
+            crowding = front_crowding(archive.fitnesses, ranks)
+        winners = archive.individuals[binary_tournament(ranks, crowding, 2)]
+        if (np.random.rand() < self.config.crossover_ratio):
+            child = self.individual_class(parents=tuple(winners))
+        else:
+            child = self.individual_class(parents=(winners[0],))
+        child.mutate()
+        return child
+
+    """
+        Fitnesses and genomes of up to `n` individuals of the last
+        generation's first front, the least crowded first.
+    """
+    def emigrants(self, n: int):
+        generation = self.generations[-1]
+        population = generation.population
+        first = np.flatnonzero(generation.ranks == 0) if generation.ranks is not None else np.arange(len(population))
+        rows = first[select_n_best_of_front_array(population.fitnesses[first], min(n, len(first)))]
+        return np.array(population.fitnesses[rows]), np.array(population.genomes[rows])
+
+    """
+        Merges evaluated individuals from another population into the last
+        generation, as if they were its children. They get new ids.
+    """
+    def immigrate(self, fitnesses: np.ndarray, genomes: np.ndarray):
+        if (len(genomes) == 0):
+            return
+        parents = self.generations[-1]
+        migrants = self._from_genomes(np.asarray(genomes))
+        migrants.fitnesses = np.asarray(fitnesses, dtype=float)
+        self.metrics.count('immigrants', len(migrants))
+        self._update_archive(migrants)
+        population = Population.concat(migrants, parents.population)
+        best, ranks = self._select_best_ids(population, parents)
+        generation = Generation(population.take(best), ranks, parents.cache_stats, parents.epoch, parents.indicators)
+        generation.id = parents.id
+        self.generations[-1] = generation
+        # children were bred from the old parents
+        self.population = Population([])
 
     def get_fitness_dims(self):
         if (len(self.generations) == 0):
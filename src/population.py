@@ -0,0 +1,79 @@
+from __future__ import annotations
+import numpy as np
+
+
+"""
+    Columnar storage for a set of individuals.
+    Keeps the individuals and their ids side by side with a contiguous
+    (N, M) fitness matrix and, for numeric individuals, an optional
+    (N, G) genome matrix. Merging, selecting and filtering are index
+    operations over those arrays.
+"""
+class Population:
+
+    def __init__(self, individuals:list, fitnesses:np.ndarray = None, genomes:np.ndarray = None):
+        self.individuals = np.empty(len(individuals), dtype=object)
+        self.individuals[:] = individuals
+        self.ids = np.array([ind.id for ind in individuals], dtype=np.int64)
+        self.fitnesses = fitnesses
+        self.genomes = genomes
+        self._index = None
+
+    def __len__(self):
+        return len(self.individuals)
+
+    def __iter__(self):
+        return iter(self.individuals)
+
+    """
+        Row of a given id.
+    """
+    def index(self, id):
+        if (self._index is None):
+            self._index = { id: row for row, id in enumerate(self.ids) }
+        return self._index[id]
+
+    """
+        New population with the given rows, in the given order.
+    """
+    def take(self, rows:np.ndarray):
+        rows = np.asarray(rows, dtype=int)
+        population = Population.__new__(Population)
+        population.individuals = self.individuals[rows]
+        population.ids = self.ids[rows]
+        population.fitnesses = None if self.fitnesses is None else self.fitnesses[rows]
+        population.genomes = None if self.genomes is None else self.genomes[rows]
+        population._index = None
+        return population
+
+    """
+        New population with the rows where `mask` is True.
+    """
+    def filter(self, mask:np.ndarray):
+        return self.take(np.flatnonzero(mask))
+
+    """
+        Concatenates populations, keeping their order.
+        Fitnesses and genomes are only kept if every population has them.
+    """
+    @staticmethod
+    def concat(*populations:Population):
+        population = Population.__new__(Population)
+        population.individuals = np.concatenate([p.individuals for p in populations])
+        population.ids = np.concatenate([p.ids for p in populations])
+        population.fitnesses = Population._concat_matrix([p.fitnesses for p in populations])
+        population.genomes = Population._concat_matrix([p.genomes for p in populations])
+        population._index = None
+        return population
+
+    @staticmethod
+    def _concat_matrix(matrices):
+        if any(m is None for m in matrices):
+            return None
+        return np.concatenate(matrices)
+
+    """
+        Fitnesses as a dict of {id: [float]}.
+    """
+    def fitness_dict(self):
+        return dict(zip(self.ids.tolist(), self.fitnesses.tolist()))
@@ -1,36 +1,68 @@
 from __future__ import annotations
+import numpy as np
 
 
 """
     Calculate the crowding distance for a given front
 """
 def crowding_distance(front:{int|str:[float]}):
-    dims = len(list(front.values())[0])
-    dist = { id: 0 for id in front }
-    for dim in range(dims):
-        el = sorted([(id,v[dim]) for id, v in front.items()], key= lambda v: v[1])
-        dist[el[0][0]] = float('inf')
-        dist[el[-1][0]] = float('inf')
-        scale = (el[-1][1] - el[0][1])
-        if (scale > 0):
-            for i in range(1, len(front)-1):
-                dist[el[i][0]] += (el[i+1][1]-el[i-1][1])/scale
-    return dist
+    dist = crowding_distance_array(np.array(list(front.values()), dtype=float))
+    return dict(zip(front.keys(), dist.tolist()))
+
+
+"""
+    Calculate the crowding distance for a (N, M) front fitness matrix.
+    Distances that can't be computed (e.g. infinite fitnesses) count as 0.
+"""
+def crowding_distance_array(fitnesses:np.ndarray):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    n, dims = fitnesses.shape
+    dist = np.zeros(n)
+    with np.errstate(invalid='ignore'):
+        for dim in range(dims):
+            order = np.argsort(fitnesses[:,dim], kind='stable')
+            values = fitnesses[order,dim]
+            scale = values[-1] - values[0]
+            if (scale > 0):
+                dist[order[1:-1]] += (values[2:] - values[:-2]) / scale
+            dist[order[0]] = float('inf')
+            dist[order[-1]] = float('inf')
+    return np.nan_to_num(dist, nan=0.0, posinf=float('inf'))
 
 
 """
     Selects n best ids from a given front.
 """
 def select_n_best_of_front(front:{int|str:[float]}, n:int):
-    if (n <= 2):
-        return list(front.keys())[:n]
-    dist = crowding_distance(front)
-    best = sorted(list(dist.items()), key= lambda v: -v[1])
-    return [b[0] for b in best[:n]]
-    
-    
+    ids = list(front.keys())
+    best = select_n_best_of_front_array(np.array(list(front.values()), dtype=float), n)
+    return [ids[i] for i in best]
+
+
+"""
+    Selects the n best rows of a (N, M) front fitness matrix, by crowding distance.
+    Ties keep their original order, as a stable sort would.
+"""
+def select_n_best_of_front_array(fitnesses:np.ndarray, n:int):
+    count = len(fitnesses)
+    if (n <= 2 or count == 0):
+        return np.arange(min(n, count))
+    key = -crowding_distance_array(fitnesses)
+
+    # Partition around the n-th key, then fill up with its ties
+    if (n < count):
+        kth = np.partition(key, n-1)[n-1]
+        better = np.flatnonzero(key < kth)
+        ties = np.flatnonzero(key == kth)[:n-len(better)]
+        rows = np.concatenate([better, ties])
+    else:
+        rows = np.arange(count)
+    return rows[np.argsort(key[rows], kind='stable')]
+
+
 """
     Selects n best ids from a given list of fronts.
+    `fronts` can be a generator, it's only advanced until n ids are selected.
 """
 def select_n_best(fronts:[{int|str:[float]}], n:int):
     best = []
@@ -41,5 +73,56 @@ def select_n_best(fronts:[{int|str:[float]}], n:int):
             best += select_n_best_of_front(front, n - len(best))
         if (len(best) == n):
             break
-    
-    return best
\ No newline at end of file
+
+    return best
+
+
+"""
+    Selects the n best rows of a (N, M) fitness matrix, given its fronts
+    as arrays of row indices (or a generator of them).
+"""
+def select_n_best_array(fitnesses:np.ndarray, fronts:[np.ndarray], n:int):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    best = []
+    count = 0
+    for front in fronts:
+        front = np.asarray(front, dtype=int)
+        rows = select_n_best_of_front_array(fitnesses[front], n - count)
+        best.append(front[rows])
+        count += len(rows)
+        if (count == n):
+            break
+    if (len(best) == 0):
+        return np.empty(0, dtype=int)
+    return np.concatenate(best)
+
+
+"""
+    Crowding distance of each row within its own front, given the rows' ranks.
+"""
+def front_crowding(fitnesses:np.ndarray, ranks:np.ndarray):
+    crowding = np.empty(len(ranks))
+    for rank in np.unique(ranks):
+        rows = np.flatnonzero(ranks == rank)
+        crowding[rows] = crowding_distance_array(fitnesses[rows])
+    return crowding
+
+
+"""
+    Binary tournament over row indices: `n` winners of random pairs.
+    The lower rank wins, ties go to the larger crowding distance.
+"""
+def binary_tournament(ranks:np.ndarray, crowding:np.ndarray, n:int):
+    pairs = np.random.randint(len(ranks), size=(2, n))
+    a, b = pairs
+    b_wins = (ranks[b] < ranks[a]) | ((ranks[b] == ranks[a]) & (crowding[b] > crowding[a]))
+    return np.where(b_wins, b, a)
+
+
+"""
+    Draws `n` mating pairs out of the `pool` rows, in a single RNG call.
+    Returns a (n, 2) array of rows.
+"""
+def mating_pairs(pool:np.ndarray, n:int):
+    pool = np.asarray(pool, dtype=int)
+    return pool[np.random.randint(len(pool), size=(n, 2))]
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 
 
 """
@@ -17,11 +18,291 @@ class Result:
         return True
 
 
+"""
+    Sorts a (N, M) fitness matrix into pareto-fronts (arrays of row indices).
+    The dominance relation is built with numpy broadcasting, `block_size`
+    rows at a time, so the temporary comparison tensor stays at
+    (block_size, N, M) instead of (N, N, M).
+"""
+def dominance_sort(fitnesses:np.ndarray, block_size:int = 256):
+    return list(iter_dominance_fronts(fitnesses, block_size))
+
+
+"""
+    Lazy version of `dominance_sort`: fronts are peeled one at a time,
+    as the caller asks for them.
+"""
+def iter_dominance_fronts(fitnesses:np.ndarray, block_size:int = 256):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    n = len(fitnesses)
+
+    # dominates[a, b] is True if a dominates b
+    dominates = np.empty((n, n), dtype=bool)
+    for start in range(0, n, block_size):
+        block = fitnesses[start:start+block_size]
+        dominates[start:start+block_size] = np.all(block[:,None,:] > fitnesses[None,:,:], axis=2)
+    superiors = dominates.sum(axis=0)
+
+    # Peel fronts
+    front = np.flatnonzero(superiors == 0)
+    while (len(front)):
+        yield front
+        superiors[front] = -1
+        superiors -= dominates[front].sum(axis=0)
+        front = np.flatnonzero(superiors == 0)
+
+
+"""
+    Sorts a (N, 2) fitness matrix into pareto-fronts in O(N log N).
+    Sweeps the first objective in descending order while a Fenwick tree,
+    indexed by the second objective, answers "highest rank among the
+    points that are greater on both objectives".
+"""
+def sweep_sort_2d(fitnesses:np.ndarray):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    n = len(fitnesses)
+
+    # Compress the second objective, greatest value -> position 1
+    values = np.unique(fitnesses[:,1])
+    size = len(values)
+    pos = (size - np.searchsorted(values, fitnesses[:,1])).tolist()
+
+    order = np.argsort(-fitnesses[:,0], kind='stable')
+    x = fitnesses[order,0]
+    groups = np.flatnonzero(np.diff(x)) + 1
+    tree = [0] * (size+1)
+    ranks = [0] * n
+
+    # Points with an equal first objective can't dominate each other,
+    # so each group is queried before any of it is inserted
+    for group in np.split(order, groups):
+        group = group.tolist()
+        for i in group:
+            rank = 0
+            k = pos[i] - 1
+            while (k > 0):
+                if (tree[k] > rank): rank = tree[k]
+                k -= k & -k
+            ranks[i] = rank
+        for i in group:
+            value = ranks[i] + 1
+            k = pos[i]
+            while (k <= size):
+                if (tree[k] < value): tree[k] = value
+                k += k & -k
+
+    return _ranks_to_fronts(np.array(ranks, dtype=int))
+
+
+"""
+    Sorts a (N, M) fitness matrix into pareto-fronts using
+    Efficient Non-dominated Sort with binary search (ENS-BS).
+    Points are visited by descending first objective, so all of their
+    dominators are already placed; each one goes to the first front
+    that doesn't dominate it. Memory is O(N·M).
+"""
+def efficient_sort(fitnesses:np.ndarray):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    n, m = fitnesses.shape
+    order = np.argsort(-fitnesses[:,0], kind='stable')
+
+    fronts = []
+    buffers = []
+    sizes = []
+    for i in order:
+        p = fitnesses[i]
+        lo, hi = 0, len(fronts)
+        while (lo < hi):
+            mid = (lo + hi) // 2
+            if np.any(np.all(buffers[mid][:sizes[mid]] > p, axis=1)):
+                lo = mid + 1
+            else:
+                hi = mid
+        if (lo == len(fronts)):
+            fronts.append([])
+            buffers.append(np.empty((16, m)))
+            sizes.append(0)
+        if (sizes[lo] == len(buffers[lo])):
+            buffers[lo] = np.concatenate([buffers[lo], np.empty_like(buffers[lo])])
+        buffers[lo][sizes[lo]] = p
+        sizes[lo] += 1
+        fronts[lo].append(i)
+
+    return [np.sort(np.array(front, dtype=int)) for front in fronts]
+
+
+"""
+    Picks a sorting engine by problem size:
+    the 2D sweep for bi-objective problems, the dominance matrix while
+    it fits comfortably in memory and ENS-BS beyond that.
+"""
+def auto_sort(fitnesses:np.ndarray):
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    return SORT_ENGINES[_auto_engine(*fitnesses.shape)](fitnesses)
+
+AUTO_DOMINANCE_MAX_SIZE = 1000
+
+def _auto_engine(n:int, m:int):
+    if (m == 2):
+        return 'sweep'
+    if (n <= AUTO_DOMINANCE_MAX_SIZE):
+        return 'numpy'
+    return 'ens'
+
+
+"""
+    Maintains pareto-fronts while new solutions are inserted,
+    in the style of ENLU (Efficient Non-dominated Level Update).
+    Starts from rows whose fronts are already known (e.g. the surviving
+    parents) and places each new row without re-sorting the others:
+    it goes to the first front that doesn't dominate it, and the members
+    it dominates are pushed one front down, cascading as needed.
+"""
+class IncrementalSort:
+
+    def __init__(self, fitnesses:np.ndarray, fronts:[np.ndarray]):
+        fitnesses = np.asarray(fitnesses, dtype=float)
+        self.size = len(fitnesses)
+        self.values = np.empty((max(16, 2*self.size), fitnesses.shape[1]))
+        self.values[:self.size] = fitnesses
+        self._fronts = [list(front) for front in fronts if len(front)]
+
+    def _dominated_by(self, front, p):
+        return np.any(np.all(self.values[front] > p, axis=1))
+
+    def _append(self, fitnesses):
+        n = len(fitnesses)
+        if (self.size + n > len(self.values)):
+            values = np.empty((2*(self.size + n), self.values.shape[1]))
+            values[:self.size] = self.values[:self.size]
+            self.values = values
+        self.values[self.size:self.size+n] = fitnesses
+        self.size += n
+        return range(self.size-n, self.size)
+
+    """
+        Inserts new rows, returning their indices.
+    """
+    def insert(self, fitnesses:np.ndarray):
+        indices = self._append(np.asarray(fitnesses, dtype=float))
+        for i in indices:
+            self._insert_one(i)
+        return np.array(indices, dtype=int)
+
+    def _insert_one(self, i):
+        p = self.values[i]
+        fronts = self._fronts
+
+        # Dominators of p in front k imply dominators in all fronts before k
+        lo, hi = 0, len(fronts)
+        while (lo < hi):
+            mid = (lo + hi) // 2
+            if self._dominated_by(fronts[mid], p):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        # Push down whatever the newcomers dominate
+        moving = [i]
+        k = lo
+        while (len(moving)):
+            if (k == len(fronts)):
+                fronts.append(moving)
+                break
+            front = fronts[k]
+            pushed = np.any(np.all(
+                self.values[moving][:,None,:] > self.values[front][None,:,:]
+            , axis=2), axis=0)
+            fronts[k] = [j for j, push in zip(front, pushed) if not push] + moving
+            moving = [j for j, push in zip(front, pushed) if push]
+            k += 1
+
+    """
+        Current fronts as arrays of row indices.
+    """
+    def fronts(self):
+        return [np.sort(np.array(front, dtype=int)) for front in self._fronts]
+
+
+"""
+    Groups row indices by rank, keeping the original order inside each front.
+"""
+def _ranks_to_fronts(ranks:np.ndarray):
+    if (len(ranks) == 0):
+        return []
+    order = np.argsort(ranks, kind='stable')
+    bounds = np.cumsum(np.bincount(ranks))[:-1]
+    return np.split(order, bounds)
+
+
+"""
+    Array-backed sorting engines, selectable by name.
+    Each one takes a (N, M) fitness matrix and returns a list of index arrays.
+"""
+SORT_ENGINES = {
+    'numpy': dominance_sort,
+    'sweep': sweep_sort_2d,
+    'ens': efficient_sort,
+    'auto': auto_sort
+}
+
+
+"""
+    Yields the pareto-fronts of a (N, M) fitness matrix, best first.
+    Engines that peel fronts one by one ('numpy') only do the work
+    for the fronts that are actually consumed.
+"""
+def iter_fronts(fitnesses:np.ndarray, engine:str = 'auto'):
+    if (engine not in SORT_ENGINES):
+        raise ValueError(f'Unknown sort engine: {engine} (expected one of {", ".join(SORT_ENGINES)})')
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    if (len(fitnesses) == 0):
+        return
+    if (engine == 'auto'):
+        engine = _auto_engine(*fitnesses.shape)
+    if (engine == 'numpy'):
+        yield from iter_dominance_fronts(fitnesses)
+    else:
+        yield from SORT_ENGINES[engine](fitnesses)
+
+
 """
     Sorts a dict of multi-variate features (lists of numbers) into pareto-fronts (lists of dicts).
     Each pareto-front contains solutions that are equally dominant.
+    `engine` selects the implementation: 'python' (pairwise `Result` comparisons)
+    or any of the array-backed `SORT_ENGINES`.
+    If `n_required` is given, sorting stops as soon as the returned fronts
+    hold at least that many solutions.
 """
-def non_dominated_sort(dict:{int|str:[float]}):
+def non_dominated_sort(dict:{int|str:[float]}, engine:str = 'python', n_required:int = None):
+    fronts = []
+    total = 0
+    for front in iter_non_dominated_fronts(dict, engine):
+        fronts.append(front)
+        total += len(front)
+        if (n_required is not None and total >= n_required):
+            break
+    return fronts
+
+
+"""
+    Lazy version of `non_dominated_sort`, yielding one front (dict) at a time.
+"""
+def iter_non_dominated_fronts(dict:{int|str:[float]}, engine:str = 'python'):
+    if (engine == 'python'):
+        yield from _iter_result_fronts(dict)
+        return
+    if (engine not in SORT_ENGINES):
+        raise ValueError(f'Unknown sort engine: {engine} (expected python or one of {", ".join(SORT_ENGINES)})')
+    if (len(dict) == 0):
+        return
+    ids = list(dict.keys())
+    values = list(dict.values())
+    for front in iter_fronts(np.array(values, dtype=float), engine):
+        yield { ids[i]: values[i] for i in front }
+
+
+def _iter_result_fronts(dict:{int|str:[float]}):
 
     # Build data structure
     results = { id: Result(val) for id, val in dict.items() }   
@@ -39,8 +320,9 @@ def non_dominated_sort(dict:{int|str:[float]}):
         if (a.superiors == 0):
             fronts[-1][id_a] = a
 
-    # Subsequent fronts
+    # Subsequent fronts, peeled as they are consumed
     while(len(fronts[-1])):
+        yield { id: result.values for id, result in fronts[-1].items() }
         fronts.append({})
         for id_a, a in fronts[-2].items():
             for id_b in a.inferiors:
@@ -48,6 +330,3 @@ def non_dominated_sort(dict:{int|str:[float]}):
                 b.superiors -= 1
                 if (b.superiors == 0):
                     fronts[-1][id_b] = b
-
-    # Rebuild values
-    return [{ id: result.values for id, result in front.items() } for front in fronts[:-1]]
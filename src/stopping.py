@@ -0,0 +1,94 @@
+import time
+from collections import deque
+
+
+"""
+    When to stop a call to `NSGA2.train` before its epochs, checked
+    after every epoch:
+        max_evaluations     number of fitness evaluations (cache hits are free),
+                            also stopping when an epoch evaluates nothing new,
+                            as the budget would never run out
+        max_time            wall-clock seconds
+        patience            epochs without the hypervolume improving by more
+                            than `min_delta` or, if it isn't computed (see
+                            `NSGA2Config.indicators` and `hv_max_objectives`),
+                            without the first front changing
+        callbacks           callables `(nsga2, generation)`, stopping when
+                            one of them returns True
+    Unset criteria are ignored.
+"""
+class StoppingCriteria:
+
+    def __init__(self,
+        max_evaluations: int = None,
+        max_time: float = None,
+        patience: int = None,
+        min_delta: float = 0.0,
+        callbacks: list = ()
+    ):
+        self.max_evaluations = max_evaluations
+        self.max_time = max_time
+        self.patience = patience
+        self.min_delta = min_delta
+        self.callbacks = list(callbacks)
+        self.reason = None
+        self.start_time = None
+        self.start_evaluations = 0
+        self.last_evaluations = None
+        # one history per signal, so a window never mixes both
+        self.hypervolumes = deque(maxlen=patience+1 if patience is not None else 1)
+        self.fronts = deque(maxlen=patience+1 if patience is not None else 1)
+
+    def is_bounded(self):
+        return any(c is not None for c in (self.max_evaluations, self.max_time, self.patience)) or len(self.callbacks) > 0
+
+    def start(self, evaluations: int):
+        self.start_time = time.monotonic()
+        self.start_evaluations = evaluations
+        self.last_evaluations = None
+
+    """
+        Evaluations left in the budget, or None if unbounded.
+    """
+    def remaining_evaluations(self, evaluations: int):
+        if (self.max_evaluations is None):
+            return None
+        return max(0, self.max_evaluations - (evaluations - self.start_evaluations))
+
+    """
+        Records a finished epoch. Returns whether training should stop,
+        with the reason kept in `reason`.
+    """
+    def update(self, nsga2, generation):
+        self.reason = self._reason(nsga2, generation)
+        return self.reason is not None
+
+    def _reason(self, nsga2, generation):
+        if (self.remaining_evaluations(nsga2.evaluations) == 0):
+            return f'reached {self.max_evaluations} evaluations'
+        if (self.max_evaluations is not None):
+            stalled = nsga2.evaluations == self.last_evaluations
+            self.last_evaluations = nsga2.evaluations
+            if (stalled):
+                return 'no new evaluations (every individual was cached)'
+        if (self.max_time is not None and time.monotonic() - self.start_time >= self.max_time):
+            return f'reached {self.max_time}s'
+        if (self.patience is not None and self._stagnated(generation)):
+            return f'stagnated for {self.patience} epochs'
+        for callback in self.callbacks:
+            if (callback(nsga2, generation)):
+                return f'stopped by {getattr(callback, "__name__", callback)}'
+        return None
+
+    def _stagnated(self, generation):
+        hypervolume = (generation.indicators or {}).get('hypervolume')
+        if (hypervolume is not None):
+            self.fronts.clear()
+            self.hypervolumes.append(hypervolume)
+            full = len(self.hypervolumes) == self.hypervolumes.maxlen
+            return full and self.hypervolumes[-1] - self.hypervolumes[0] <= self.min_delta
+        self.hypervolumes.clear()
+        first = generation.ranks == 0 if generation.ranks is not None else slice(None)
+        self.fronts.append(frozenset(generation.population.ids[first].tolist()))
+        full = len(self.fronts) == self.fronts.maxlen
+        return full and all(front == self.fronts[-1] for front in self.fronts)
@@ -83,4 +83,87 @@ class Genetics:
 
     @staticmethod
     def mutate_float_list(params: [(float)]):
-        return [Genetics.mutate_float(*param) for param in params]
\ No newline at end of file
+        return [Genetics.mutate_float(*param) for param in params]
+
+
+"""
+    Util class for varying whole populations of numeric genomes at once.
+    Genomes are (N, G) matrices, `lower` and `upper` are (G,) bounds and
+    `integer` is an optional (G,) mask of integer genes.
+    Each operator uses a handful of array operations, regardless of N and G.
+"""
+class BatchGenetics:
+
+    @staticmethod
+    def random(n: int, lower, upper, integer=None):
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        genomes = np.random.rand(n, len(lower)) * (upper-lower) + lower
+        if (integer is not None and np.any(integer)):
+            ints = np.floor(np.random.rand(n, len(lower)) * (upper-lower+1) + lower)
+            genomes = np.where(integer, np.minimum(ints, upper), genomes)
+        return genomes
+
+    """
+        Each gene comes from `a` with probability `prob_a`, from `b` otherwise.
+    """
+    @staticmethod
+    def uniform_crossover(a: np.ndarray, b: np.ndarray, prob_a=0.5):
+        return np.where(np.random.rand(*a.shape) < prob_a, a, b)
+
+    """
+        Simulated Binary Crossover, one child per pair of rows.
+        Each gene is crossed with probability `prob`, copied from `a` otherwise.
+    """
+    @staticmethod
+    def sbx_crossover(a: np.ndarray, b: np.ndarray, lower, upper, eta=15.0, prob=0.5, integer=None):
+        u = np.random.rand(3, *a.shape)
+        beta = np.where(
+            u[0] <= 0.5,
+            (2*u[0]) ** (1/(eta+1)),
+            (1/(2*(1-u[0]))) ** (1/(eta+1))
+        )
+        first = 0.5*((1+beta)*a + (1-beta)*b)
+        second = 0.5*((1-beta)*a + (1+beta)*b)
+        children = np.where(u[1] < 0.5, first, second)
+        children = np.where(u[2] < prob, children, a)
+        return BatchGenetics.repair(children, lower, upper, integer)
+
+    """
+        Polynomial mutation, applied to each gene with probability `prob`.
+    """
+    @staticmethod
+    def polynomial_mutation(genomes: np.ndarray, lower, upper, eta=20.0, prob=None, integer=None):
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        if (prob is None):
+            prob = 1 / genomes.shape[1]
+        span = np.where(upper > lower, upper-lower, 1.0)
+        delta_lower = (genomes-lower) / span
+        delta_upper = (upper-genomes) / span
+        u = np.random.rand(2, *genomes.shape)
+        power = 1 / (eta+1)
+        with np.errstate(invalid='ignore'):
+            left = (2*u[0] + (1-2*u[0]) * (1-delta_lower) ** (eta+1)) ** power - 1
+            right = 1 - (2*(1-u[0]) + 2*(u[0]-0.5) * (1-delta_upper) ** (eta+1)) ** power
+        delta = np.where(u[0] < 0.5, left, right)
+        mutated = np.where(u[1] < prob, genomes + delta*span, genomes)
+        return BatchGenetics.repair(mutated, lower, upper, integer)
+
+    """
+        Resets each gene to a random value with probability `prob`.
+    """
+    @staticmethod
+    def reset_mutation(genomes: np.ndarray, lower, upper, prob, integer=None):
+        mask = np.random.rand(*genomes.shape) < prob
+        if (not np.any(mask)):
+            return genomes.copy()
+        random = BatchGenetics.random(len(genomes), lower, upper, integer)
+        return np.where(mask, random, genomes)
+
+    """
+        Clips genes into their bounds and rounds the integer ones.
+    """
+    @staticmethod
+    def repair(genomes: np.ndarray, lower, upper, integer=None):
+        if (integer is not None and np.any(integer)):
+            genomes = np.where(integer, np.rint(genomes), genomes)
+        return np.clip(genomes, lower, upper)
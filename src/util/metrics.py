@@ -0,0 +1,324 @@
+import io
+import csv
+import json
+import time
+import pstats
+import logging
+import cProfile
+import tracemalloc
+import numpy as np
+from src.util.log import Log
+
+
+"""
+    Per-epoch instrumentation of `NSGA2.train` (see `NSGA2Config.metrics`).
+
+    Phase timers are exclusive: time spent in a phase nested in another
+    one (e.g. crowding during breeding) only counts for the inner one, so
+    the phases and `time_other` add up to the epoch's `time`.
+        evaluation          computing fitnesses (waiting for them, in steady-state)
+        sorting             non-dominated sorting
+        crowding            crowding distances and selection within fronts
+        breeding            tournament, crossover and mutation
+        indicators          hypervolume, spacing, spread, igd
+        checkpointing       handing generations to the checkpoint writer
+
+    Each epoch produces a flat record, sent to every sink:
+        epoch, time, time_<phase>..., time_other,
+        evaluations, fronts, front_size, duplicates (rows whose fitness
+        repeats another one's), cache_hits and cache_misses (with a fitness
+        cache), memory_peak (profiled epoch with `trace_memory`), and
+        anything counted with `count()`.
+
+    `profile_epoch` runs cProfile during that epoch and logs its top
+    functions, also dumping the stats to `profile_path` if given;
+    `trace_memory` traces allocations with tracemalloc as well.
+"""
+class Metrics:
+
+    PHASES = ('evaluation', 'sorting', 'crowding', 'breeding', 'indicators', 'checkpointing')
+
+    def __init__(self, sinks: list = None, profile_epoch: int = None, profile_path: str = None, trace_memory: bool = False):
+        self.sinks = list(sinks) if sinks is not None else [LogSink()]
+        self.profile_epoch = profile_epoch
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.profiler = None
+        self.epoch = None
+        self.timings = dict.fromkeys(Metrics.PHASES, 0.0)
+        self.counters = {}
+        self._phases = {}
+        self._stack = []
+        self._since = None
+        self._start = None
+        self._evaluations = 0
+        self._cache_stats = None
+
+    def __getstate__(self):
+        # profilers can't cross processes (e.g. islands)
+        state = self.__dict__.copy()
+        state['profiler'] = None
+        return state
+
+    def phase(self, name: str):
+        phase = self._phases.get(name)
+        if (phase is None):
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def _enter(self, name: str):
+        now = time.perf_counter()
+        if (self._stack):
+            outer = self._stack[-1]
+            self.timings[outer] = self.timings.get(outer, 0.0) + now - self._since
+        self._stack.append(name)
+        self._since = now
+
+    def _exit(self):
+        now = time.perf_counter()
+        name = self._stack.pop()
+        self.timings[name] = self.timings.get(name, 0.0) + now - self._since
+        self._since = now
+
+    """
+        Starts timing `epoch`, at the beginning of a call to `train`.
+    """
+    def start(self, nsga2, epoch: int):
+        self._evaluations = nsga2.evaluations
+        self._cache_stats = nsga2.cache.stats() if nsga2.cache is not None else None
+        self._begin(epoch)
+
+    def _begin(self, epoch: int):
+        self.epoch = epoch
+        self.timings = dict.fromkeys(Metrics.PHASES, 0.0)
+        self._start = time.perf_counter()
+        if (epoch == self.profile_epoch):
+            self._start_profile()
+
+    """
+        Closes the record of the epoch that produced `generation`, sends
+        it to the sinks and starts timing the next one. Returns the record.
+    """
+    def end_epoch(self, nsga2, generation):
+        elapsed = time.perf_counter() - self._start
+        record = { 'epoch': generation.epoch, 'time': elapsed }
+        for name, seconds in self.timings.items():
+            record[f'time_{name}'] = seconds
+        record['time_other'] = max(0.0, elapsed - sum(self.timings.values()))
+
+        record['evaluations'] = nsga2.evaluations - self._evaluations
+        self._evaluations = nsga2.evaluations
+        if (generation.ranks is not None and len(generation.ranks)):
+            record['fronts'] = int(generation.ranks.max()) + 1
+            record['front_size'] = int(np.count_nonzero(generation.ranks == 0))
+        fitnesses = generation.population.fitnesses
+        record['duplicates'] = len(fitnesses) - len(np.unique(fitnesses, axis=0)) if len(fitnesses) else 0
+        if (generation.cache_stats is not None):
+            previous = self._cache_stats or { 'hits': 0, 'misses': 0 }
+            record['cache_hits'] = generation.cache_stats['hits'] - previous['hits']
+            record['cache_misses'] = generation.cache_stats['misses'] - previous['misses']
+            self._cache_stats = generation.cache_stats
+        # counted since the last record, even between calls to train (e.g. migrations)
+        record.update(self.counters)
+        self.counters = {}
+
+        if (self.profiler is not None):
+            record.update(self._stop_profile())
+        for sink in self.sinks:
+            sink.write(record)
+        self._begin(generation.epoch + 1)
+        return record
+
+    """
+        Stops profiling if `train` returned in the middle of the profiled epoch.
+    """
+    def stop(self):
+        if (self.profiler is not None):
+            self._stop_profile()
+
+    def close(self):
+        self.stop()
+        for sink in self.sinks:
+            sink.close()
+
+    """
+        Latest record for monitor clients, if a `MonitorSink` is plugged.
+    """
+    def stream(self):
+        for sink in self.sinks:
+            if (isinstance(sink, MonitorSink)):
+                return sink.pop()
+        return None
+
+    def _start_profile(self):
+        if (self.trace_memory):
+            tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def _stop_profile(self):
+        self.profiler.disable()
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(20)
+        Log.logger.info(f'Profile of epoch {self.epoch}:\n{output.getvalue()}')
+        if (self.profile_path):
+            stats.dump_stats(self.profile_path)
+        self.profiler = None
+
+        if (not self.trace_memory or not tracemalloc.is_tracing()):
+            return {}
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lines = '\n'.join(f'\t{stat}' for stat in snapshot.statistics('lineno')[:10])
+        Log.logger.info(f'Top allocations of epoch {self.epoch} (peak {peak} bytes):\n{lines}')
+        return { 'memory_peak': peak }
+
+
+"""
+    Metrics that do nothing, used when instrumentation is disabled:
+    phases are a shared no-op context manager.
+"""
+class NullMetrics:
+
+    def phase(self, name: str):
+        return _NULL_PHASE
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def start(self, nsga2, epoch: int):
+        pass
+
+    def end_epoch(self, nsga2, generation):
+        return None
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+    def stream(self):
+        return None
+
+
+class _Phase:
+
+    __slots__ = ('metrics', 'name')
+
+    def __init__(self, metrics: Metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics._exit()
+        return False
+
+
+class _NullPhase:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+"""
+    Logs one line per epoch.
+"""
+class LogSink:
+
+    def __init__(self, level: str = 'INFO'):
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+
+    def write(self, record: dict):
+        phases = ', '.join(f'{key[5:]} {value:.3f}s' for key, value in record.items() if key.startswith('time_') and value > 0)
+        counters = ', '.join(f'{key}: {value}' for key, value in record.items() if key not in ('epoch', 'time') and not key.startswith('time_'))
+        Log.logger.log(self.level, f'Epoch {record["epoch"]} metrics: {record["time"]:.3f}s ({phases}); {counters}')
+
+    def close(self):
+        pass
+
+
+"""
+    Appends one JSON object per epoch to a file.
+"""
+class JSONLSink:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+
+    def write(self, record: dict):
+        if (self.file is None):
+            self.file = open(self.path, 'a')
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if (self.file is not None):
+            self.file.close()
+            self.file = None
+
+    def __getstate__(self):
+        return { 'path': self.path, 'file': None }
+
+
+"""
+    Appends one row per epoch to a CSV file. Columns are those of the
+    first record written; later keys that aren't columns are dropped.
+"""
+class CSVSink(JSONLSink):
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.writer = None
+
+    def write(self, record: dict):
+        if (self.file is None):
+            self.file = open(self.path, 'a', newline='')
+            self.writer = csv.DictWriter(self.file, fieldnames=list(record.keys()), extrasaction='ignore')
+            if (self.file.tell() == 0):
+                self.writer.writeheader()
+        self.writer.writerow(record)
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.writer = None
+
+    def __getstate__(self):
+        return { 'path': self.path, 'file': None, 'writer': None }
+
+
+"""
+    Sends records to monitor clients, under 'metrics' in the metadata
+    of the epoch's frame (in every subscription mode).
+"""
+class MonitorSink:
+
+    def __init__(self):
+        self.record = None
+
+    def write(self, record: dict):
+        self.record = record
+
+    def pop(self):
+        record, self.record = self.record, None
+        return record
+
+    def close(self):
+        pass
@@ -0,0 +1,141 @@
+import json
+import struct
+import numpy as np
+
+
+"""
+    Binary frame sent to monitor clients, safe to decode (no pickle):
+
+        header          magic, version, kind, flags, objectives, epoch,
+                        rows, removed rows, metadata length (little-endian)
+        metadata        JSON, e.g. indicators
+        fitnesses       (rows, objectives) float32
+        ids             (rows,) int64, if flagged
+        ranks           (rows,) int32, if flagged
+        removed         (removed rows,) int64 ids, delta frames only
+
+    Kinds, one per subscription mode of the monitor:
+        FULL            the whole population
+        SUMMARY         3 rows: max, mean and min of each objective, with
+                        the population and front sizes in the metadata
+        FRONT           the first front only
+        DELTA           rows added since the client's last frame, and
+                        the ids removed
+"""
+class Frame:
+
+    MAGIC = b'NSG2'
+    VERSION = 2
+    HEADER = struct.Struct('<4sBBBxHxxIIII')
+
+    # kinds
+    FULL = 0
+    SUMMARY = 1
+    FRONT = 2
+    DELTA = 3
+    MODES = { 'full': FULL, 'summary': SUMMARY, 'front': FRONT, 'delta': DELTA }
+
+    # flags
+    HAS_IDS = 1
+    HAS_RANKS = 2
+
+    def __init__(self, kind: int, epoch: int, fitnesses: np.ndarray, ids: np.ndarray = None, ranks: np.ndarray = None, meta: dict = None, removed: np.ndarray = None):
+        self.kind = kind
+        self.epoch = epoch
+        self.fitnesses = fitnesses
+        self.ids = ids
+        self.ranks = ranks
+        self.meta = meta if meta is not None else {}
+        self.removed = removed
+
+    def encode(self):
+        fitnesses = np.ascontiguousarray(self.fitnesses, dtype='<f4')
+        if (fitnesses.ndim != 2):
+            fitnesses = fitnesses.reshape(len(fitnesses), -1)
+        flags = 0
+        body = [fitnesses.tobytes()]
+        if (self.ids is not None):
+            flags |= Frame.HAS_IDS
+            body.append(np.ascontiguousarray(self.ids, dtype='<i8').tobytes())
+        if (self.ranks is not None):
+            flags |= Frame.HAS_RANKS
+            body.append(np.ascontiguousarray(self.ranks, dtype='<i4').tobytes())
+        removed = np.ascontiguousarray(self.removed if self.removed is not None else [], dtype='<i8')
+        body.append(removed.tobytes())
+        meta = json.dumps(self.meta).encode() if self.meta else b''
+        header = Frame.HEADER.pack(
+            Frame.MAGIC, Frame.VERSION, self.kind, flags,
+            fitnesses.shape[1], self.epoch if self.epoch is not None else 0, len(fitnesses), len(removed), len(meta)
+        )
+        return b''.join([header, meta, *body])
+
+    @staticmethod
+    def decode(data: bytes):
+        magic, version, kind, flags, dims, epoch, rows, n_removed, meta_size = Frame.HEADER.unpack_from(data)
+        if (magic != Frame.MAGIC or version != Frame.VERSION):
+            raise ValueError('Not a monitor frame')
+        offset = Frame.HEADER.size
+        meta = json.loads(data[offset:offset+meta_size]) if meta_size else {}
+        offset += meta_size
+        fitnesses = np.frombuffer(data, dtype='<f4', count=rows*dims, offset=offset).reshape(rows, dims)
+        offset += fitnesses.nbytes
+        ids = None
+        if (flags & Frame.HAS_IDS):
+            ids = np.frombuffer(data, dtype='<i8', count=rows, offset=offset)
+            offset += ids.nbytes
+        ranks = None
+        if (flags & Frame.HAS_RANKS):
+            ranks = np.frombuffer(data, dtype='<i4', count=rows, offset=offset)
+            offset += ranks.nbytes
+        removed = np.frombuffer(data, dtype='<i8', count=n_removed, offset=offset) if kind == Frame.DELTA else None
+        return Frame(kind, epoch, fitnesses, ids, ranks, meta, removed)
+
+    """
+        Per-objective max, mean and min of a full frame.
+    """
+    def summary(self):
+        fitnesses = np.asarray(self.fitnesses, dtype=float)
+        stats = np.stack([np.max(fitnesses, axis=0), np.mean(fitnesses, axis=0), np.min(fitnesses, axis=0)])
+        meta = dict(self.meta, size=len(fitnesses))
+        if (self.ranks is not None):
+            meta['front_sizes'] = np.bincount(self.ranks).tolist()
+        return Frame(Frame.SUMMARY, self.epoch, stats, meta=meta)
+
+    """
+        First front of a full frame.
+    """
+    def front(self):
+        first = self.ranks == 0 if self.ranks is not None else slice(None)
+        ids = self.ids[first] if self.ids is not None else None
+        return Frame(Frame.FRONT, self.epoch, self.fitnesses[first], ids, meta=self.meta)
+
+    """
+        Changes of a full frame since the given ids were sent.
+    """
+    def delta(self, last_ids: np.ndarray):
+        added = ~np.isin(self.ids, last_ids)
+        removed = np.setdiff1d(last_ids, self.ids)
+        return Frame(Frame.DELTA, self.epoch, self.fitnesses[added], self.ids[added], meta=self.meta, removed=removed)
+
+
+"""
+    Client-side population rebuilt from delta frames.
+"""
+class DeltaView:
+
+    def __init__(self):
+        self.fitnesses = {}
+
+    def update(self, frame: Frame):
+        for id in frame.removed.tolist():
+            self.fitnesses.pop(id, None)
+        self.fitnesses.update(zip(frame.ids.tolist(), frame.fitnesses))
+        return self
+
+    def ids(self):
+        return np.array(list(self.fitnesses.keys()), dtype=np.int64)
+
+    def matrix(self):
+        if (len(self.fitnesses) == 0):
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(list(self.fitnesses.values()))
@@ -1,74 +1,195 @@
 import sys
 sys.path.append('.')
 
-import random 
 import time
-import math
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-
-import asyncio
-import pickle
+import argparse
 import numpy as np
+import matplotlib
 
+from queue import Empty
 from src.util.monitor.server import MonitorClient
+from src.util.monitor.frame import Frame
+from src.util.plot import RingBuffer, decimate
 from src.util.log import Log
 from multiprocessing import Process, Queue
 
+
+"""
+    Live plot of a training run, fed by MonitorClients.
+    History (max and mean of an objective, hypervolume) comes from
+    summary frames and is kept in a ring buffer of `history` epochs.
+    Only the lines and the hypervolume text are redrawn (blitted) each
+    frame; axes are redrawn when the data outgrows them, with room to spare.
+    With `front`, a second panel shows the first front (2 or 3 objectives),
+    decimated to `max_points`.
+    With `png`, nothing is shown: the figure is rendered to that file
+    every `png_every` frames, for servers without a display.
+"""
+class LivePlot:
+
+    def __init__(self,
+        server_ip: str = '127.0.0.1',
+        objective: int = 0,
+        history: int = 1000,
+        front: bool = False,
+        max_points: int = 5000,
+        interval: float = 0,
+        png: str = None,
+        png_every: int = 10
+    ):
+        if (png):
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.objective = objective
+        self.max_points = max_points
+        self.png = png
+        self.png_every = png_every
+        self.received = 0
+        # epoch, max, mean, hypervolume
+        self.history = RingBuffer(history, 4)
+        self.limits = None
+
+        self.summaries = Queue()
+        Process(target=MonitorClient.process, args=(server_ip, self.summaries, 'summary', interval), daemon=True).start()
+        self.fronts = None
+        if (front):
+            self.fronts = Queue()
+            Process(target=MonitorClient.process, args=(server_ip, self.fronts, 'front', interval), daemon=True).start()
+
+        animated = png is None
+        self.fig = plt.figure(figsize=(12 if front else 6, 5))
+        self.ax = self.fig.add_subplot(1, 2 if front else 1, 1)
+        self.ax.set_xlabel('Epochs')
+        self.ax.set_ylabel(f'Fitness {objective}')
+        self.ax.set_title('Live Graph')
+        self.max_line, = self.ax.plot([], [], label='max', animated=animated)
+        self.mean_line, = self.ax.plot([], [], label='mean', animated=animated)
+        self.ax.legend(loc='upper left')
+        self.hv_ax = self.ax.twinx()
+        self.hv_ax.set_ylabel('Hypervolume')
+        self.hv_line, = self.hv_ax.plot([], [], color='gray', linestyle='--', animated=animated)
+        self.hv_text = self.hv_ax.text(0.99, 0.98, '', transform=self.hv_ax.transAxes, ha='right', va='top', animated=animated)
+        self.front_ax = None
+        self.front_points = None
+
+    """
+        Reads the frames received so far. Returns whether the axes
+        need a full redraw.
+    """
+    def poll(self):
+        redraw = False
+        while True:
+            try:
+                frame = Frame.decode(self.summaries.get_nowait())
+            except Empty:
+                break
+            self.received += 1
+            indicators = frame.meta.get('indicators') or {}
+            max_fits, mean_fits, _ = frame.fitnesses
+            self.history.append([frame.epoch, max_fits[self.objective], mean_fits[self.objective], indicators.get('hypervolume', np.nan)])
+            if ('hypervolume' in indicators):
+                self.hv_text.set_text(f'hypervolume: {indicators["hypervolume"]:.6g}')
+        if (self.fronts is not None):
+            frame = None
+            while True:
+                try:
+                    frame = Frame.decode(self.fronts.get_nowait())
+                except Empty:
+                    break
+            if (frame is not None):
+                self._plot_front(frame.fitnesses)
+                redraw = True
+        return self._update_limits() or redraw
+
+    def _plot_front(self, fitnesses: np.ndarray):
+        fitnesses = fitnesses[decimate(fitnesses, self.max_points)]
+        dims = fitnesses.shape[1]
+        if (self.front_ax is None):
+            self.front_ax = self.fig.add_subplot(1, 2, 2, projection='3d' if dims == 3 else None)
+            self.front_ax.set_title('First front')
+        if (self.front_points is not None):
+            self.front_points.remove()
+        if (dims == 3):
+            self.front_points = self.front_ax.scatter(fitnesses[:,0], fitnesses[:,1], fitnesses[:,2], s=5)
+        else:
+            self.front_points = self.front_ax.scatter(fitnesses[:,0], fitnesses[:,1 % dims], s=5)
+            self.front_ax.update_datalim(fitnesses[:,[0, 1 % dims]])
+            self.front_ax.autoscale_view()
+
+    """
+        Grows the axes when the history outgrows them.
+        Bounds come from the ring buffer, the history is never rescanned.
+    """
+    def _update_limits(self):
+        if (len(self.history) == 0):
+            return False
+        lower, upper = self.history.lower, self.history.upper
+        y = (min(lower[1], lower[2]), max(upper[1], upper[2]))
+        if (not np.all(np.isfinite(y))):
+            # no finite fitness yet (e.g. only failed evaluations)
+            return False
+        hv = (lower[3], upper[3]) if np.isfinite(upper[3]) else (0, 1)
+        if (self.limits is not None and LivePlot._inside((upper[0], upper[0]), self.limits[0]) and LivePlot._inside(y, self.limits[1]) and LivePlot._inside(hv, self.limits[2])):
+            return False
+        epochs = (lower[0], lower[0] + 2 * max(upper[0] - lower[0], 10))
+        self.limits = (epochs, LivePlot._grow(y), LivePlot._grow(hv))
+        self.ax.set_xlim(*self.limits[0])
+        self.ax.set_ylim(*self.limits[1])
+        self.hv_ax.set_ylim(*self.limits[2])
+        return True
+
+    @staticmethod
+    def _inside(values, limits):
+        return limits[0] <= values[0] and values[1] <= limits[1]
+
+    @staticmethod
+    def _grow(limits):
+        span = max(limits[1] - limits[0], 1e-9)
+        return (limits[0] - span/2, limits[1] + span/2)
+
+    def _set_lines(self):
+        history = self.history.view()
+        self.max_line.set_data(history[:,0], history[:,1])
+        self.mean_line.set_data(history[:,0], history[:,2])
+        self.hv_line.set_data(history[:,0], history[:,3])
+        return self.max_line, self.mean_line, self.hv_line, self.hv_text
+
+    def animate(self, _):
+        if (self.poll()):
+            self.fig.canvas.draw_idle()
+        return self._set_lines()
+
+    def run(self, refresh: float = 0.1):
+        if (self.png):
+            return self._run_headless(refresh)
+        from matplotlib import animation
+        self.animation = animation.FuncAnimation(self.fig, self.animate, interval=refresh*1000, blit=True, cache_frame_data=False)
+        self.plt.show()
+
+    def _run_headless(self, refresh: float):
+        saved = 0
+        while True:
+            self.poll()
+            if (self.received - saved >= self.png_every or (self.received and not saved)):
+                self._set_lines()
+                self.fig.savefig(self.png)
+                saved = self.received
+            time.sleep(refresh)
+
+
 if __name__ == '__main__':
 
-    Log.setup(level='INFO')
+    parser = argparse.ArgumentParser(description='Live plot of a training run')
+    parser.add_argument('--server', default='127.0.0.1')
+    parser.add_argument('--objective', type=int, default=0, help='objective of the history lines')
+    parser.add_argument('--history', type=int, default=1000, help='epochs kept in the history')
+    parser.add_argument('--front', action='store_true', help='also plot the first front')
+    parser.add_argument('--max-points', type=int, default=5000)
+    parser.add_argument('--interval', type=float, default=0, help='minimum seconds between frames')
+    parser.add_argument('--png', default=None, help='render to this file instead of a window')
+    parser.add_argument('--png-every', type=int, default=10, help='frames between renders')
+    args = parser.parse_args()
 
-    server_ip = '127.0.0.1'
-    queue = Queue()
-    Process(target=MonitorClient.process, args=(server_ip, queue)).start()
-
-    fig = plt.figure()
-    ax1 = fig.add_subplot(1,1,1)
-
-    lines = []
-    data = []
-    for _ in range(2):
-        data.append(([],[])) 
-        line, = ax1.plot([],[])
-        lines.append(line)
-
-    plt.xlabel('Epochs')
-    plt.ylabel('Fitness')
-    plt.title('Live Graph')
-
-    def animate(frame):
-        try:
-            pfitnesses = queue.get_nowait()
-        except:
-            return line
-        fitnesses = pickle.loads(pfitnesses) 
-        dims = len(list(fitnesses.values())[0])
-        fits = [[f[d] for f in fitnesses.values()] for d in range(dims)]
-        max_fits = [np.max(fit_d) for fit_d in fits]
-        avg_fits = [np.average(fit_d) for fit_d in fits]
-
-        p = [avg_fits[0], max_fits[0]]
-        if (math.isinf(p[0]) or math.isinf(p[1])):
-            return lines
-
-        for i in range(2):
-            data[i][0].append(frame) 
-            data[i][1].append(p[i]) 
-            lines[i].set_xdata(data[i][0])
-            lines[i].set_ydata(data[i][1])
-
-        min_x = min([min(d[0]) for d in data])
-        max_x = max([max(d[0]) for d in data])
-        min_y = min([min(d[1]) for d in data])
-        max_y = max([max(d[1]) for d in data])
-
-        # print(xs)
-        # print(ys)
-        ax1.set_xlim(min_x-1, max_x+1)
-        ax1.set_ylim(min_y-0.05, max_y+0.05)
-        ax1.set_xticks(list(range(min_x, max_x+1)))
-        return lines
-
-    ani = animation.FuncAnimation(fig, animate, interval=100) 
-    plt.show()
+    Log.setup(level='INFO')
+    LivePlot(args.server, args.objective, args.history, args.front, args.max_points, args.interval, args.png, args.png_every).run()
@@ -1,74 +1,166 @@
+import json
+import time
 import asyncio
+import threading
+import numpy as np
 import websockets
 from websockets import client as wsclient
-from multiprocessing import Queue
-from queue import Empty
 from src.util.log import Log
+from src.util.monitor.frame import Frame
 
 PORT = 5642 # nSGA2
 
+"""
+    Streams the frames put in `queue` by the training process to every
+    connected client.
+    A single thread blocks on the queue and hands frames to the event
+    loop, which fans them out to a bounded asyncio queue per client.
+    Slow clients lose their oldest frames instead of holding the others.
+
+    Clients choose what they receive by sending a JSON subscription,
+    at any time: {"mode": "summary" | "front" | "delta" | "full",
+    "interval": seconds}. Until then they get full frames.
+    With an interval, a client gets at most one frame per interval,
+    the latest one.
+"""
 class MonitorServer:
 
+    CLIENT_QUEUE_SIZE = 8
+
     def __init__(self, queue):
         Log.logger.info("[MonitorServer] Starting...")
         self.queue = queue
-        self.client_queues = []
-        self.bus_task = None
+        self.client_queues = set()
+        self.loop = None
 
     async def handler(self, ws):
         Log.logger.info('[MonitorServer] New client connected')
-        queue = Queue()
-        self.client_queues.append(queue)
-        while True:
+        queue = asyncio.Queue(maxsize=MonitorServer.CLIENT_QUEUE_SIZE)
+        subscription = Subscription()
+        self.client_queues.add(queue)
+        listener = asyncio.create_task(self.listen(ws, subscription))
+        try:
+            while True:
+                frame = await queue.get()
+                wait = subscription.wait()
+                if (wait > 0):
+                    await asyncio.sleep(wait)
+                    # send the latest frame only
+                    while (not queue.empty()):
+                        frame = queue.get_nowait()
+                await ws.send(subscription.encode(frame))
+        except Exception as e:
+            Log.logger.error('[MonitorServer] Client disconnected')
+            Log.logger.error('\t' + str(e))
+        finally:
+            listener.cancel()
+            self.client_queues.discard(queue)
+
+    async def listen(self, ws, subscription):
+        async for message in ws:
             try:
-                data = queue.get_nowait()
-                await ws.send(data)
-            except Empty:
-                await asyncio.sleep(0.1)
-            except Exception as e:
-                Log.logger.error('[MonitorServer] Client disconnected')
-                Log.logger.error('\t' + str(e))
-                break
-        self.client_queues.remove(queue)
+                subscription.update(json.loads(message))
+            except (ValueError, TypeError) as e:
+                Log.logger.error(f'[MonitorServer] Invalid subscription: {e}')
+
+    """
+        Called in the event loop with each new frame.
+    """
+    def publish(self, data):
+        frame = Frame.decode(data)
+        frame.encoded = { 'full': data }
+        for queue in self.client_queues:
+            if (queue.full()):
+                queue.get_nowait()
+            queue.put_nowait(frame)
 
-    async def bus(self):
+    def read(self):
         while True:
-            try:
-                data = self.queue.get_nowait()
-                for client_queue in self.client_queues:
-                    client_queue.put(data)
-            except Empty:
-                await asyncio.sleep(0.1)
+            data = self.queue.get()
+            if (data is None):
+                break
+            self.loop.call_soon_threadsafe(self.publish, data)
 
     async def run(self):
+        self.loop = asyncio.get_running_loop()
+        threading.Thread(target=self.read, daemon=True).start()
         Log.logger.info("[MonitorServer] Online")
         while True:
             try:
-                bus_task = asyncio.create_task(self.bus())
                 async with websockets.serve(self.handler, "", PORT):
-                    await bus_task
+                    await asyncio.Future()
             except Exception as e:
                 Log.logger.error('[MonitorServer] Tick server is down, reopening...')
                 Log.logger.error('\t' + str(e))
+                await asyncio.sleep(1)
 
     @classmethod
     def process(self, queue):
         server = MonitorServer(queue)
         asyncio.run(server.run())
 
+"""
+    What a monitor client asked for, and what it was last sent.
+"""
+class Subscription:
+
+    def __init__(self, mode: str = 'full', interval: float = 0):
+        self.mode = mode
+        self.interval = interval
+        self.last_time = None
+        self.last_ids = np.empty(0, dtype=np.int64)
+
+    def update(self, message: dict):
+        mode = message.get('mode', self.mode)
+        if (mode not in Frame.MODES):
+            raise ValueError(f'Unknown mode: {mode}')
+        if (mode == 'delta' and self.mode != 'delta'):
+            self.last_ids = np.empty(0, dtype=np.int64)
+        self.mode = mode
+        self.interval = float(message.get('interval', self.interval))
+
+    """
+        Seconds to wait before the next frame can be sent.
+    """
+    def wait(self):
+        if (self.last_time is None or not self.interval):
+            return 0
+        return self.last_time + self.interval - time.monotonic()
+
+    """
+        Bytes of a full frame for this client. Frames shared by every
+        client in the same mode are only encoded once.
+    """
+    def encode(self, frame: Frame):
+        self.last_time = time.monotonic()
+        if (self.mode == 'delta'):
+            data = frame.delta(self.last_ids).encode()
+            self.last_ids = np.array(frame.ids)
+            return data
+        if (self.mode not in frame.encoded):
+            frame.encoded[self.mode] = getattr(frame, self.mode)().encode()
+        return frame.encoded[self.mode]
+
+
+"""
+    Puts the frames received from a MonitorServer in `queue`,
+    subscribed with the given `mode` and `interval` (see MonitorServer).
+"""
 class MonitorClient:
 
-    def __init__(self, server_ip, queue):
+    def __init__(self, server_ip, queue, mode: str = 'full', interval: float = 0):
         Log.logger.info('[MonitorClient] Starting...')
         self.server_ip = server_ip
         self.queue = queue
-        pass
+        self.mode = mode
+        self.interval = interval
 
     async def connect(self):
         Log.logger.info('[MonitorClient] Connecting...')
         self.connection = await wsclient.connect(f"ws://{self.server_ip}:{PORT}")
         if self.connection.open:
             Log.logger.info('[MonitorClient] Connected')
+        await self.connection.send(json.dumps({ 'mode': self.mode, 'interval': self.interval }))
 
     async def receiveMessage(self, connection):
         while True:
@@ -83,8 +175,9 @@ class MonitorClient:
             except Exception as e:
                 Log.logger.error('[MonitorClient] Connection with server closed, reopening...')
                 Log.logger.error('\t' + str(e))
+                await asyncio.sleep(1)
 
     @classmethod
-    def process(self, server_ip, queue):
-        client = MonitorClient(server_ip, queue)
+    def process(self, server_ip, queue, mode: str = 'full', interval: float = 0):
+        client = MonitorClient(server_ip, queue, mode, interval)
         asyncio.run(client.run())
\ No newline at end of file
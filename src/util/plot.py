@@ -1,29 +1,131 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from src.nsga2 import NSGA2
 
+
 """
-    Utility class for plotting fitnesses. 
+    Fixed-size history of rows (e.g. one per epoch). Old rows are
+    overwritten once full. The (finite) bounds of the rows in the buffer
+    are kept up to date; they are only recomputed from the buffer when
+    an overwritten row held one of them.
 """
-class Plot:
+class RingBuffer:
+
+    def __init__(self, capacity: int, columns: int):
+        self.data = np.empty((capacity, columns))
+        self.size = 0
+        self.start = 0
+        self.lower = np.full(columns, np.inf)
+        self.upper = np.full(columns, -np.inf)
+
+    def __len__(self):
+        return self.size
+
+    def append(self, row):
+        row = np.asarray(row, dtype=float)
+        capacity = len(self.data)
+        i = (self.start + self.size) % capacity
+        evicted = self.data[i].copy() if self.size == capacity else None
+        self.data[i] = row
+        if (self.size < capacity):
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % capacity
+            if (np.any((evicted == self.lower) | (evicted == self.upper))):
+                self._rescan()
+                return
+        finite = np.isfinite(row)
+        self.lower[finite] = np.minimum(self.lower[finite], row[finite])
+        self.upper[finite] = np.maximum(self.upper[finite], row[finite])
+
+    def _rescan(self):
+        data = self.data[:self.size]
+        finite = np.isfinite(data)
+        self.lower = np.where(finite, data, np.inf).min(axis=0)
+        self.upper = np.where(finite, data, -np.inf).max(axis=0)
+
+    """
+        Rows, oldest first.
+    """
+    def view(self):
+        return np.roll(self.data[:self.size], -self.start, axis=0) if self.start else self.data[:self.size]
+
+
+"""
+    Keeps at most `max_points` rows of a point cloud for plotting:
+    the last point of each occupied cell of a `bins`-per-axis grid, which
+    keeps the shape and outliers of dense clouds, then an even stride if needed.
+    Returns the kept row indices.
+"""
+def decimate(points: np.ndarray, max_points: int, bins: int = 200):
+    n = len(points)
+    if (n <= max_points):
+        return np.arange(n)
+    points = np.asarray(points, dtype=float)
+    lower = np.nanmin(points, axis=0)
+    extent = np.nanmax(points, axis=0) - lower
+    cells = np.floor((points - lower) / np.where(extent > 0, extent, 1) * (bins - 1))
+    cells = np.nan_to_num(cells, nan=-1, posinf=-1, neginf=-1).astype(np.int64)
+    key = np.ravel_multi_index(tuple((cells + 1).T), (bins + 1,) * points.shape[1], mode='clip')
+    _, last = np.unique(key[::-1], return_index=True)
+    rows = np.sort(n - 1 - last)
+    if (len(rows) > max_points):
+        rows = rows[np.linspace(0, len(rows) - 1, max_points).astype(int)]
+    return rows
 
-    @staticmethod
-    def _gen_results2d(gen):
-        x = [r[0] for r in gen.fitnesses.values()]
-        y = [r[1] for r in gen.fitnesses.values()]
-        plt.scatter(x, y, s=5)
+
+"""
+    Utility class for plotting fitnesses.
+"""
+class Plot:
 
     """
-        Plot all generations fitnesses.
+        Plot all generations fitnesses, coloured by epoch, in a single
+        scatter (2 or 3 objectives). `front_only` plots first fronts only,
+        `max_points` caps the points drawn (see `decimate`).
+        With `path`, the plot is rendered straight to an image file
+        (e.g. a PNG) instead of shown, so no display is needed.
     """
     @staticmethod
-    def fitnesses(nsga2: NSGA2):
+    def fitnesses(nsga2: NSGA2, front_only: bool = False, max_points: int = 50000, path: str = None):
         dims = nsga2.get_fitness_dims()
-        if (dims == 0):
+        if (not dims):
             raise Exception('No generation found. Did you train it?')
         if (dims > 3):
             raise Exception('Hyperdimensional plots currently not supported. Fitnesses must have up to 3 variables to be plotted.')
-        if (dims == 2):
-            for gen in nsga2.generations:
-                Plot._gen_results2d(gen)
-        plt.show()
\ No newline at end of file
+
+        fitnesses, epochs = [], []
+        for i, gen in enumerate(nsga2.generations):
+            f = gen.get_front() if front_only else gen.get_fitnesses()
+            fitnesses.append(np.asarray(f, dtype=float).reshape(-1, dims))
+            epochs.append(np.full(len(f), gen.epoch if gen.epoch is not None else i))
+        fitnesses = np.concatenate(fitnesses)
+        epochs = np.concatenate(epochs)
+        rows = decimate(fitnesses, max_points)
+
+        fig = Figure() if path else plt.figure()
+        if (path):
+            FigureCanvasAgg(fig)
+        Plot._scatter(fig, fitnesses[rows], epochs[rows])
+        if (path):
+            fig.savefig(path)
+        else:
+            plt.show()
+        return fig
+
+    @staticmethod
+    def _scatter(fig, fitnesses: np.ndarray, colors: np.ndarray):
+        dims = fitnesses.shape[1]
+        if (dims == 3):
+            ax = fig.add_subplot(1, 1, 1, projection='3d')
+            points = ax.scatter(fitnesses[:,0], fitnesses[:,1], fitnesses[:,2], c=colors, s=5)
+        elif (dims == 2):
+            ax = fig.add_subplot(1, 1, 1)
+            points = ax.scatter(fitnesses[:,0], fitnesses[:,1], c=colors, s=5)
+        else:
+            ax = fig.add_subplot(1, 1, 1)
+            points = ax.scatter(colors, fitnesses[:,0], c=colors, s=5)
+        fig.colorbar(points, ax=ax, label='Epoch')
+        return ax
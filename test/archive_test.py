@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+from src.archive import ParetoArchive
+
+
+def non_dominated(fitnesses):
+    rows = []
+    for i, fitness in enumerate(fitnesses):
+        if (np.any(np.all(fitnesses > fitness, axis=1))):
+            continue
+        if (any(np.array_equal(fitnesses[j], fitness) for j in rows)):
+            continue
+        rows.append(i)
+    return rows
+
+
+@pytest.mark.parametrize('given_dims', [2, 3])
+def test_keeps_non_dominated(given_dims):
+    # given
+    np.random.seed(0)
+    fitnesses = np.random.randint(0, 8, (100, given_dims)).astype(float)
+    archive = ParetoArchive()
+
+    # when
+    archive.update(range(100), fitnesses)
+
+    # then
+    assert sorted(archive.items) == non_dominated(fitnesses)
+    assert np.array_equal(archive.fitnesses, fitnesses[archive.items])
+
+
+def test_rejects_dominated_and_duplicates():
+    # given
+    archive = ParetoArchive()
+    archive.add('a', (1, 1))
+
+    # when
+    added = [archive.add('b', (0, 0)), archive.add('c', (1, 1)), archive.add('d', (1, 0)), archive.add('e', (2, 2))]
+
+    # then
+    assert added == [False, False, True, True]
+    assert archive.items == ['e']
+
+
+@pytest.mark.parametrize('given_prune', ['crowding', 'hypervolume'])
+def test_pruning_keeps_extremes(given_prune):
+    # given
+    x = np.linspace(0, 1, 50)
+    archive = ParetoArchive(maxsize=5, prune=given_prune)
+
+    # when
+    archive.update(range(50), np.stack([x, 1-x], axis=1))
+
+    # then
+    assert len(archive) == 5
+    assert archive.items[0] == 0 and archive.items[-1] == 49
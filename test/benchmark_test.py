@@ -0,0 +1,118 @@
+import pytest
+import numpy as np
+from benchmark.problems import PROBLEMS, ZDT1, DTLZ1, DTLZ2, WFG3, WFG4
+from benchmark.run import Case, sweep
+from benchmark.compare import compare
+from benchmark import individuals
+
+
+@pytest.mark.parametrize('name', list(PROBLEMS.keys()))
+def test_problem_shapes(name):
+    # given
+    problem = PROBLEMS[name]
+    genomes = problem.random_genomes(20)
+
+    # when
+    objectives = problem.objectives(genomes)
+
+    # then
+    assert objectives.shape == (20, problem.n_objectives)
+    assert np.all(np.isfinite(objectives))
+
+
+def test_optimal_solutions():
+    # given
+    x = np.random.rand(10, 30)
+    x[:,1:] = 0
+    dtlz = DTLZ2.variant(n_objectives=5)
+    y = np.random.rand(10, dtlz.n_genes)
+    y[:,4:] = 0.5
+    z = np.random.rand(10, DTLZ1.n_genes)
+    z[:,2:] = 0.5
+
+    # then
+    assert np.allclose(ZDT1.objectives(x)[:,1], 1 - np.sqrt(x[:,0]))
+    assert np.allclose(np.linalg.norm(dtlz.objectives(y), axis=1), 1)
+    assert np.allclose(np.sum(DTLZ1.objectives(z), axis=1), 0.5)
+
+
+@pytest.mark.parametrize('problem,shape', [(WFG3, 'linear'), (WFG4, 'concave')])
+def test_wfg_optimal_solutions(problem, shape):
+    # given
+    k, n = problem.position_count(), problem.n_genes
+    upper = 2.0 * np.arange(1, n + 1)
+    x = np.random.rand(10, n) * upper
+    x[:,k:] = 0.35 * upper[k:]
+
+    # when
+    f = problem.objectives(x) / (2.0 * np.arange(1, problem.n_objectives + 1))
+
+    # then
+    if (shape == 'linear'):
+        assert np.allclose(np.sum(f, axis=1), 1)
+    else:
+        assert np.allclose(np.sum(f**2, axis=1), 1)
+
+
+def test_variant():
+    # when
+    dtlz = DTLZ2.variant(n_objectives=4)
+    zdt = ZDT1.variant(n_genes=10)
+
+    # then
+    assert (dtlz.n_objectives, dtlz.n_genes) == (4, 13)
+    assert (zdt.n_objectives, zdt.n_genes) == (2, 10)
+    assert (DTLZ2.n_objectives, ZDT1.n_genes) == (3, 30)
+
+
+def test_sweep():
+    # when
+    cases = sweep(['ZDT1', 'DTLZ2'], [10, 20], objectives=[2, 3])
+
+    # then
+    assert [case.key() for case in cases] == [
+        'ZDT1/pop=10/m=2/g=30', 'ZDT1/pop=20/m=2/g=30',
+        'DTLZ2/pop=10/m=2/g=11', 'DTLZ2/pop=10/m=3/g=12',
+        'DTLZ2/pop=20/m=2/g=11', 'DTLZ2/pop=20/m=3/g=12'
+    ]
+
+
+def test_case_run():
+    # when
+    result = Case('ZDT1', 10, epochs=2).run(repeats=2)
+
+    # then
+    assert result['key'] == 'ZDT1/pop=10/m=2/g=30'
+    assert set(result['timings']) == {
+        '_get_fitness', '_select_best_ids', '_evolve', '_save_gen', 'train',
+        'non_dominated_sort', 'select_n_best', 'iter_fronts+select_n_best_array'
+    }
+    assert all(timing['min'] <= timing['median'] for timing in result['timings'].values())
+    assert result['hypervolume'] > 0
+
+
+def test_compare():
+    # given
+    def report(seconds):
+        return { 'environment': {}, 'results': [
+            { 'key': 'a', 'timings': { 'train': { 'median': seconds[0] }, 'sort': { 'median': seconds[1] } } },
+            { 'key': 'b', 'timings': { 'train': { 'median': 1.0 } } }
+        ]}
+
+    # when
+    rows, regressions = compare(report([1.0, 1.0]), report([1.05, 1.5]), threshold=0.1)
+
+    # then
+    assert len(rows) == 3
+    assert regressions == [('a', 'sort', 1.0, 1.5, 1.5)]
+
+
+def test_individuals_run():
+    # when
+    report = individuals.run(n=100, repeats=2)
+
+    # then
+    result = report['results'][0]
+    assert result['key'] == 'individuals/n=100'
+    assert set(result['timings']) == { 'create', 'clone', 'crossover' }
+    assert result['bytes_per_individual'] > 0
@@ -0,0 +1,71 @@
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.population import Population
+from src.evaluate import SerialEvaluator
+from src.cache import FitnessCache
+
+
+class Counted(ArrayIndividual):
+    n_genes = 2
+    evaluated = []
+
+    def genome_key(self):
+        return self.genome.tobytes()
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        Counted.evaluated.append(genomes.tolist())
+        return genomes * [1, -1]
+
+
+def test_lru_eviction():
+    # given
+    cache = FitnessCache(maxsize=2)
+    cache.put('a', (1,))
+    cache.put('b', (2,))
+
+    # when
+    cache.get('a')
+    cache.put('c', (3,))
+
+    # then
+    assert cache.get('a') == (1,)
+    assert cache.get('b') is None
+    assert cache.get('c') == (3,)
+    assert len(cache) == 2
+
+
+def test_stats():
+    # given
+    cache = FitnessCache(maxsize=10)
+    cache.put('a', (1,))
+
+    # when
+    cache.get('a')
+    cache.get('a')
+    cache.get('b')
+
+    # then
+    assert cache.stats() == { 'hits': 2, 'misses': 1, 'size': 1 }
+
+
+def test_cached_fitness_with_repeated_genomes():
+    # given
+    nsga2 = NSGA2(Counted, NSGA2Config(pop_size=5, run_monitor_server=False, evaluator=SerialEvaluator(False), fitness_cache_size=10))
+    genomes = np.array([[1., 2.], [3., 4.], [1., 2.], [5., 6.], [3., 4.], [1., 2.]])
+    Counted.evaluated.clear()
+    nsga2.evaluations = 0
+    nsga2.cache.hits = nsga2.cache.misses = 0
+
+    # when
+    first = nsga2._get_fitness(Population(Counted.from_genomes(genomes)))
+    second = nsga2._get_fitness(Population(Counted.from_genomes(genomes[::-1])))
+
+    # then
+    assert first.tolist() == (genomes * [1, -1]).tolist()
+    assert second.tolist() == (genomes[::-1] * [1, -1]).tolist()
+    assert Counted.evaluated == [[[1, 2], [3, 4], [5, 6]]]
+    assert nsga2.evaluations == 3
+    assert nsga2.cache.stats() == { 'hits': 3 + 6, 'misses': 3, 'size': 3 }
@@ -0,0 +1,271 @@
+import os
+import pickle
+import pytest
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config, Individual, Generation, GenerationSummary
+from src.genome import ArrayIndividual
+from src.population import Population
+from src.checkpoint import Checkpoint, CheckpointWriter
+from src.evaluate import SerialEvaluator
+
+
+class Point(ArrayIndividual):
+    n_genes = 3
+
+    def fitness(self):
+        return tuple(self.genome[:2])
+
+
+def make_generation(with_genomes):
+    genomes = Point.random_genomes(10)
+    individuals = Point.from_genomes(genomes)
+    fitnesses = genomes[:,:2].copy()
+    population = Population(individuals, fitnesses, genomes if with_genomes else None)
+    return Generation(population, np.arange(10) // 3, { 'hits': 1, 'misses': 2, 'size': 2 }, 7)
+
+
+@pytest.mark.parametrize('given_with_genomes', [True, False])
+def test_generation_roundtrip(tmp_path, given_with_genomes):
+    # given
+    checkpoint = Checkpoint(str(tmp_path))
+    generation = make_generation(given_with_genomes)
+
+    # when
+    path = checkpoint.write(generation)
+    population, ranks, meta = Checkpoint.read_generation(path, Point)
+
+    # then
+    assert checkpoint.generation_paths() == [path]
+    assert population.ids.tolist() == generation.population.ids.tolist()
+    assert np.array_equal(population.fitnesses, generation.population.fitnesses)
+    assert np.array_equal(ranks, generation.ranks)
+    assert [ind.genome.tolist() for ind in population] == [ind.genome.tolist() for ind in generation.population]
+    assert meta == { 'id': generation.id, 'epoch': 7, 'cache_stats': generation.cache_stats }
+
+
+def test_context_roundtrip(tmp_path):
+    # given
+    checkpoint = Checkpoint(str(tmp_path))
+
+    # when
+    checkpoint.write_context(Point, { 'dataset': [1, 2, 3] })
+
+    # then
+    assert Checkpoint(str(tmp_path)).has_context
+    assert checkpoint.read_context() == { 'individual_class': Point, 'kwargs': { 'dataset': [1, 2, 3] } }
+
+
+@pytest.mark.parametrize('given_background', [True, False])
+def test_writer_frequency_and_flush(tmp_path, given_background):
+    # given
+    checkpoint = Checkpoint(str(tmp_path))
+    writer = CheckpointWriter(checkpoint, every=3, queue_size=1, background=given_background)
+    generations = [make_generation(True) for _ in range(8)]
+    for epoch, generation in enumerate(generations):
+        generation.epoch = epoch
+
+    # when
+    for generation in generations:
+        writer.put(generation)
+    writer.put(generations[-1], force=True)
+    writer.close()
+
+    # then
+    assert sorted(os.listdir(tmp_path)) == ['gen_000000', 'gen_000003', 'gen_000006', 'gen_000007']
+
+
+def test_generation_summary(tmp_path):
+    # given
+    checkpoint = Checkpoint(str(tmp_path))
+    generation = make_generation(True)
+    path = checkpoint.write(generation)
+
+    # when
+    summary = generation.summarize(path)
+    loaded = summary.load(Point)
+
+    # then
+    fitnesses = generation.population.fitnesses
+    assert summary.get_fitness_dims() == 2
+    assert np.array_equal(summary.get_fitnesses(), fitnesses[:3])
+    assert np.array_equal(summary.max, fitnesses.max(axis=0))
+    assert loaded.id == generation.id
+    assert np.array_equal(loaded.population.fitnesses, fitnesses)
+    with pytest.raises(FileNotFoundError):
+        GenerationSummary(generation).load(Point)
+
+
+def test_generation_summary_front_points():
+    # given
+    generation = make_generation(True)
+    generation.ranks = np.zeros(10, dtype=int)
+    fitnesses = generation.population.fitnesses
+
+    # when
+    summary = generation.summarize(front_points=3)
+
+    # then
+    assert summary.front_size == 10
+    assert summary.get_front().shape == (3, 2)
+    assert summary.get_front()[0,0] == fitnesses[:,0].min() and summary.get_front()[-1,0] == fitnesses[:,0].max()
+
+
+def test_history_spill_needs_a_path():
+    # then
+    with pytest.raises(ValueError):
+        NSGA2(Point, NSGA2Config(run_monitor_server=False, history_size=2, history_spill=True))
+
+
+class Batch(Point):
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return genomes[:,:2] * cls.scale
+
+
+class Legacy(Individual):
+
+    def create(self):
+        self.x = 1.0
+
+    def crossover(self, a, b):
+        self.x = (a.x + b.x) / 2
+
+    def mutate(self):
+        self.x += 0.1
+
+    def fitness(self):
+        return [self.x * self.scale, -self.x]
+
+
+def make_config(path=None):
+    return NSGA2Config(pop_size=6, gen_out_path=path, run_monitor_server=False, evaluator=SerialEvaluator(False))
+
+
+@pytest.mark.parametrize('given_path', ['run', 'generation'])
+def test_resume(tmp_path, given_path):
+    # given
+    nsga2 = NSGA2(Batch, make_config(str(tmp_path)), scale=2)
+    nsga2.train(2)
+    last = nsga2.generations[-1]
+    path = str(tmp_path) if given_path == 'run' else Checkpoint(str(tmp_path)).generation_path(2)
+
+    # when
+    resumed = NSGA2(Batch, make_config())
+    resumed.load(path)
+    resumed.train(2)
+
+    # then
+    first = resumed.generations[0]
+    assert first.id == last.id and first.epoch == 2
+    assert first.population.ids.tolist() == last.population.ids.tolist()
+    assert np.array_equal(first.ranks, last.ranks)
+    assert [generation.epoch for generation in resumed.generations] == [2, 3, 4]
+    assert resumed.individual_class.scale == 2
+    new_ids = set(resumed.generations[-1].population.ids.tolist()) - set(last.population.ids.tolist())
+    assert min(new_ids) > max(last.population.ids.tolist() + [last.id])
+
+
+def test_load_legacy_pickle(tmp_path):
+    # given: a generation as pickled by older versions, with dicts by string id
+    individuals = {}
+    for i, x in enumerate([3.0, 1.0, 2.0]):
+        individual = Legacy.__new__(Legacy)
+        individual.__dict__.update({ 'id': f'old{i}', 'parents': None, 'x': x, 'scale': 1 })
+        individuals[f'old{i}'] = individual
+    legacy = Generation.__new__(Generation)
+    legacy.__dict__.update({
+        'id': 'abcd1234',
+        'population': individuals,
+        'fitnesses': { id: [ind.x, -ind.x] for id, ind in individuals.items() },
+        'sorted_ids': ['old0', 'old2', 'old1']
+    })
+    path = tmp_path / 'abcd1234.gen'
+    with open(path, 'wb') as file:
+        pickle.dump(legacy, file)
+
+    # when
+    nsga2 = NSGA2(Legacy, make_config(), scale=10)
+    nsga2.load(str(path))
+    generation = nsga2.generations[-1]
+    nsga2.train(1)
+
+    # then
+    assert generation.population.fitnesses.tolist() == [[3, -3], [2, -2], [1, -1]]
+    assert generation.ranks.tolist() == [0, 0, 0]
+    assert [ind.x for ind in generation.population] == [3.0, 2.0, 1.0]
+    assert all(ind.scale == 10 for ind in generation.population)
+    assert np.max(nsga2.generations[-1].population.fitnesses[:,0]) > 3
+
+
+class Failing(Batch):
+    calls = 0
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        Failing.calls += 1
+        if (Failing.calls > 1):
+            raise ValueError('no fitness')
+        return super().batch_fitness(individuals)
+
+
+def test_writer_errors_dont_hide_training_errors(tmp_path, monkeypatch):
+    # given
+    def failing_write(checkpoint, generation):
+        raise OSError('disk full')
+    monkeypatch.setattr(Checkpoint, 'write', failing_write)
+    nsga2 = NSGA2(Failing, make_config(str(tmp_path)), scale=1)
+
+    # then
+    with pytest.raises(ValueError, match='no fitness'):
+        nsga2.train(2)
+    assert nsga2.checkpoint_writer.thread is None
+
+
+def test_load_run_without_generations(tmp_path):
+    # given
+    Checkpoint(str(tmp_path)).write_context(Batch, { 'scale': 2 })
+
+    # then
+    with pytest.raises(FileNotFoundError, match=str(tmp_path)):
+        NSGA2(Batch, make_config()).load(str(tmp_path))
+
+
+def test_load_rejects_other_pickles(tmp_path):
+    # given
+    path = tmp_path / 'other.gen'
+    with open(path, 'wb') as file:
+        pickle.dump({ 'not': 'a generation' }, file)
+
+    # then
+    with pytest.raises(ValueError):
+        NSGA2(Legacy, make_config()).load(str(path))
+
+
+@pytest.mark.parametrize('given_every', [1, 3])
+def test_compact_history(tmp_path, monkeypatch, given_every):
+    # given
+    written = []
+    write = Checkpoint.write
+    def counting_write(checkpoint, generation):
+        written.append(generation.epoch)
+        return write(checkpoint, generation)
+    monkeypatch.setattr(Checkpoint, 'write', counting_write)
+    config = NSGA2Config(pop_size=6, gen_out_path=str(tmp_path), run_monitor_server=False, evaluator=SerialEvaluator(False),
+                         checkpoint_every=given_every, history_size=2, history_spill=True)
+    nsga2 = NSGA2(Batch, config, scale=1)
+
+    # when
+    nsga2.train(5)
+
+    # then
+    generations = nsga2.generations
+    assert [generation.epoch for generation in generations] == [0, 1, 2, 3, 4, 5]
+    assert all(isinstance(generation, GenerationSummary) for generation in generations[:4])
+    assert all(isinstance(generation, Generation) for generation in generations[4:])
+    assert sorted(written) == sorted(set(written))
+    assert set(range(4)) <= set(written)
+    loaded = generations[1].load(Batch)
+    assert loaded.epoch == 1 and loaded.id == generations[1].id
+    assert np.array_equal(loaded.population.fitnesses[:len(generations[1].get_fitnesses())], generations[1].get_fitnesses())
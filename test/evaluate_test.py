@@ -0,0 +1,147 @@
+import copy
+import pickle
+import pytest
+import numpy as np
+from src.nsga2 import Individual, NSGA2, NSGA2Config
+from src.evaluate import SerialEvaluator, ThreadEvaluator, ProcessEvaluator
+
+
+class Square(Individual):
+
+    __slots__ = ('x',)
+
+    def create(self):
+        self.x = 1
+
+    def crossover(self, a, b):
+        self.x = a.x
+
+    def mutate(self):
+        pass
+
+    def fitness(self):
+        return (self.x ** 2 * self.scale, -self.x)
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        x = np.array([ind.x for ind in individuals])
+        return np.stack([x ** 2 * cls.scale, -x], axis=1)
+
+
+def make_individuals(n, scale):
+    bound = Square.bind(scale=scale)
+    individuals = [bound() for _ in range(n)]
+    for x, ind in enumerate(individuals):
+        ind.x = x
+    return individuals
+
+
+@pytest.mark.parametrize('given_evaluator', [
+    SerialEvaluator(progress=False),
+    ThreadEvaluator(workers=3, progress=False),
+    ProcessEvaluator(workers=2, chunksize=3, progress=False),
+])
+def test_evaluate_keeps_order(given_evaluator):
+    # given
+    individuals = make_individuals(20, 2)
+    given_evaluator.setup({'scale': 2})
+
+    # when
+    try:
+        fitnesses = given_evaluator.evaluate(individuals)
+    finally:
+        given_evaluator.close()
+
+    # then
+    assert fitnesses == [(x ** 2 * 2, -x) for x in range(20)]
+
+
+@pytest.mark.parametrize('given_evaluator', [
+    SerialEvaluator(progress=False),
+    ThreadEvaluator(workers=3, progress=False),
+    ProcessEvaluator(workers=2, progress=False),
+])
+def test_evaluate_batch(given_evaluator):
+    # given
+    individuals = make_individuals(20, 2)
+    given_evaluator.setup({'scale': 2})
+
+    # when
+    try:
+        fitnesses = given_evaluator.evaluate_batch(type(individuals[0]), individuals)
+    finally:
+        given_evaluator.close()
+
+    # then
+    assert fitnesses.tolist() == [[x ** 2 * 2, -x] for x in range(20)]
+
+
+def test_bind_is_per_class():
+    # given
+    small = Square.bind(scale=1)
+    large = Square.bind(scale=1000)
+
+    # when
+    a, b = small(), large()
+    a.x = b.x = 2
+
+    # then
+    assert a.fitness() == (4, -2) and b.fitness() == (4000, -2)
+    assert not hasattr(Square, 'scale')
+    assert type(pickle.loads(pickle.dumps(b))) is Square
+    assert type(large.adopt([pickle.loads(pickle.dumps(b))])[0]) is large
+    assert large.__qualname__ == 'Square[bound]' and large._unbound is Square
+
+
+@pytest.mark.parametrize('given_copy', [copy.copy, copy.deepcopy])
+def test_copies_stay_bound(given_copy):
+    # given
+    bound = Square.bind(scale=10)
+    individual = bound()
+    individual.x = 3
+
+    # when
+    copied = given_copy(individual)
+
+    # then
+    assert type(copied) is bound
+    assert copied.x == 3 and copied.id == individual.id
+    assert copied.fitness() == (90, -3)
+
+
+class Legacy(Individual):
+
+    def __init__(self, parents = None, **kwargs):
+        super().__init__(parents, **kwargs)
+
+    def create(self):
+        self.x = self.start
+
+    def mutate(self):
+        pass
+
+
+def test_instance_kwargs_are_deprecated():
+    # when
+    with pytest.warns(DeprecationWarning):
+        parent = Legacy(start=2)
+    with pytest.warns(DeprecationWarning):
+        child = Legacy([parent], start=5)
+
+    # then
+    assert parent.x == 2 and parent.start == 2
+    assert child.x == 2 and child.start == 5
+
+
+def test_runs_dont_share_kwargs():
+    # given
+    config = NSGA2Config(pop_size=4, run_monitor_server=False, evaluator=SerialEvaluator(False))
+    small = NSGA2(Square, config, scale=1)
+    large = NSGA2(Square, config, scale=1000)
+
+    # when
+    small.train(1)
+
+    # then
+    assert np.max(small.generations[-1].population.fitnesses[:,0]) == 1
+    assert large.individual_class.scale == 1000
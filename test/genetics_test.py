@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from src.util.genetics import BatchGenetics
+
+LOWER = np.array([0, -5, 10])
+UPPER = np.array([1, 5, 20])
+INTEGER = np.array([False, True, True])
+
+
+def assert_valid(genomes):
+    assert np.all(genomes >= LOWER)
+    assert np.all(genomes <= UPPER)
+    assert np.all(genomes[:,INTEGER] == np.rint(genomes[:,INTEGER]))
+
+
+def test_random():
+    # when
+    genomes = BatchGenetics.random(500, LOWER, UPPER, INTEGER)
+
+    # then
+    assert genomes.shape == (500, 3)
+    assert_valid(genomes)
+    assert set(genomes[:,2]) == set(range(10, 21))
+
+
+def test_uniform_crossover():
+    # given
+    a = np.zeros((100, 3))
+    b = np.ones((100, 3))
+
+    # when
+    children = BatchGenetics.uniform_crossover(a, b)
+
+    # then
+    assert set(np.unique(children)) == {0, 1}
+
+
+@pytest.mark.parametrize('given_operator', [
+    lambda g: BatchGenetics.sbx_crossover(g, g[::-1], LOWER, UPPER, integer=INTEGER),
+    lambda g: BatchGenetics.polynomial_mutation(g, LOWER, UPPER, prob=1.0, integer=INTEGER),
+    lambda g: BatchGenetics.reset_mutation(g, LOWER, UPPER, prob=0.5, integer=INTEGER),
+])
+def test_operators_respect_bounds(given_operator):
+    # given
+    np.random.seed(0)
+    genomes = BatchGenetics.random(1000, LOWER, UPPER, INTEGER)
+
+    # when
+    children = given_operator(genomes)
+
+    # then
+    assert children.shape == genomes.shape
+    assert_valid(children)
+    assert np.any(children != genomes)
@@ -0,0 +1,126 @@
+import pytest
+import itertools
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator
+from src.indicators import hypervolume, hypervolume_contributions, igd, spacing, spread, reference_point, _nearest_distances
+
+
+"""
+    Hypervolume of integer points, counting the unit cells they dominate.
+"""
+def grid_hypervolume(points, reference):
+    volume = 0
+    for cell in itertools.product(*[range(int(r), int(h)) for r, h in zip(reference, points.max(axis=0))]):
+        if (np.any(np.all(points >= np.array(cell) + 0.5, axis=1))):
+            volume += 1
+    return volume
+
+
+@pytest.mark.parametrize('given_dims', [2, 3, 4])
+def test_hypervolume_exact(given_dims):
+    # given
+    np.random.seed(0)
+    reference = np.zeros(given_dims)
+
+    for _ in range(10):
+        # when
+        points = np.random.randint(1, 6, (12, given_dims)).astype(float)
+
+        # then
+        assert hypervolume(points, reference) == pytest.approx(grid_hypervolume(points, reference))
+
+
+def test_hypervolume_ignores_non_finite_and_outside_reference():
+    # given
+    points = np.array([[1, 2], [2, 1], [np.inf, 0], [np.nan, 1], [-1, 5]])
+
+    # when
+    volume = hypervolume(points, [0, 0])
+
+    # then
+    assert volume == 3
+
+
+def test_hypervolume_contributions():
+    # given
+    points = np.array([[1, 3], [2, 2], [3, 1], [1, 1]], dtype=float)
+
+    # when
+    contributions = hypervolume_contributions(points, [0, 0])
+
+    # then
+    assert contributions.tolist() == [1, 1, 1, 0]
+
+
+def test_igd():
+    # given
+    front = np.array([[0, 1], [1, 0]], dtype=float)
+
+    # when
+    distances = [igd(front, front), igd(front[:1], front)]
+
+    # then
+    assert distances == [0, pytest.approx(np.sqrt(2)/2)]
+
+
+def test_spacing_and_spread():
+    # given
+    x = np.linspace(0, 1, 11)
+    even = np.stack([x, 1-x], axis=1)
+    uneven = np.stack([x**3, 1-x**3], axis=1)
+
+    # then
+    assert spacing(even) == pytest.approx(0)
+    assert spread(even) == pytest.approx(0)
+    assert spacing(uneven) > 0
+    assert spread(uneven) > 0
+
+
+@pytest.mark.parametrize('given_ord', [1, 2])
+def test_nearest_distances_by_chunks(given_ord):
+    # given
+    points = np.random.rand(50, 3)
+    distances = np.linalg.norm(points[:,None] - points[None,:], ord=given_ord, axis=2)
+    np.fill_diagonal(distances, np.inf)
+
+    # when
+    nearest = _nearest_distances(points, given_ord, pairs=120)
+
+    # then
+    assert nearest == pytest.approx(distances.min(axis=1))
+
+
+class Cube(ArrayIndividual):
+    n_genes = 4
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        return np.stack([ind.genome for ind in individuals])
+
+
+@pytest.mark.parametrize('given_max_objectives, expected_hypervolume', [(3, False), (4, True), (None, True)])
+def test_hv_max_objectives(given_max_objectives, expected_hypervolume):
+    # given
+    config = NSGA2Config(pop_size=10, run_monitor_server=False, evaluator=SerialEvaluator(False), hv_max_objectives=given_max_objectives)
+    nsga2 = NSGA2(Cube, config)
+
+    # when
+    nsga2.train(1)
+
+    # then
+    indicators = nsga2.generations[-1].indicators
+    assert ('hypervolume' in indicators) == expected_hypervolume
+    assert 'spacing' in indicators and 'spread' in indicators
+
+
+def test_reference_point():
+    # given
+    points = np.array([[0, 5], [10, 5]], dtype=float)
+
+    # when
+    reference = reference_point(points)
+
+    # then
+    assert reference.tolist() == [-1, 4.9]
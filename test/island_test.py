@@ -0,0 +1,84 @@
+import os
+import pytest
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator
+from src.island import Islands
+
+
+class Point(ArrayIndividual):
+    n_genes = 2
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return np.stack([genomes[:,0], 1 - genomes[:,0] * genomes[:,1]], axis=1)
+
+
+def make_config():
+    return NSGA2Config(pop_size=10, run_monitor_server=False, evaluator=SerialEvaluator(False))
+
+
+def test_migration():
+    # given
+    nsga2 = NSGA2(Point, make_config())
+    nsga2.train(2)
+    parent_ids = set(nsga2.generations[-1].population.ids.tolist())
+
+    # when
+    fitnesses, genomes = nsga2.emigrants(3)
+    nsga2.immigrate(fitnesses + 10, genomes)
+
+    # then
+    population = nsga2.generations[-1].population
+    migrants = population.fitnesses[:,0] >= 10
+    assert len(fitnesses) == 3 and genomes.shape == (3, 2)
+    assert len(population) == 10 and np.sum(migrants) == 3
+    assert not set(population.ids[migrants].tolist()) & parent_ids
+
+
+@pytest.mark.parametrize('given_topology', ['ring', 'all', { 0: [1], 1: [] }])
+def test_islands(given_topology):
+    # given
+    islands = Islands(Point, make_config(), n_islands=2, topology=given_topology, migration_interval=2, n_migrants=2, seed=0)
+
+    # when
+    populations = islands.train(5)
+
+    # then
+    assert [len(population) for population in populations] == [10, 10]
+    assert [population.genomes.shape for population in populations] == [(10, 2), (10, 2)]
+    assert all(indicators['hypervolume'] > 0 for indicators in islands.indicators)
+
+
+class Failing(Point):
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        raise ValueError('no fitness')
+
+
+def test_island_failure():
+    # given
+    islands = Islands(Failing, make_config(), n_islands=2, seed=0)
+
+    # then
+    with pytest.raises(RuntimeError, match='no fitness'):
+        islands.train(2)
+
+
+class Dying(Point):
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        os._exit(3)
+
+
+def test_island_death():
+    # given
+    islands = Islands(Dying, make_config(), n_islands=2, seed=0)
+
+    # then
+    with pytest.raises(RuntimeError, match='exit code 3'):
+        islands.train(2)
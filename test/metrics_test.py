@@ -0,0 +1,145 @@
+import csv
+import json
+import queue
+import pytest
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator
+from src.util.metrics import Metrics, NullMetrics, JSONLSink, CSVSink, MonitorSink
+from src.util.monitor.frame import Frame
+
+
+class Point(ArrayIndividual):
+    n_genes = 2
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return np.stack([genomes[:,0], 1 - genomes[:,0] * genomes[:,1]], axis=1)
+
+
+class Records:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+def make_config(metrics):
+    return NSGA2Config(pop_size=10, run_monitor_server=False, evaluator=SerialEvaluator(False), metrics=metrics)
+
+
+def test_nested_phases_are_exclusive():
+    # given
+    metrics = Metrics([])
+    metrics._begin(0)
+
+    # when
+    with metrics.phase('breeding'):
+        with metrics.phase('crowding'):
+            sum(range(10000))
+        sum(range(10000))
+
+    # then
+    assert metrics.timings['crowding'] > 0 and metrics.timings['breeding'] > 0
+    assert metrics._stack == []
+
+
+def test_train_records():
+    # given
+    records = Records()
+    nsga2 = NSGA2(Point, make_config(Metrics([records])))
+
+    # when
+    nsga2.train(3)
+
+    # then
+    assert [record['epoch'] for record in records.records] == [0, 1, 2, 3]
+    assert sum(record['evaluations'] for record in records.records) == nsga2.evaluations
+    for record in records.records:
+        phases = sum(record[f'time_{phase}'] for phase in Metrics.PHASES) + record['time_other']
+        assert phases == pytest.approx(record['time'])
+        assert record['front_size'] == np.sum(nsga2.generations[record['epoch']].ranks == 0)
+    assert records.records[0]['time_breeding'] == 0
+    assert records.records[1]['time_breeding'] > 0
+
+
+def test_counters():
+    # given
+    records = Records()
+    nsga2 = NSGA2(Point, make_config(Metrics([records])))
+    nsga2.train(1)
+    fitnesses, genomes = nsga2.emigrants(2)
+
+    # when
+    nsga2.immigrate(fitnesses, genomes)
+    nsga2.train(1)
+
+    # then
+    assert records.records[-1]['immigrants'] == 2
+    assert records.records[0]['duplicates'] == 0
+
+
+def test_file_sinks(tmp_path):
+    # given
+    jsonl = JSONLSink(str(tmp_path / 'metrics.jsonl'))
+    table = CSVSink(str(tmp_path / 'metrics.csv'))
+    nsga2 = NSGA2(Point, make_config(Metrics([jsonl, table])))
+
+    # when
+    nsga2.train(2)
+    nsga2.metrics.close()
+
+    # then
+    with open(tmp_path / 'metrics.jsonl') as file:
+        lines = [json.loads(line) for line in file]
+    with open(tmp_path / 'metrics.csv') as file:
+        rows = list(csv.DictReader(file))
+    assert [line['epoch'] for line in lines] == [0, 1, 2]
+    assert [int(row['epoch']) for row in rows] == [0, 1, 2]
+    assert float(rows[1]['time']) == pytest.approx(lines[1]['time'])
+
+
+def test_monitor_sink():
+    # given
+    nsga2 = NSGA2(Point, make_config(Metrics([MonitorSink()])))
+    nsga2.config.run_monitor_server = True
+    nsga2.monitor_queue = queue.Queue()
+
+    # when
+    nsga2.train(1)
+
+    # then
+    frames = [Frame.decode(nsga2.monitor_queue.get()) for _ in range(2)]
+    assert [frame.meta['metrics']['epoch'] for frame in frames] == [0, 1]
+    assert 'indicators' in frames[0].meta
+
+
+def test_profile_epoch(tmp_path):
+    # given
+    records = Records()
+    path = str(tmp_path / 'epoch.prof')
+    nsga2 = NSGA2(Point, make_config(Metrics([records], profile_epoch=1, profile_path=path, trace_memory=True)))
+
+    # when
+    nsga2.train(2)
+
+    # then
+    assert (tmp_path / 'epoch.prof').exists()
+    assert [('memory_peak' in record) for record in records.records] == [False, True, False]
+    assert nsga2.metrics.profiler is None
+
+
+def test_disabled():
+    # when
+    nsga2 = NSGA2(Point, make_config(None))
+    nsga2.train(1)
+
+    # then
+    assert isinstance(nsga2.metrics, NullMetrics)
+    assert nsga2.metrics.phase('sorting') is nsga2.metrics.phase('evaluation')
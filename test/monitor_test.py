@@ -0,0 +1,100 @@
+import pytest
+import asyncio
+import numpy as np
+from src.util.monitor.frame import Frame, DeltaView
+from src.util.monitor.server import MonitorServer, Subscription
+
+
+def make_frame(ids):
+    ids = np.array(ids)
+    fitnesses = np.stack([ids, -ids], axis=1).astype(float)
+    return Frame(Frame.FULL, 1, fitnesses, ids, np.arange(len(ids)) % 2)
+
+
+@pytest.mark.parametrize('given_ids', [True, False])
+def test_frame_roundtrip(given_ids):
+    # given
+    fitnesses = np.random.rand(7, 3)
+    ids = np.arange(7) * 10 if given_ids else None
+    frame = Frame(Frame.FULL, 42, fitnesses, ids, np.arange(7) // 2, { 'indicators': { 'hypervolume': 1.5 } })
+
+    # when
+    decoded = Frame.decode(frame.encode())
+
+    # then
+    assert decoded.kind == Frame.FULL and decoded.epoch == 42
+    assert np.allclose(decoded.fitnesses, fitnesses.astype(np.float32))
+    assert (decoded.ids is None) == (not given_ids)
+    assert given_ids is False or decoded.ids.tolist() == ids.tolist()
+    assert decoded.ranks.tolist() == [0, 0, 1, 1, 2, 2, 3]
+    assert decoded.meta == { 'indicators': { 'hypervolume': 1.5 } }
+
+
+def test_frame_rejects_other_data():
+    with pytest.raises(ValueError):
+        Frame.decode(b'\x80\x04' + bytes(30))
+
+
+def test_publish_drops_oldest():
+    # given
+    server = MonitorServer(None)
+    queue = asyncio.Queue(maxsize=2)
+    server.client_queues.add(queue)
+
+    # when
+    for epoch in [1, 2, 3]:
+        frame = make_frame([0, 1])
+        frame.epoch = epoch
+        server.publish(frame.encode())
+
+    # then
+    assert [queue.get_nowait().epoch for _ in range(queue.qsize())] == [2, 3]
+
+
+def test_summary_and_front():
+    # given
+    frame = make_frame([1, 2, 3, 4])
+
+    # when
+    summary = Frame.decode(frame.summary().encode())
+    front = Frame.decode(frame.front().encode())
+
+    # then
+    assert summary.fitnesses.tolist() == [[4, -1], [2.5, -2.5], [1, -4]]
+    assert summary.meta == { 'size': 4, 'front_sizes': [2, 2] }
+    assert front.ids.tolist() == [1, 3]
+
+
+def test_deltas_rebuild_population():
+    # given
+    subscription = Subscription('delta')
+    view = DeltaView()
+
+    # when
+    for ids in [[1, 2, 3], [2, 3, 4], [4, 5]]:
+        frame = make_frame(ids)
+        frame.encoded = {}
+        delta = Frame.decode(subscription.encode(frame))
+        view.update(delta)
+
+    # then
+    assert delta.ids.tolist() == [5] and delta.removed.tolist() == [2, 3]
+    assert view.ids().tolist() == [4, 5]
+    assert view.matrix().tolist() == [[4, -4], [5, -5]]
+
+
+def test_subscription():
+    # given
+    subscription = Subscription()
+
+    # when
+    subscription.update({ 'mode': 'summary', 'interval': 10 })
+    frame = make_frame([1])
+    frame.encoded = {}
+    data = subscription.encode(frame)
+
+    # then
+    assert Frame.decode(data).kind == Frame.SUMMARY
+    assert 9 < subscription.wait() <= 10
+    with pytest.raises(ValueError):
+        subscription.update({ 'mode': 'everything' })
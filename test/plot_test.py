@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator
+from src.util.plot import Plot, RingBuffer, decimate
+
+
+class Sphere(ArrayIndividual):
+    n_genes = 3
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return -genomes / np.linalg.norm(genomes, axis=1, keepdims=True)
+
+
+def test_ring_buffer():
+    # given
+    buffer = RingBuffer(3, 2)
+
+    # when
+    for i in range(5):
+        buffer.append([i, -i])
+
+    # then
+    assert buffer.view().tolist() == [[2, -2], [3, -3], [4, -4]]
+    assert buffer.lower.tolist() == [2, -4]
+    assert buffer.upper.tolist() == [4, -2]
+
+
+def test_ring_buffer_bounds_after_wrap():
+    # given
+    buffer = RingBuffer(3, 2)
+
+    # when
+    for row in [[5, np.nan], [1, 1], [2, np.nan], [3, 2], [0, np.nan]]:
+        buffer.append(row)
+
+    # then
+    assert buffer.lower.tolist() == [0, 2]
+    assert buffer.upper.tolist() == [3, 2]
+
+
+def test_decimate():
+    # given
+    points = np.concatenate([np.zeros((1000, 2)), [[1, 1]]])
+
+    # when
+    rows = decimate(points, 10)
+
+    # then
+    assert rows.tolist() == [999, 1000]
+    assert decimate(points, 2000).tolist() == list(range(1001))
+
+
+@pytest.mark.parametrize('given_front_only', [True, False])
+def test_fitnesses_headless(tmp_path, given_front_only):
+    # given
+    nsga2 = NSGA2(Sphere, NSGA2Config(pop_size=20, run_monitor_server=False, evaluator=SerialEvaluator(False), history_size=2))
+    nsga2.train(4)
+    path = str(tmp_path / 'fitnesses.png')
+
+    # when
+    Plot.fitnesses(nsga2, front_only=given_front_only, max_points=50, path=path)
+
+    # then
+    with open(path, 'rb') as file:
+        assert file.read(8) == b'\x89PNG\r\n\x1a\n'
@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+from src.population import Population
+
+
+class Dummy:
+    def __init__(self, id):
+        self.id = id
+
+
+def make_population(ids, offset=0):
+    fitnesses = np.array([[i+offset, -i-offset] for i in range(len(ids))], dtype=float)
+    return Population([Dummy(id) for id in ids], fitnesses)
+
+
+@pytest.mark.parametrize('given_rows, expected_ids', [
+    ([], []),
+    ([2], [12]),
+    ([3, 0, 1], [13, 10, 11]),
+])
+def test_take(given_rows, expected_ids):
+    # given
+    population = make_population([10,11,12,13])
+
+    # when
+    taken = population.take(given_rows)
+
+    # then
+    assert taken.ids.tolist() == expected_ids
+    assert [ind.id for ind in taken] == expected_ids
+    assert taken.fitnesses.tolist() == population.fitnesses[given_rows].tolist()
+
+
+def test_concat():
+    # given
+    a = make_population([1,2])
+    b = make_population([3], offset=10)
+
+    # when
+    merged = Population.concat(a, b)
+
+    # then
+    assert merged.ids.tolist() == [1,2,3]
+    assert merged.fitnesses.tolist() == [[0,0],[1,-1],[10,-10]]
+    assert merged.index(3) == 2
+    assert merged.fitness_dict() == {1:[0,0],2:[1,-1],3:[10,-10]}
+
+
+def test_concat_without_fitnesses():
+    # given
+    a = make_population([1])
+    b = Population([Dummy(2)])
+
+    # when
+    merged = Population.concat(a, b)
+
+    # then
+    assert merged.fitnesses is None
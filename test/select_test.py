@@ -1,5 +1,6 @@
 import pytest
-from src.select import crowding_distance, select_n_best, select_n_best_of_front
+import numpy as np
+from src.select import crowding_distance, select_n_best, select_n_best_of_front, select_n_best_of_front_array, select_n_best_array, binary_tournament, mating_pairs
 
 
 @pytest.mark.parametrize('given_front, expected_dist', [
@@ -68,3 +69,70 @@ def test_select_n_best(given_fronts, expected_best):
 
     # then
     assert best == expected_best
+
+
+@pytest.mark.parametrize('given_n, given_m, given_seed', [
+    (1, 2, 0),
+    (7, 2, 1),
+    (40, 3, 2),
+    (100, 4, 3),
+])
+def test_select_n_best_of_front_array_parity(given_n, given_m, given_seed):
+    # given
+    rng = np.random.default_rng(given_seed)
+    values = rng.integers(0, 5, size=(given_n, given_m)).astype(float)
+    front = { f'id{i}': list(v) for i, v in enumerate(values) }
+
+    for n in range(given_n+1):
+        # when
+        best = select_n_best_of_front_array(values, n)
+
+        # then
+        dist = crowding_distance(front)
+        expected = sorted(dist.items(), key= lambda v: -v[1])[:n] if n > 2 else list(front.items())[:n]
+        assert [f'id{i}' for i in best] == [e[0] for e in expected]
+
+
+@pytest.mark.parametrize('given_fronts, given_n, expected_best', [
+    ([[0], [1]], 1, [0]),
+    ([[0], [1]], 2, [0, 1]),
+    ([[0, 1, 2, 3, 4], [5, 6, 7, 8]], 4, [0, 2, 4, 1]),
+    ([[0, 1, 2, 3, 4], [5, 6, 7, 8]], 20, [0, 2, 4, 1, 3, 6, 7, 8, 5]),
+])
+def test_select_n_best_array(given_fronts, given_n, expected_best):
+    # given
+    fitnesses = np.array([[1,1,5],[3,1,5],[5,1,1],[5,3,5],[5,5,5],[3,3,3],[3,1,1],[1,3,1],[1,1,3]])
+
+    # when
+    best = select_n_best_array(fitnesses, iter(given_fronts), given_n)
+
+    # then
+    assert list(best) == expected_best
+
+
+def test_binary_tournament():
+    # given
+    np.random.seed(0)
+    ranks = np.array([0, 0, 1, 2])
+    crowding = np.array([float('inf'), 1.0, 5.0, 5.0])
+
+    # when
+    winners = binary_tournament(ranks, crowding, 1000)
+
+    # then
+    assert winners.shape == (1000,)
+    assert np.mean(winners == 0) > np.mean(winners == 1) > np.mean(winners == 2) > np.mean(winners == 3)
+    assert np.mean(winners == 3) == pytest.approx(1/16, abs=0.03)
+
+
+def test_mating_pairs():
+    # given
+    np.random.seed(0)
+    pool = np.array([3, 5, 7])
+
+    # when
+    pairs = mating_pairs(pool, 50)
+
+    # then
+    assert pairs.shape == (50, 2)
+    assert set(pairs.flatten()) == {3, 5, 7}
@@ -1,5 +1,6 @@
 import pytest
-from src.sort import Result, non_dominated_sort
+import numpy as np
+from src.sort import Result, IncrementalSort, non_dominated_sort, dominance_sort, sweep_sort_2d, iter_fronts
 
 @pytest.mark.parametrize('given_a, given_b, expected_dominates', [
     ((5,),(3,),True),
@@ -66,4 +67,102 @@ def test_non_dominated_sort(given_data):
     # then
     assert sum([len(front) for front in fronts]) == len(given_data)
     for id, f in data_fronts.items():
-        assert id in fronts[f]
\ No newline at end of file
+        assert id in fronts[f]
+
+
+@pytest.mark.parametrize('given_engine', ['numpy', 'ens', 'auto'])
+@pytest.mark.parametrize('given_n, given_m, given_seed', [
+    (1, 2, 0),
+    (50, 2, 1),
+    (80, 3, 2),
+    (120, 4, 3),
+])
+def test_non_dominated_sort_engine_parity(given_engine, given_n, given_m, given_seed):
+    # given
+    rng = np.random.default_rng(given_seed)
+    values = rng.integers(0, 6, size=(given_n, given_m))
+    data_dict = { f'id{i}': tuple(v) for i, v in enumerate(values) }
+
+    # when
+    expected = non_dominated_sort(data_dict)
+    fronts = non_dominated_sort(data_dict, engine=given_engine)
+
+    # then
+    assert [set(front) for front in fronts] == [set(front) for front in expected]
+
+
+@pytest.mark.parametrize('given_n, given_seed', [
+    (1, 0),
+    (60, 1),
+    (300, 2),
+])
+def test_sweep_sort_2d_parity(given_n, given_seed):
+    # given
+    rng = np.random.default_rng(given_seed)
+    values = rng.integers(0, 10, size=(given_n, 2)).astype(float)
+    values[0] = (-float('inf'), -float('inf'))
+
+    # when
+    expected = dominance_sort(values)
+    fronts = sweep_sort_2d(values)
+
+    # then
+    assert [list(front) for front in fronts] == [list(front) for front in expected]
+
+
+@pytest.mark.parametrize('given_n_parents, given_n_children, given_m, given_seed', [
+    (0, 20, 2, 0),
+    (40, 1, 3, 1),
+    (100, 100, 2, 2),
+    (80, 120, 4, 3),
+])
+def test_incremental_sort_parity(given_n_parents, given_n_children, given_m, given_seed):
+    # given
+    rng = np.random.default_rng(given_seed)
+    parents = rng.integers(0, 8, size=(given_n_parents, given_m)).astype(float)
+    children = rng.integers(0, 8, size=(given_n_children, given_m)).astype(float)
+    merged = IncrementalSort(parents, dominance_sort(parents) if given_n_parents else [])
+
+    # when
+    merged.insert(children)
+    fronts = merged.fronts()
+
+    # then
+    expected = dominance_sort(np.vstack([parents, children]))
+    assert [list(front) for front in fronts] == [list(front) for front in expected]
+
+
+@pytest.mark.parametrize('given_engine', ['python', 'numpy', 'auto'])
+@pytest.mark.parametrize('given_n_required, expected_n_fronts', [
+    (None, 3),
+    (1, 1),
+    (2, 1),
+    (3, 2),
+    (6, 3),
+])
+def test_non_dominated_sort_n_required(given_engine, given_n_required, expected_n_fronts):
+    # given
+    data_dict = {
+        'id0': (5,5,5), 'id1': (5,5,5),
+        'id2': (3,3,3), 'id3': (3,3,3),
+        'id4': (1,1,1), 'id5': (1,1,1)
+    }
+
+    # when
+    fronts = non_dominated_sort(data_dict, engine=given_engine, n_required=given_n_required)
+
+    # then
+    assert len(fronts) == expected_n_fronts
+
+
+@pytest.mark.parametrize('given_engine', ['numpy', 'sweep', 'ens', 'auto'])
+def test_iter_fronts_empty(given_engine):
+    # then
+    assert list(iter_fronts(np.empty((0, 2)), given_engine)) == []
+    assert list(iter_fronts([], given_engine)) == []
+
+
+def test_iter_fronts_unknown_engine():
+    # then
+    with pytest.raises(ValueError, match='numpy'):
+        list(iter_fronts(np.zeros((3, 2)), 'fast'))
@@ -0,0 +1,101 @@
+import time
+import threading
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator, ThreadEvaluator
+
+
+class Point(ArrayIndividual):
+    n_genes = 2
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return np.stack([genomes[:,0], 1 - genomes[:,0] * genomes[:,1]], axis=1)
+
+
+class Grid(Point):
+    lower = 0
+    upper = 2
+    integer = True
+
+    def genome_key(self):
+        return self.genome.tobytes()
+
+
+class Slow(Point):
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def fitness(self):
+        with Slow.lock:
+            Slow.running += 1
+            Slow.max_running = max(Slow.max_running, Slow.running)
+        time.sleep(0.002)
+        with Slow.lock:
+            Slow.running -= 1
+        return [self.genome[0], -self.genome[1]]
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        return [ind.fitness() for ind in individuals]
+
+
+def make_config(**kwargs):
+    return NSGA2Config(pop_size=10, run_monitor_server=False, steady_state=True, **kwargs)
+
+
+def test_epochs():
+    # given
+    nsga2 = NSGA2(Point, make_config(evaluator=SerialEvaluator(False)))
+
+    # when
+    nsga2.train(3)
+
+    # then
+    assert [generation.epoch for generation in nsga2.generations] == [0, 1, 2, 3]
+    assert nsga2.evaluations == 40
+    assert all(len(generation.population) == 10 for generation in nsga2.generations)
+    assert all(np.all(np.diff(generation.ranks) >= 0) for generation in nsga2.generations)
+
+
+def test_resumed_epochs():
+    # given
+    nsga2 = NSGA2(Point, make_config(evaluator=SerialEvaluator(False)))
+    nsga2.train(1)
+
+    # when
+    nsga2.train(2)
+
+    # then
+    assert [generation.epoch for generation in nsga2.generations] == [0, 1, 2, 3]
+    assert nsga2.evaluations == 40
+
+
+def test_cache_hits():
+    # given
+    nsga2 = NSGA2(Grid, make_config(evaluator=SerialEvaluator(False), fitness_cache_size=100))
+
+    # when
+    nsga2.train(4)
+
+    # then
+    stats = nsga2.generations[-1].cache_stats
+    assert stats['hits'] > 0
+    assert stats['hits'] + stats['misses'] == 50
+    assert nsga2.evaluations == stats['misses']
+    assert nsga2.evaluations <= 3**2
+
+
+def test_max_in_flight():
+    # given
+    nsga2 = NSGA2(Slow, make_config(evaluator=ThreadEvaluator(workers=4, progress=False), max_in_flight=2))
+
+    # when
+    nsga2.train(2)
+
+    # then
+    assert nsga2.evaluations == 30
+    assert Slow.max_running == 2
@@ -0,0 +1,139 @@
+import pytest
+import numpy as np
+from src.nsga2 import NSGA2, NSGA2Config, Generation
+from src.genome import ArrayIndividual
+from src.evaluate import SerialEvaluator
+from src.population import Population
+from src.stopping import StoppingCriteria
+
+
+class Run:
+    evaluations = 0
+
+
+class Item:
+    def __init__(self, id):
+        self.id = id
+
+
+def make_generation(ids, hypervolume=None, indicators=None):
+    population = Population([Item(id) for id in ids], np.zeros((len(ids), 2)))
+    if (hypervolume is not None):
+        indicators = { 'hypervolume': hypervolume }
+    return Generation(population, np.zeros(len(ids), dtype=int), indicators=indicators)
+
+
+def test_max_evaluations():
+    # given
+    run = Run()
+    stopping = StoppingCriteria(max_evaluations=10)
+    stopping.start(run.evaluations)
+
+    # when
+    run.evaluations = 4
+    remaining = stopping.remaining_evaluations(run.evaluations)
+    stop_early = stopping.update(run, make_generation([0]))
+    run.evaluations = 10
+    stop_late = stopping.update(run, make_generation([0]))
+
+    # then
+    assert remaining == 6
+    assert not stop_early and stop_late
+    assert stopping.reason == 'reached 10 evaluations'
+
+
+def test_hypervolume_stagnation():
+    # given
+    stopping = StoppingCriteria(patience=2, min_delta=0.1)
+    stopping.start(0)
+
+    # when
+    stops = [stopping.update(Run(), make_generation([0], hv)) for hv in [1.0, 2.0, 2.04, 2.08, 2.12]]
+
+    # then
+    assert stops == [False, False, False, True, True]
+
+
+@pytest.mark.parametrize('given_indicators', [None, { 'spacing': 0.1, 'spread': 0.2 }])
+def test_front_stagnation(given_indicators):
+    # given
+    stopping = StoppingCriteria(patience=2)
+    stopping.start(0)
+
+    # when
+    stops = [stopping.update(Run(), make_generation(ids, indicators=given_indicators)) for ids in [[0, 1], [1, 2], [2, 1], [1, 2]]]
+
+    # then
+    assert stops == [False, False, False, True]
+
+
+def test_callbacks():
+    # given
+    def converged(nsga2, generation):
+        return generation.indicators['hypervolume'] > 1
+    stopping = StoppingCriteria(callbacks=[converged])
+    stopping.start(0)
+
+    # when
+    stops = [stopping.update(Run(), make_generation([0], hv)) for hv in [0.5, 1.5]]
+
+    # then
+    assert stops == [False, True]
+    assert stopping.reason == 'stopped by converged'
+
+
+def test_max_evaluations_without_new_evaluations():
+    # given
+    run = Run()
+    stopping = StoppingCriteria(max_evaluations=10)
+    stopping.start(run.evaluations)
+
+    # when
+    run.evaluations = 4
+    first = stopping.update(run, make_generation([0]))
+    second = stopping.update(run, make_generation([0]))
+
+    # then
+    assert not first and second
+    assert stopping.reason == 'no new evaluations (every individual was cached)'
+
+
+class Small(ArrayIndividual):
+    n_genes = 5
+    lower = 0
+    upper = 4
+    integer = True
+
+    def genome_key(self):
+        return self.genome.tobytes()
+
+    @classmethod
+    def batch_fitness(cls, individuals):
+        genomes = np.stack([ind.genome for ind in individuals])
+        return np.stack([genomes.sum(axis=1), -genomes[:,0]], axis=1)
+
+
+def test_budget_with_cache_terminates():
+    # given
+    config = NSGA2Config(pop_size=20, run_monitor_server=False, fitness_cache_size=100, evaluator=SerialEvaluator(False))
+    nsga2 = NSGA2(Small, config)
+
+    # when
+    nsga2.train(max_evaluations=10**6)
+
+    # then
+    assert nsga2.evaluations <= 5**5
+    assert nsga2.stopping.reason == 'no new evaluations (every individual was cached)'
+
+
+def test_stagnation_signal_change():
+    # given
+    stopping = StoppingCriteria(patience=2)
+    stopping.start(0)
+    generations = [make_generation([0]), make_generation([0], 1.0), make_generation([0]), make_generation([0]), make_generation([0])]
+
+    # when
+    stops = [stopping.update(Run(), generation) for generation in generations]
+
+    # then
+    assert stops == [False, False, False, False, True]